@@ -0,0 +1,297 @@
+# benchmark.py
+"""
+Rulează pipeline-ul complet (FaceMesh → EAR/MAR/pitch → microsomn/PERCLOS → AlertLogic)
+pe o sursă offline, fără cameră FLIR, și raportează debitul real.
+
+Exemple:
+    python benchmark.py --video drum.mp4
+    python benchmark.py --images cadre/ --max-frames 5000
+    python benchmark.py --synthetic 2000
+    python benchmark.py --synthetic 2000 --threaded
+    python benchmark.py --video drum.mp4 --scales 960,640,480   # eroare EAR/MAR vs. accelerare
+    python benchmark.py --video drum.mp4 --backends mediapipe,mediapipe_lite,dlib
+"""
+import argparse
+import contextlib
+import os
+import time
+
+import numpy as np
+import yaml
+
+from capture.replay_source import ReplaySource, SyntheticSource
+from decision.alert_logic import AlertLogic
+from feature_extraction.backends import create_backend
+from feature_extraction.face_mesh import FaceMeshDetector
+from feature_extraction.features import compute_features
+from feature_extraction.inference_scheduler import InferenceScheduler
+from pipeline.engine import Pipeline, FunctionStage, FrameContext
+from pipeline.stages import build_stages
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_config(config_path=None):
+    config_path = config_path or os.path.join(base_dir, 'config', 'settings.yaml')
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def open_source(args):
+    if args.video:
+        return ReplaySource(args.video, realtime=args.realtime, grayscale=args.gray)
+    if args.images:
+        return ReplaySource(args.images, realtime=args.realtime, fps=args.fps, grayscale=args.gray)
+    return SyntheticSource(n_frames=args.synthetic, fps=args.fps or 30.0,
+                           realtime=args.realtime, grayscale=args.gray)
+
+
+def run_pipeline(source, config, max_frames=None, tracking=None, schedule=False, threaded=False):
+    """
+    Trece toate cadrele sursei prin pipeline și returnează statisticile rulării.
+    tracking=None păstrează setarea din config (face_mesh.tracking);
+    schedule=True trece detectorul prin InferenceScheduler (inferență doar pe cadrele cheie);
+    threaded=True rulează landmark-urile și restul etapelor pe fire separate (cozi fără pierderi).
+    """
+    th = config['thresholds']
+    mesh_cfg = dict(config.get('face_mesh') or {})
+    if tracking is not None:
+        mesh_cfg['tracking'] = tracking
+    detector = create_backend(**mesh_cfg)
+    scheduler = None
+    if schedule:
+        sched_cfg = dict(config.get('inference_scheduler') or {})
+        sched_cfg.pop('enabled', None)
+        scheduler = InferenceScheduler(detector, ear_threshold=th['EAR'], **sched_cfg)
+    alert_logic = AlertLogic(
+        th['EAR'], config['consecutive_frames']['EAR'],
+        th['MAR'], config['consecutive_frames']['MAR'],
+        th['PITCH'], config['consecutive_frames']['PITCH'],
+        config.get('alert_cooldown', 5)
+    )
+    stages = build_stages(config, scheduler or detector, alert_logic, fps=source.max_fps)
+    totals = {'faces': 0, 'alerts': 0}
+
+    def count(ctx):
+        totals['faces'] += ctx.face
+        totals['alerts'] += len(ctx.events)
+    pipeline = Pipeline(stages + [FunctionStage("sink", count)])
+
+    source_s = 0.0
+    t_start = time.perf_counter()
+    # AlertLogic scrie mesaje de debug la fiecare cadru; le ascundem ca să nu măsurăm consola
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        def next_frame():
+            nonlocal source_s
+            if max_frames is not None and pipeline.frames >= max_frames:
+                raise StopIteration
+            t0 = time.perf_counter()
+            record = source.get_frame_record()
+            source_s += time.perf_counter() - t0
+            if record is None:
+                raise StopIteration
+            return FrameContext(record)
+
+        if threaded:
+            names = [s.name for s in pipeline.stages]
+            pipeline.start(next_frame, groups=[names[:1], names[1:]], block=True)
+            pipeline.wait()
+            pipeline.stop()
+        else:
+            while True:
+                try:
+                    ctx = next_frame()
+                except StopIteration:
+                    break
+                pipeline.process(ctx)
+    elapsed = time.perf_counter() - t_start
+    pipeline.close()
+    detector.close()
+
+    frames = pipeline.completed
+    stage_ms = {'sursa': source_s / frames * 1000.0 if frames else 0.0}
+    stage_ms.update({name: r['mean_ms'] for name, r in pipeline.report().items()})
+    return {
+        'frames': frames,
+        'faces': totals['faces'],
+        'alerts': totals['alerts'],
+        'microsleeps': pipeline.stage("temporal").microsleeps,
+        'crop_frames': getattr(detector, 'crop_frames', 0),
+        'inference_ratio': scheduler.inference_ratio if scheduler is not None else 1.0,
+        'elapsed_s': elapsed,
+        'fps': frames / elapsed if elapsed > 0 else 0.0,
+        'stage_ms': stage_ms,
+    }
+
+
+def compare_detectors(source, detectors, max_frames=None):
+    """
+    Rulează fiecare detector din `detectors` (nume → detector, primul e referința)
+    pe aceleași cadre; raportează latența (medie și percentile p50/p90/p99) și
+    acordul EAR/MAR cu referința: eroarea medie absolută, corelația EAR-ului
+    (backend-urile cu alte puncte pot avea un decalaj constant) și acordul față / fără față.
+    """
+    names = list(detectors)
+    ref_name = names[0]
+    times = {n: [] for n in names}
+    ear = {n: [] for n in names}       # perechi (ref, n) pe cadrele cu față la ambele
+    mar = {n: [] for n in names}
+    agree = {n: 0 for n in names}
+    frames = 0
+    while max_frames is None or frames < max_frames:
+        record = source.get_frame_record()
+        if record is None:
+            break
+        frame = record.image
+        height, width = frame.shape[:2]
+        results = {}
+        for n in names:
+            t0 = time.perf_counter()
+            results[n] = detectors[n].find_landmarks(frame)
+            times[n].append(time.perf_counter() - t0)
+        ref = results[ref_name]
+        ref_f = compute_features(ref, width, height) if ref is not None else None
+        for n in names:
+            lm = results[n]
+            agree[n] += (lm is None) == (ref is None)
+            if lm is not None and ref is not None:
+                f = compute_features(lm, width, height)
+                ear[n].append((ref_f.ear, f.ear))
+                mar[n].append((ref_f.mar, f.mar))
+        frames += 1
+    for detector in detectors.values():
+        detector.close()
+
+    def mean_abs(pairs):
+        return float(np.mean([abs(a - b) for a, b in pairs])) if pairs else None
+
+    def corr(pairs):
+        if len(pairs) < 2:
+            return None
+        a, b = np.array(pairs).T
+        if a.std() == 0 or b.std() == 0:
+            return None
+        return float(np.corrcoef(a, b)[0, 1])
+
+    ref_ms = float(np.mean(times[ref_name])) * 1000.0 if frames else 0.0
+    rows = []
+    for n in names:
+        ms = np.array(times[n]) * 1000.0
+        mean_ms = float(ms.mean()) if frames else 0.0
+        p50, p90, p99 = (np.percentile(ms, [50, 90, 99]) if frames else (0.0, 0.0, 0.0))
+        rows.append({
+            'name': str(n), 'mean_ms': mean_ms, 'p50': p50, 'p90': p90, 'p99': p99,
+            'speedup': ref_ms / mean_ms if mean_ms else 0.0,
+            'ear_err': mean_abs(ear[n]), 'mar_err': mean_abs(mar[n]), 'ear_r': corr(ear[n]),
+            'agree': agree[n] / frames if frames else 0.0,
+        })
+    return frames, rows
+
+
+def compare_scales(source, widths, max_frames=None):
+    #FaceMesh la rezoluția originală (referința) față de fiecare lățime de inferență din `widths`.
+    detectors = {'original': FaceMeshDetector()}
+    for w in widths:
+        detectors[f"{w} px"] = FaceMeshDetector(inference_width=w)
+    return compare_detectors(source, detectors, max_frames)
+
+
+def compare_backends(source, backends, config, max_frames=None):
+    """
+    Compară backend-urile de landmark-uri (primul e referința) cu parametrii din
+    secțiunea face_mesh; backend-urile care nu pot fi create (ex. dlib lipsă) se sar.
+    """
+    mesh_cfg = dict(config.get('face_mesh') or {})
+    detectors = {}
+    for name in backends:
+        try:
+            detectors[name] = create_backend(backend=name, dlib_model=mesh_cfg.get('dlib_model'),
+                                             inference_width=mesh_cfg.get('inference_width'))
+        except (RuntimeError, ValueError) as e:
+            print(f"⚠️ {name}: {e}")
+    if not detectors:
+        raise RuntimeError("Niciun backend de landmark-uri disponibil")
+    return compare_detectors(source, detectors, max_frames)
+
+
+def print_comparison(title, frames, rows):
+    def fmt(v):
+        return f"{v:.4f}" if v is not None else "   –  "
+    line = "─" * 96
+    print(f"{title} ({frames} cadre, referința: {rows[0]['name']})")
+    print(line)
+    print(f"{'detector':<16}{'ms/cadru':>10}{'p50':>8}{'p90':>8}{'p99':>8}{'accel.':>8}"
+          f"{'|ΔEAR|':>10}{'r EAR':>8}{'|ΔMAR|':>10}{'acord față':>12}")
+    for r in rows:
+        print(f"{r['name']:<16}{r['mean_ms']:>10.2f}{r['p50']:>8.2f}{r['p90']:>8.2f}{r['p99']:>8.2f}"
+              f"{r['speedup']:>7.2f}x{fmt(r['ear_err']):>10}{fmt(r['ear_r']):>8}{fmt(r['mar_err']):>10}"
+              f"{r['agree'] * 100:>11.0f}%")
+    print(line)
+
+
+def print_report(stats, source):
+    print("📈 REZULTAT BENCHMARK")
+    print("────────────────────────────────────")
+    print(f"Cadre procesate:    {stats['frames']}")
+    print(f"Față detectată:     {stats['faces']}")
+    print(f"Alerte / microsomn: {stats['alerts']} / {stats['microsleeps']}")
+    print(f"Inferențe pe crop:  {stats['crop_frames']}")
+    print(f"Cadre prin model:   {stats['inference_ratio'] * 100:.0f}%")
+    print(f"Durată:             {stats['elapsed_s']:.2f} s")
+    print(f"Debit:              {stats['fps']:.1f} FPS "
+          f"({stats['fps'] / source.max_fps:.1f}x timp real la {source.max_fps:.1f} FPS)")
+    for stage, ms in stats['stage_ms'].items():
+        print(f"  {stage:<10} {ms:8.2f} ms/cadru")
+    print("────────────────────────────────────")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline pentru pipeline-ul de oboseală")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--video', help="fișier video înregistrat")
+    group.add_argument('--images', help="director sau glob cu imagini")
+    group.add_argument('--synthetic', type=int, metavar='N', help="N cadre sintetice (fără fișiere)")
+    parser.add_argument('--fps', type=float, default=None, help="FPS nominal pentru imagini / sintetic")
+    parser.add_argument('--realtime', action='store_true', help="redare la FPS-ul înregistrării")
+    parser.add_argument('--gray', action='store_true', help="citește cadrele ca Mono8")
+    parser.add_argument('--max-frames', type=int, default=None)
+    parser.add_argument('--config', default=None, help="cale settings.yaml")
+    parser.add_argument('--track', action='store_true', default=None,
+                        help="FaceMesh pe crop-ul din jurul feței (modul de urmărire)")
+    parser.add_argument('--schedule', action='store_true',
+                        help="inferență doar pe cadrele cheie, landmark-uri extrapolate între ele")
+    parser.add_argument('--scales', default=None, metavar='W1,W2,…',
+                        help="compară lățimi de inferență (px) cu rezoluția originală")
+    parser.add_argument('--backends', default=None, metavar='B1,B2,…',
+                        help="compară backend-uri de landmark-uri (latență, acord EAR/MAR cu primul)")
+    parser.add_argument('--threaded', action='store_true',
+                        help="landmark-urile pe un fir separat de restul etapelor")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    source = open_source(args)
+    if args.scales:
+        widths = [int(w) for w in args.scales.split(',')]
+        try:
+            frames, rows = compare_scales(source, widths, args.max_frames)
+        finally:
+            source.release()
+        print_comparison("📐 REZOLUȚIE INFERENȚĂ", frames, rows)
+        return
+    if args.backends:
+        try:
+            frames, rows = compare_backends(source, args.backends.split(','), config, args.max_frames)
+        finally:
+            source.release()
+        print_comparison("🧩 BACKEND-URI LANDMARK-URI", frames, rows)
+        return
+
+    try:
+        stats = run_pipeline(source, config, args.max_frames, args.track, args.schedule, args.threaded)
+    finally:
+        source.release()
+    print_report(stats, source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# capture/camera_manager.py
+"""
+Mai multe camere în paralel (ex. cameră pe fața șoferului + cameră de cabină).
+CameraManager deschide camerele FLIR după numărul de serie, fiecare cameră are
+propriul CameraWorker (captură → landmarks → metrici pe un fir separat), iar
+rezultatele ajung într-un ResultAggregator comun. MediaPipe și OpenCV eliberează
+GIL-ul în timpul procesării, așa că firele rulează efectiv pe nuclee diferite.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from capture.frame_buffer import CaptureThread
+from feature_extraction.features import compute_features
+
+
+@dataclass
+class CameraResult:
+    #Rezultatul analizei unui cadru de la o cameră.
+    camera: str
+    frame_id: int
+    timestamp: float         # ceasul sursei (vezi FrameRecord)
+    host_time: float         # primirea cadrului pe host
+    face: bool
+    ear: Optional[float] = None
+    mar: Optional[float] = None
+    pitch: Optional[float] = None
+    processing_ms: float = 0.0
+
+
+class ResultAggregator:
+    """
+    Colectează rezultatele tuturor camerelor. Păstrează ultimul rezultat per
+    cameră și contoare; listener-ii sunt apelați pe firul worker-ului.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._counts = {}
+        self._first_host_time = {}
+        self._listeners = []
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def publish(self, result: CameraResult):
+        with self._lock:
+            self._latest[result.camera] = result
+            self._counts[result.camera] = self._counts.get(result.camera, 0) + 1
+            self._first_host_time.setdefault(result.camera, result.host_time)
+        for callback in self._listeners:
+            callback(result)
+
+    def latest(self, camera=None):
+        #Ultimul rezultat al unei camere sau dict-ul cu ultimele rezultate ale tuturor.
+        with self._lock:
+            if camera is not None:
+                return self._latest.get(camera)
+            return dict(self._latest)
+
+    def stats(self) -> dict:
+        # Rezultate și debit (rezultate/s) per cameră
+        with self._lock:
+            stats = {}
+            for camera, count in self._counts.items():
+                span = self._latest[camera].host_time - self._first_host_time[camera]
+                stats[camera] = {
+                    'results': count,
+                    'fps': (count - 1) / span if span > 0 else 0.0,
+                }
+            return stats
+
+
+class CameraWorker:
+    """
+    Pipeline complet pentru o singură cameră, pe un fir propriu: firul de
+    captură umple buffer-ul, worker-ul ia cel mai nou cadru, extrage
+    landmark-urile și metricile și publică un CameraResult.
+    """
+    def __init__(self, name, source, aggregator, detector_factory=None, buffer_size=2):
+        """
+        detector_factory – creează detectorul de landmark-uri al worker-ului
+                           (implicit backend-ul MediaPipe); fiecare fir are propriul
+                           detector, fiindcă FaceMesh nu e thread-safe
+        """
+        self.name = name
+        self.source = source
+        self.aggregator = aggregator
+        self.detector_factory = detector_factory
+        self.capture = CaptureThread(source, buffer_size=buffer_size)
+        self.processed = 0
+        self.processing_ms_sum = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.capture.start()
+        self._thread = threading.Thread(target=self._run, name=f"worker-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.capture.stop(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _make_detector(self):
+        if self.detector_factory is not None:
+            return self.detector_factory()
+        from feature_extraction.backends import create_backend
+        return create_backend()
+
+    def _run(self):
+        detector = self._make_detector()
+        try:
+            while not self._stop_event.is_set():
+                record = self.capture.get_latest(timeout=0.1)
+                if record is None:
+                    continue
+                self.aggregator.publish(self._process(detector, record))
+        finally:
+            detector.close()
+
+    def _process(self, detector, record):
+        t0 = time.perf_counter()
+        frame = record.image
+        height, width = frame.shape[:2]
+        landmarks = detector.find_landmarks(frame)
+        result = CameraResult(self.name, record.frame_id, record.timestamp,
+                              record.host_time, landmarks is not None)
+        if landmarks is not None:
+            features = compute_features(landmarks, width, height)
+            result.ear, result.mar, result.pitch = features.ear, features.mar, features.pitch
+        result.processing_ms = (time.perf_counter() - t0) * 1000.0
+        self.processed += 1
+        self.processing_ms_sum += result.processing_ms
+        return result
+
+
+class CameraManager:
+    """
+    Deține sursele de cadre și worker-ii lor. open_flir() deschide toate
+    camerele FLIR detectate (sau doar seriile cerute) pe o instanță
+    PySpin.System comună; add_source() acceptă orice FrameSource.
+    """
+    def __init__(self, aggregator=None, detector_factory=None, buffer_size=2):
+        self.aggregator = aggregator or ResultAggregator()
+        self.detector_factory = detector_factory
+        self.buffer_size = buffer_size
+        self.sources = {}
+        self.workers = {}
+        self._system = None
+
+    def open_flir(self, serials=None, **camera_kwargs):
+        #Deschide camerele FLIR după numărul de serie; returnează seriile deschise.
+        import PySpin
+        from capture.flir_camera import FlirCamera, read_serial
+
+        if self._system is None:
+            self._system = PySpin.System.GetInstance()
+        if serials is None:
+            cam_list = self._system.GetCameras()
+            serials = []
+            for i in range(cam_list.GetSize()):
+                serial = read_serial(cam_list.GetByIndex(i))
+                if serial is None:
+                    # FlirCamera(serial=None) ar deschide din nou prima cameră
+                    print(f"⚠️ Camera FLIR #{i} nu are număr de serie lizibil, o sărim")
+                    continue
+                serials.append(serial)
+            cam_list.Clear()
+
+        opened = []
+        for serial in serials:
+            try:
+                camera = FlirCamera(serial=serial, system=self._system, **camera_kwargs)
+            except Exception as e:
+                print(f"‼️ Camera {serial} nu a putut fi deschisă: {e}")
+                continue
+            self.add_source(str(serial), camera)
+            opened.append(str(serial))
+        print(f"✅ Camere FLIR deschise: {opened}")
+        return opened
+
+    def add_source(self, name, source):
+        if name in self.sources:
+            raise ValueError(f"Există deja o sursă cu numele {name}")
+        self.sources[name] = source
+        self.workers[name] = CameraWorker(name, source, self.aggregator,
+                                          self.detector_factory, self.buffer_size)
+
+    def start(self):
+        for worker in self.workers.values():
+            worker.start()
+
+    def stop(self):
+        for worker in self.workers.values():
+            worker.stop()
+
+    def release(self):
+        #Oprește worker-ii și eliberează camerele, apoi instanța de sistem.
+        self.stop()
+        for source in self.sources.values():
+            source.release()
+        self.sources.clear()
+        self.workers.clear()
+        if self._system is not None:
+            self._system.ReleaseInstance()
+            self._system = None
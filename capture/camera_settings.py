@@ -0,0 +1,31 @@
+# capture/camera_settings.py
+"""
+Set de setări de cameră aplicate împreună, într-o singură oprire a achiziției.
+Câmpurile lăsate pe None nu se modifică.
+"""
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+# Câmpuri care cer oprirea achiziției (profil de stream, format și geometrie)
+STREAM_FIELDS = ('profile', 'pixel_format', 'width', 'height', 'offset_x', 'offset_y')
+
+
+@dataclass
+class CameraSettings:
+    pixel_format: Optional[str] = None   # 'Mono8' / 'BayerRG8'
+    width: Optional[int] = None
+    height: Optional[int] = None
+    offset_x: Optional[int] = None
+    offset_y: Optional[int] = None
+    fps: Optional[float] = None
+    profile: Optional[str] = None        # cheie din ACQUISITION_PROFILES
+
+    def changed(self) -> dict:
+        #Doar câmpurile setate explicit.
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+    def merged(self, other: "CameraSettings") -> "CameraSettings":
+        #Setările curente peste care se suprapun câmpurile setate din `other`.
+        values = asdict(self)
+        values.update(other.changed())
+        return CameraSettings(**values)
@@ -3,19 +3,66 @@
 Module pentru captură video de la camera FLIR folosind PySpin.
 Gestionează inițializarea camerei, configurările și preluarea cadrelor.
 """
+import threading
+import time
+
 import PySpin
 import cv2
 import numpy as np
 
-class FlirCamera:
-    def __init__(self):
+from capture.camera_settings import CameraSettings, STREAM_FIELDS
+from capture.frame_source import FrameSource, FrameRecord
+
+PIXEL_FORMATS = {
+    "Mono8": PySpin.PixelFormat_Mono8,
+    "BayerRG8": PySpin.PixelFormat_BayerRG8,
+}
+
+# Profiluri de achiziție pentru stream-ul Spinnaker
+#   buffer_handling – StreamBufferHandlingMode
+#   buffer_count    – câte buffere alocă driverul (None = minimul permis)
+ACQUISITION_PROFILES = {
+    # cel mai nou cadru, coadă minimă: alertele se calculează pe imagini proaspete
+    "lowest_latency": {"buffer_handling": "NewestOnly", "buffer_count": None},
+    # coadă adâncă, niciun cadru aruncat de driver (pentru înregistrare)
+    "no_drops": {"buffer_handling": "OldestFirst", "buffer_count": 200},
+    # setările implicite ale driverului
+    "default": None,
+}
+
+def read_serial(cam):
+    #Numărul de serie din nodemap-ul TL al dispozitivului (nu cere Init()).
+    try:
+        return cam.TLDevice.DeviceSerialNumber.GetValue()
+    except Exception:
+        return None
+
+
+class FlirCamera(FrameSource):
+    can_reconnect = True
+
+    def __init__(self, grab_timeout_ms=1000, profile="lowest_latency", serial=None, system=None):
+        """
+        serial – numărul de serie al camerei dorite (None = prima cameră detectată)
+        system – instanța PySpin.System partajată (CameraManager); dacă lipsește,
+                 camera își obține singură instanța și o eliberează la release()
+        """
+        super().__init__()
+        if profile not in ACQUISITION_PROFILES:
+            raise ValueError(f"Profil de achiziție necunoscut: {profile}")
+        self.profile = profile
+        self.queue_depth = None
+        # Timeout finit pentru GetNextImage, ca firul de captură să poată fi oprit
+        self.grab_timeout_ms = grab_timeout_ms
+        # Serializăm accesul la cameră între firul de captură și setările din GUI
+        self._lock = threading.RLock()
         # Obținem instanța de sistem și lista de camere
-        self.system = PySpin.System.GetInstance()
+        self._owns_system = system is None
+        self.system = system if system is not None else PySpin.System.GetInstance()
+        self.serial = serial
         self.cam_list = self.system.GetCameras()
-        if self.cam_list.GetSize() == 0:
-            raise RuntimeError("Nicio cameră FLIR detectată.")
-        # Inițializăm prima cameră disponibilă
-        self.cam = self.cam_list.GetByIndex(0)
+        # Inițializăm camera cerută (sau prima disponibilă)
+        self.cam = self._select_camera()
         self.cam.Init()
         # Activăm controlul manual al FPS
         if hasattr(self.cam, "AcquisitionFrameRateEnable"):
@@ -39,6 +86,8 @@ class FlirCamera:
                 self.cam.PixelFormat.SetValue(PySpin.PixelFormat_Mono8)
             except Exception as e:
                 raise RuntimeError(f"Eroare la setarea formatului pixel: {e}")
+        # Formatul se schimbă doar în set_pixel_format / reset_camera, deci îl ținem în cache
+        self._refresh_pixel_format()
 
         # Setăm modul de achiziție continuă
         self.cam.AcquisitionMode.SetValue(PySpin.AcquisitionMode_Continuous)
@@ -55,9 +104,18 @@ class FlirCamera:
         except Exception:
             self.max_fps = 30.0
 
+        # Nodurile de stream se pot scrie doar cu achiziția oprită
+        self._apply_stream_profile()
+
         # Începem achiziția de cadre
         self.cam.BeginAcquisition()
 
+        # Limitele pentru ROI/FPS și setările curente, folosite la validare
+        self._refresh_limits()
+        self.settings = self._read_settings()
+        self.last_interruption_s = 0.0
+
+    def _refresh_limits(self):
         # Coordonate și limite pentru ROI (offset și rezoluție)
         try:
             self.width_min = self.cam.Width.GetMin()
@@ -77,90 +135,337 @@ class FlirCamera:
             self.width_max = self.height_max = 0
             self.offset_x_min = self.offset_y_min = 0
             self.offset_x_max = self.offset_y_max = 0
-    
-    def reset_camera(self):
+            self.width_inc = self.height_inc = 1
+            self.offset_x_inc = self.offset_y_inc = 1
+
+        # Dimensiunea completă a senzorului (Width.GetMax depinde de offsetul curent)
+        try:
+            self.sensor_size = (self.cam.WidthMax.GetValue(), self.cam.HeightMax.GetValue())
+        except Exception:
+            self.sensor_size = (self.width_max, self.height_max)
+
+        try:
+            self.fps_min = self.cam.AcquisitionFrameRate.GetMin()
+            self.fps_max = self.cam.AcquisitionFrameRate.GetMax()
+        except Exception:
+            self.fps_min, self.fps_max = 1.0, self.max_fps
+
+    def _apply_stream_profile(self):
         """
-        Reset complet ca la deconectare fizică:
+        Configurează nodurile de stream (mod de gestionare și număr de buffere)
+        pentru profilul curent. Se apelează doar cu achiziția oprită.
         """
+        cfg = ACQUISITION_PROFILES[self.profile]
+        try:
+            nodemap = self.cam.GetTLStreamNodeMap()
+            if cfg is not None:
+                handling = PySpin.CEnumerationPtr(nodemap.GetNode("StreamBufferHandlingMode"))
+                handling.SetIntValue(handling.GetEntryByName(cfg["buffer_handling"]).GetValue())
+
+                count_mode = PySpin.CEnumerationPtr(nodemap.GetNode("StreamBufferCountMode"))
+                count_mode.SetIntValue(count_mode.GetEntryByName("Manual").GetValue())
+                count = PySpin.CIntegerPtr(nodemap.GetNode("StreamBufferCountManual"))
+                wanted = cfg["buffer_count"] or count.GetMin()
+                count.SetValue(max(count.GetMin(), min(wanted, count.GetMax())))
+            self.queue_depth = self._read_queue_depth(nodemap)
+            print(f"✅ Profil achiziție '{self.profile}' — adâncime coadă: {self.queue_depth}")
+        except Exception as e:
+            print(f"⚠️ Profilul de achiziție '{self.profile}' nu a putut fi aplicat: {e}")
+
+    def _read_queue_depth(self, nodemap):
+        # Numărul efectiv de buffere alocate de driver
+        for name in ("StreamBufferCountResult", "StreamBufferCountManual"):
+            node = PySpin.CIntegerPtr(nodemap.GetNode(name))
+            if PySpin.IsAvailable(node) and PySpin.IsReadable(node):
+                return node.GetValue()
+        return None
+
+    def _read_settings(self):
+        # Starea curentă a camerei, ca punct de plecare pentru apply()
+        try:
+            return CameraSettings(
+                pixel_format=self.pixel_format,
+                width=self.cam.Width.GetValue(),
+                height=self.cam.Height.GetValue(),
+                offset_x=self.cam.OffsetX.GetValue(),
+                offset_y=self.cam.OffsetY.GetValue(),
+                fps=self.cam.AcquisitionFrameRate.GetValue(),
+                profile=self.profile,
+            )
+        except Exception:
+            return CameraSettings(pixel_format=self.pixel_format, profile=self.profile)
+    
+    def _select_camera(self):
+        # Camera după numărul de serie, ca la reconectare să redeschidem aceeași cameră
+        if self.cam_list.GetSize() == 0:
+            raise RuntimeError("Nicio cameră FLIR detectată.")
+        if self.serial is None:
+            cam = self.cam_list.GetByIndex(0)
+            self.serial = read_serial(cam)
+            return cam
+        cam = self.cam_list.GetBySerial(str(self.serial))
+        if cam is None or not cam.IsValid():
+            raise RuntimeError(f"Camera FLIR cu seria {self.serial} nu este conectată.")
+        return cam
+
+    def _reopen(self):
+        # Re-enumerează camerele și reinițializează camera cu seria self.serial (fără BeginAcquisition).
+        # Ridică excepție dacă dispozitivul nu poate fi redeschis.
+        # camera poate fi deja deconectată, deci erorile de oprire se ignoră
         try:
-            print("🔁 Reset software complet — cameră + sistem")
             self.cam.EndAcquisition()
+        except Exception:
+            pass
+        try:
             self.cam.DeInit()
-            self.cam_list.Clear()
-            self.cam_list = self.system.GetCameras()
-            if self.cam_list.GetSize() == 0:
-                raise RuntimeError("‼️ Nicio cameră detectată după reset.")
+        except Exception:
+            pass
+        self.cam_list.Clear()
+        self.cam_list = self.system.GetCameras()
+        self.cam = self._select_camera()
+        self.cam.Init()
+        self.cam.AcquisitionMode.SetValue(PySpin.AcquisitionMode_Continuous)
+        self._apply_stream_profile()
+        self._refresh_pixel_format()
 
-            self.cam = self.cam_list.GetByIndex(0)
-            self.cam.Init()
+    def reconnect(self):
+        """
+        Reconectare după pierderea camerei (ex. deconectare USB): redeschide
+        dispozitivul și restaurează ultimele setări aplicate.
+        Ridică excepție la eșec, ca apelantul să poată reîncerca.
+        """
+        with self._lock:
+            previous = self.settings
+            self._reopen()
+            self._refresh_limits()
+            self.settings = self._read_settings()
+            try:
+                target = self.validate(previous)
+                changes = {k: v for k, v in target.changed().items()
+                           if getattr(self.settings, k) != v}
+                self._write_nodes(target, changes)
+            except ValueError as e:
+                print(f"⚠️ Setările anterioare nu pot fi restaurate: {e}")
+            self.cam.BeginAcquisition()
+            self._refresh_limits()
+            self.settings = self._read_settings()
+            print("✅ Camera reconectată, setări restaurate")
 
+    def reset_camera(self):
+        """
+        Reset complet ca la deconectare fizică:
+        """
+        with self._lock:
             try:
-                self.cam.PixelFormat.SetValue(PySpin.PixelFormat_BayerRG8)
-            except:
-                self.cam.PixelFormat.SetValue(PySpin.PixelFormat_Mono8)
+                print("🔁 Reset software complet — cameră + sistem")
+                self._reopen()
+
+                try:
+                    self.cam.PixelFormat.SetValue(PySpin.PixelFormat_BayerRG8)
+                except:
+                    self.cam.PixelFormat.SetValue(PySpin.PixelFormat_Mono8)
+                self._refresh_pixel_format()
+
+                if hasattr(self.cam, "AcquisitionFrameRateEnable"):
+                    self.cam.AcquisitionFrameRateEnable.SetValue(True)
+                    fps_reset = 20.0
+                    fps_min = self.cam.AcquisitionFrameRate.GetMin()
+                    fps_max = self.cam.AcquisitionFrameRate.GetMax()
+                    if fps_min <= fps_reset <= fps_max:
+                        self.cam.AcquisitionFrameRate.SetValue(fps_reset)
+                        print(f"✅ FPS resetat la {fps_reset}")
+                    else:
+                        print(f"⚠️ FPS dorit ({fps_reset}) e în afara limitelor.")
+
+                width  = self.cam.Width.GetMax()
+                height = self.cam.Height.GetMax()
+                self.cam.Width.SetValue(width)
+                self.cam.Height.SetValue(height)
+                print(f"✅ Rezoluție resetată la {width}x{height}")
+
+                try:
+                    self.cam.OffsetX.SetValue(0)
+                    self.cam.OffsetY.SetValue(0)
+                    print("✅ Offset resetat la (0,0)")
+                except:
+                    print("⚠️ Offset nu a putut fi resetat (poate nu este suportat)")
+
+                self.cam.BeginAcquisition()
+                self._refresh_limits()
+                self.settings = self._read_settings()
+                print("✅ Camera complet resetată și funcțională")
+
+            except Exception as e:
+                print(f"‼️ Eroare la reset_camera: {e}")
+                import traceback
+                traceback.print_exc()
 
-            self.cam.AcquisitionMode.SetValue(PySpin.AcquisitionMode_Continuous)
+    def _refresh_pixel_format(self):
+        # Citește formatul curent de pe cameră (apelat doar la schimbarea lui)
+        try:
+            self.pixel_format = self.cam.PixelFormat.GetCurrentEntry().GetSymbolic()
+        except Exception:
+            self.pixel_format = None
 
-            if hasattr(self.cam, "AcquisitionFrameRateEnable"):
+    def validate(self, settings):
+        """
+        Verifică setările față de limitele din cache, fără să atingă camera.
+        Returnează setările complete (curente + cele noi), aliniate la incremente.
+        Ridică ValueError cu toate problemele găsite.
+        """
+        target = self.settings.merged(settings)
+        errors = []
+        sensor_w, sensor_h = self.sensor_size
+
+        if target.pixel_format is not None and target.pixel_format not in PIXEL_FORMATS:
+            errors.append(f"format pixel necunoscut: {target.pixel_format}")
+        if target.profile is not None and target.profile not in ACQUISITION_PROFILES:
+            errors.append(f"profil de achiziție necunoscut: {target.profile}")
+
+        if target.width is not None:
+            if not (self.width_min <= target.width <= sensor_w):
+                errors.append(f"lățime {target.width} în afara [{self.width_min}, {sensor_w}]")
+            target.width -= target.width % self.width_inc
+        if target.height is not None:
+            if not (self.height_min <= target.height <= sensor_h):
+                errors.append(f"înălțime {target.height} în afara [{self.height_min}, {sensor_h}]")
+            target.height -= target.height % self.height_inc
+
+        if target.offset_x is not None and target.width is not None:
+            if not (0 <= target.offset_x <= sensor_w - target.width):
+                errors.append(f"offset X {target.offset_x} în afara [0, {sensor_w - target.width}]")
+            target.offset_x -= target.offset_x % self.offset_x_inc
+        if target.offset_y is not None and target.height is not None:
+            if not (0 <= target.offset_y <= sensor_h - target.height):
+                errors.append(f"offset Y {target.offset_y} în afara [0, {sensor_h - target.height}]")
+            target.offset_y -= target.offset_y % self.offset_y_inc
+
+        # Maximul FPS depinde de ROI, așa că îl limităm abia după aplicarea geometriei
+        if target.fps is not None and target.fps < self.fps_min:
+            errors.append(f"FPS {target.fps} sub minimul {self.fps_min}")
+
+        if errors:
+            raise ValueError("; ".join(errors))
+        return target
+
+    def _fps_writable_live(self):
+        try:
+            return PySpin.IsWritable(self.cam.AcquisitionFrameRate)
+        except Exception:
+            return False
+
+    def _write_nodes(self, target, changes):
+        # Ordinea contează: stream-ul, formatul, geometria (offset la 0 întâi), apoi FPS-ul
+        if 'profile' in changes:
+            self.profile = target.profile
+            self._apply_stream_profile()
+
+        if 'pixel_format' in changes:
+            self.cam.PixelFormat.SetValue(PIXEL_FORMATS[target.pixel_format])
+            self._refresh_pixel_format()
+
+        if any(k in changes for k in ('width', 'height', 'offset_x', 'offset_y')):
+            self.cam.OffsetX.SetValue(0)
+            self.cam.OffsetY.SetValue(0)
+            self.cam.Width.SetValue(target.width)
+            self.cam.Height.SetValue(target.height)
+            self.cam.OffsetX.SetValue(target.offset_x)
+            self.cam.OffsetY.SetValue(target.offset_y)
+
+        # FPS-ul maxim crește când transferăm mai puțini pixeli
+        self.max_fps = self.cam.AcquisitionFrameRate.GetMax()
+        if 'fps' in changes:
+            if hasattr(self.cam, 'AcquisitionFrameRateEnable'):
                 self.cam.AcquisitionFrameRateEnable.SetValue(True)
-                fps_reset = 20.0
-                fps_min = self.cam.AcquisitionFrameRate.GetMin()
-                fps_max = self.cam.AcquisitionFrameRate.GetMax()
-                if fps_min <= fps_reset <= fps_max:
-                    self.cam.AcquisitionFrameRate.SetValue(fps_reset)
-                    print(f"✅ FPS resetat la {fps_reset}")
-                else:
-                    print(f"⚠️ FPS dorit ({fps_reset}) e în afara limitelor.")
-
-            width  = self.cam.Width.GetMax()
-            height = self.cam.Height.GetMax()
-            self.cam.Width.SetValue(width)
-            self.cam.Height.SetValue(height)
-            print(f"✅ Rezoluție resetată la {width}x{height}")
+            fps = min(float(target.fps), self.max_fps)
+            if fps < target.fps:
+                print(f"⚠️ FPS {target.fps} limitat la maximul camerei: {fps:.1f}")
+            self.cam.AcquisitionFrameRate.SetValue(fps)
 
+    def apply(self, settings):
+        """
+        Aplică un CameraSettings ca o tranzacție: validează tot, oprește achiziția
+        cel mult o dată, scrie nodurile în ordinea corectă și repornește.
+        Returnează cât a fost întrerupt stream-ul, în secunde (0.0 dacă nu a fost nevoie).
+        """
+        with self._lock:
+            target = self.validate(settings)
+            changes = {k: v for k, v in target.changed().items()
+                       if getattr(self.settings, k) != v}
+            if not changes:
+                self.last_interruption_s = 0.0
+                return 0.0
+
+            # FPS-ul singur se poate schimba din mers dacă nodul e scriibil
+            stop = any(k in STREAM_FIELDS for k in changes) or not self._fps_writable_live()
+            t0 = time.perf_counter()
+            if stop:
+                try:
+                    self.cam.EndAcquisition()
+                except Exception:
+                    pass
             try:
-                self.cam.OffsetX.SetValue(0)
-                self.cam.OffsetY.SetValue(0)
-                print("✅ Offset resetat la (0,0)")
-            except:
-                print("⚠️ Offset nu a putut fi resetat (poate nu este suportat)")
-
-            self.cam.BeginAcquisition()
-            print("✅ Camera complet resetată și funcțională")
-
-        except Exception as e:
-            print(f"‼️ Eroare la reset_camera: {e}")
-            import traceback
-            traceback.print_exc()
+                self._write_nodes(target, changes)
+            finally:
+                if stop:
+                    self.cam.BeginAcquisition()
+                self.settings = self._read_settings()
+            interruption = time.perf_counter() - t0 if stop else 0.0
+            self.last_interruption_s = interruption
+            print(f"✅ Setări aplicate {changes} — stream întrerupt {interruption * 1000:.0f} ms")
+            return interruption
 
     def get_frame(self):
         """
-        Obține un frame valid
+        Obține un frame valid (sau None la timeout / frame incomplet)
+        """
+        record = self.get_frame_record()
+        return record.image if record is not None else None
+
+    def get_frame_record(self):
+        """
+        Obține un frame valid împreună cu timestamp-ul camerei, frame ID-ul
+        și momentul primirii pe host (sau None la timeout / frame incomplet)
         """
         try:
-            image_result = self.cam.GetNextImage(PySpin.EVENT_TIMEOUT_INFINITE)
+            return self._grab_frame()
+        except Exception as e:
+            print(f"‼️ Eroare la get_frame(): {e}")
+            return None
+
+    def _grab_frame(self):
+        # Așteptarea cadrului (până la grab_timeout_ms) se face fără lock, ca setările din
+        # GUI (apply, gain, expunere) să nu aștepte după ea; dacă între timp achiziția e
+        # oprită sau camera redeschisă, GetNextImage ridică excepție și cadrul se pierde
+        with self._lock:
+            cam = self.cam
+        image_result = cam.GetNextImage(self.grab_timeout_ms)
+        host_time = time.monotonic()
 
+        with self._lock:
             if image_result.IsIncomplete():
                 print("⚠️ Frame incomplet — ignorat.")
+                self.stats.incomplete += 1
                 image_result.Release()
                 return None  # doar sărim peste
 
+            frame_id = image_result.GetFrameID()
+            timestamp = image_result.GetTimeStamp() * 1e-9   # ns → s, ceasul camerei
+
             data = image_result.GetNDArray()
-            pf = self.cam.PixelFormat.GetCurrentEntry().GetSymbolic()
+            pf = self.pixel_format
 
             if pf == "Mono8":
-                frame = cv2.merge([data, data, data])
+                # Rămânem pe un singur canal; copiem pentru că buffer-ul e eliberat mai jos
+                frame = data.copy()
             elif pf == "BayerRG8":
                 frame = cv2.cvtColor(data, cv2.COLOR_BAYER_RG2BGR)
             else:
                 frame = data
 
             image_result.Release()
-            return frame
-
-        except Exception as e:
-            print(f"‼️ Eroare la get_frame(): {e}")
-            return None
+            self.stats.update(frame_id, host_time)
+        return FrameRecord(frame, frame_id, timestamp, host_time)
 
 
 
@@ -180,7 +485,8 @@ class FlirCamera:
             pass
         try:
             self.cam_list.Clear()
-            self.system.ReleaseInstance()
+            if self._owns_system:
+                self.system.ReleaseInstance()
         except Exception:
             pass
 
@@ -202,23 +508,8 @@ class FlirCamera:
 
     def set_frame_rate(self, fps):
         try:
-            min_fps = self.cam.AcquisitionFrameRate.GetMin()
-            max_fps = self.cam.AcquisitionFrameRate.GetMax()
-
-            if not (min_fps <= fps <= max_fps):
-                print(f"⚠️ FPS {fps} e în afara limitelor: {min_fps} – {max_fps}")
-                return
-
-            if hasattr(self.cam, 'AcquisitionFrameRateEnable'):
-                self.cam.AcquisitionFrameRateEnable.SetValue(True)
-
-            # Doar dacă e necesar, oprim stream-ul
-            self.cam.EndAcquisition()
-            self.cam.AcquisitionFrameRate.SetValue(float(fps))
-            self.cam.BeginAcquisition()
-
+            self.apply(CameraSettings(fps=float(fps)))
             print(f"✅ FPS setat la {fps}")
-            self.max_fps = max_fps
         except Exception as e:
             print(f"‼️ Eroare la setarea fps-ului: {e}")
 
@@ -269,34 +560,26 @@ class FlirCamera:
     def set_pixel_format(self, format_name):
         #Setează formatul de pixel (de exemplu 'Mono8' sau 'BayerRG8').
         try:
-            self.cam.EndAcquisition()
-        except Exception:
-            pass
-        try:
-            if format_name == "Mono8":
-                self.cam.PixelFormat.SetValue(PySpin.PixelFormat_Mono8)
-            elif format_name == "BayerRG8":
-                self.cam.PixelFormat.SetValue(PySpin.PixelFormat_BayerRG8)
+            self.apply(CameraSettings(pixel_format=format_name))
         except Exception as e:
             print(f"Eroare la setarea formatului pixel: {e}")
-        finally:
-            # Reîncepem achiziția după schimbarea formatului
-            self.cam.BeginAcquisition()
+
+    def set_acquisition_profile(self, name):
+        #Schimbă profilul de achiziție; returnează adâncimea efectivă a cozii.
+        try:
+            self.apply(CameraSettings(profile=name))
+        except Exception as e:
+            print(f"‼️ Eroare la setarea profilului de achiziție: {e}")
+        return self.queue_depth
 
     def set_resolution(self, width, height):
         try:
             print(f"📐 Setez rezoluția: {width}x{height}")
-            self.cam.EndAcquisition()
-
-            # 🧱 Obținem capabilitățile camerei
-            width_max = self.cam.Width.GetMax()
-            height_max = self.cam.Height.GetMax()
-            width_inc = self.cam.Width.GetInc()
-            height_inc = self.cam.Height.GetInc()
+            sensor_w, sensor_h = self.sensor_size
 
             # 🔐 Definim minimul acceptat de cameră
-            min_width = max(width_inc, 64)
-            min_height = max(height_inc, 64)
+            min_width = max(self.width_inc, 64)
+            min_height = max(self.height_inc, 64)
 
             # ✅ Verificăm și corectăm dacă valorile sunt prea mici
             if width < min_width or height < min_height:
@@ -304,18 +587,16 @@ class FlirCamera:
                 width, height = 640, 480
 
             # ✅ Limităm la maxim permis
-            width = min(width, width_max)
-            height = min(height, height_max)
-
-            # ✅ Ajustăm la increment corect
-            width -= width % width_inc
-            height -= height % height_inc
+            width = min(width, sensor_w)
+            height = min(height, sensor_h)
 
-            self.cam.Width.SetValue(width)
-            self.cam.Height.SetValue(height)
+            # Păstrăm offsetul curent cât timp noua rezoluție încape pe senzor
+            x = min(self.settings.offset_x or 0, sensor_w - width)
+            y = min(self.settings.offset_y or 0, sensor_h - height)
+            self.apply(CameraSettings(width=width, height=height, offset_x=x, offset_y=y))
 
-            print(f"✅ Rezoluție aplicată: {width}x{height}")
-            self.cam.BeginAcquisition()
+            w, h = self.settings.width, self.settings.height
+            print(f"✅ Rezoluție aplicată: {w}x{h}")
 
         except Exception as e:
             print(f"‼️ Eroare la setarea rezoluției: {e}")
@@ -324,35 +605,14 @@ class FlirCamera:
 
     def set_offset(self, x_offset, y_offset):
         try:
-            x = int(x_offset)
-            y = int(y_offset)
-
-            xmin, xmax, xinc = self.offset_x_min, self.offset_x_max, self.offset_x_inc
-            ymin, ymax, yinc = self.offset_y_min, self.offset_y_max, self.offset_y_inc
-
-            if xmax == 0 or ymax == 0:
-                print("⚠️ Offsetul nu este suportat de cameră.")
-                return
-            
-            x = max(xmin, min(x, xmax))
-            y = max(ymin, min(y, ymax))
-            x_adj = xmin + ((x - xmin) // xinc) * xinc
-            y_adj = ymin + ((y - ymin) // yinc) * yinc
-
-            # Oprim achiziția
-            self.cam.EndAcquisition()
-
-            width  = self.cam.Width.GetValue()
-            height = self.cam.Height.GetValue()
-            self.cam.Width.SetValue(width)
-            self.cam.Height.SetValue(height)
+            sensor_w, sensor_h = self.sensor_size
+            w = self.settings.width or sensor_w
+            h = self.settings.height or sensor_h
+            x = max(0, min(int(x_offset), sensor_w - w))
+            y = max(0, min(int(y_offset), sensor_h - h))
 
-            # Aplicăm offset
-            self.cam.OffsetX.SetValue(x_adj)
-            self.cam.OffsetY.SetValue(y_adj)
-
-            # Restart achiziție
-            self.cam.BeginAcquisition()
+            self.apply(CameraSettings(offset_x=x, offset_y=y))
+            x_adj, y_adj = self.settings.offset_x, self.settings.offset_y
 
             print(f"✅ Offset setat și achiziție repornită: X={x_adj}, Y={y_adj}")
             self.last_applied_offset = (x_adj, y_adj)
@@ -362,39 +622,50 @@ class FlirCamera:
             traceback.print_exc()
 
 
+    def get_roi(self):
+        #Returnează ROI-ul curent de pe senzor: (offset_x, offset_y, width, height).
+        try:
+            return (self.cam.OffsetX.GetValue(), self.cam.OffsetY.GetValue(),
+                    self.cam.Width.GetValue(), self.cam.Height.GetValue())
+        except Exception:
+            return (0, 0) + tuple(self.get_resolution())
+
+    def set_roi(self, x, y, width, height, fps=None):
+        """
+        Mută ROI-ul hardware într-o singură oprire a achiziției.
+        Valorile sunt limitate la senzor; apply() le aliniază la incrementele camerei.
+        Opțional aplică și un FPS nou (un ROI mai mic permite un FPS mai mare).
+        """
+        try:
+            sensor_w, sensor_h = self.sensor_size
+            w = max(self.width_min, min(int(width), sensor_w))
+            h = max(self.height_min, min(int(height), sensor_h))
+            x = max(0, min(int(x), sensor_w - w))
+            y = max(0, min(int(y), sensor_h - h))
+            self.apply(CameraSettings(width=w, height=h, offset_x=x, offset_y=y, fps=fps))
+            st = self.settings
+            self.last_applied_offset = (st.offset_x, st.offset_y)
+            return (st.offset_x, st.offset_y, st.width, st.height)
+        except Exception as e:
+            print(f"‼️ Eroare la setarea ROI-ului: {e}")
+            return None
+
     def center_roi(self):
         """
         Centrează imaginea în mijlocul senzorului, ajustând offsetul la cel mai apropiat multiplu valid.
         """
         try:
-            # Obținem dimensiuni actuale și maxime
-            width_curent  = self.cam.Width.GetValue()
-            height_curent = self.cam.Height.GetValue()
-            width_max     = self.cam.Width.GetMax()
-            height_max    = self.cam.Height.GetMax()
-
-            # Obținem incrementul de offset
-            xinc = self.offset_x_inc
-            yinc = self.offset_y_inc
+            sensor_w, sensor_h = self.sensor_size
+            width_curent = self.settings.width
+            height_curent = self.settings.height
 
-            # Calculează offsetul ideal pentru centrare
-            x_offset = ((width_max - width_curent) // 2) // xinc * xinc
-            y_offset = ((height_max - height_curent) // 2) // yinc * yinc
+            # Calculează offsetul ideal pentru centrare (apply îl aliniază la increment)
+            x_offset = (sensor_w - width_curent) // 2
+            y_offset = (sensor_h - height_curent) // 2
+            self.apply(CameraSettings(offset_x=x_offset, offset_y=y_offset))
 
-            # Oprim și restartăm achiziția ca să aplicăm în siguranță
-            self.cam.EndAcquisition()
-
-            # Reconfirmăm width și height pentru ca offset să se aplice corect
-            self.cam.Width.SetValue(width_curent)
-            self.cam.Height.SetValue(height_curent)
-
-            self.cam.OffsetX.SetValue(x_offset)
-            self.cam.OffsetY.SetValue(y_offset)
-
-            self.cam.BeginAcquisition()
-
-            print(f"✅ ROI centrat la mijloc: X={x_offset}, Y={y_offset}")
+            print(f"✅ ROI centrat la mijloc: X={self.settings.offset_x}, Y={self.settings.offset_y}")
         except Exception as e:
             print(f"‼️ Eroare la centrarea ROI-ului: {e}")
             import traceback
-            traceback.print_exc()
\ No newline at end of file
+            traceback.print_exc()
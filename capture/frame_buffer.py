@@ -0,0 +1,150 @@
+# capture/frame_buffer.py
+"""
+Buffer circular de dimensiune fixă pentru cadre și firul de captură care îl umple.
+Achiziția rulează separat de bucla Tk, iar analiza și afișarea iau mereu cel mai
+nou cadru disponibil, fără să aștepte după senzor.
+"""
+import threading
+import time
+
+# Politici la buffer plin
+DROP_OLDEST = "drop_oldest"   # suprascrie cel mai vechi cadru, păstrează cel nou
+DROP_NEWEST = "drop_newest"   # respinge cadrul nou, păstrează ce e deja în buffer
+POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+
+class FrameRingBuffer:
+    """
+    Buffer circular thread-safe cu număr fix de sloturi.
+    Contoare: `captured` (cadre primite), `dropped` (cadre pierdute fără a fi
+    consumate) și `consumed` (cadre livrate consumatorului).
+    """
+    def __init__(self, capacity: int = 4, policy: str = DROP_OLDEST):
+        if capacity < 1:
+            raise ValueError(f"Capacitate buffer invalidă: {capacity}")
+        if policy not in POLICIES:
+            raise ValueError(f"Politică buffer necunoscută: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self._slots = [None] * capacity
+        self._head = 0      # următorul slot în care scriem
+        self._count = 0     # câte cadre neconsumate sunt în buffer
+        self._cond = threading.Condition()
+
+        self.captured = 0
+        self.dropped = 0
+        self.consumed = 0
+
+    def __len__(self):
+        with self._cond:
+            return self._count
+
+    def put(self, frame) -> bool:
+        #Adaugă un cadru. Returnează False dacă politica a respins cadrul nou.
+        with self._cond:
+            self.captured += 1
+            if self._count == self.capacity:
+                self.dropped += 1
+                if self.policy == DROP_NEWEST:
+                    return False
+                # DROP_OLDEST: slotul de la head este chiar cel mai vechi cadru
+                self._count -= 1
+            self._slots[self._head] = frame
+            self._head = (self._head + 1) % self.capacity
+            self._count += 1
+            self._cond.notify_all()
+            return True
+
+    def _wait(self, timeout):
+        # Așteaptă un cadru cel mult `timeout` secunde (0 = deloc, None = oricât)
+        if self._count == 0 and timeout != 0:
+            self._cond.wait_for(lambda: self._count > 0, timeout)
+        return self._count > 0
+
+    def get_latest(self, timeout: float = 0.0):
+        """
+        Returnează cel mai nou cadru și golește buffer-ul.
+        Cadrele mai vechi, neconsumate, sunt numărate ca pierdute.
+        """
+        with self._cond:
+            if not self._wait(timeout):
+                return None
+            newest = (self._head - 1) % self.capacity
+            frame = self._slots[newest]
+            self.dropped += self._count - 1
+            self.consumed += 1
+            for i in range(self.capacity):
+                self._slots[i] = None
+            self._count = 0
+            return frame
+
+    def pop(self, timeout: float = 0.0):
+        #Returnează cel mai vechi cadru (FIFO), pentru consumatori care vor toate cadrele.
+        with self._cond:
+            if not self._wait(timeout):
+                return None
+            tail = (self._head - self._count) % self.capacity
+            frame = self._slots[tail]
+            self._slots[tail] = None
+            self._count -= 1
+            self.consumed += 1
+            return frame
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'captured': self.captured,
+                'dropped': self.dropped,
+                'consumed': self.consumed,
+                'pending': self._count,
+            }
+
+
+class CaptureThread:
+    """
+    Fir dedicat care citește continuu din sursa de cadre (`get_frame_record`)
+    și umple un FrameRingBuffer cu FrameRecord-uri. Bucla Tk doar consumă din buffer.
+    """
+    def __init__(self, source, buffer_size: int = 4, policy: str = DROP_OLDEST,
+                 idle_sleep_s: float = 0.01):
+        self.source = source
+        self.buffer = FrameRingBuffer(buffer_size, policy)
+        self.idle_sleep_s = idle_sleep_s
+        self.missed = 0     # apeluri get_frame_record() care nu au întors cadru
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            record = self.source.get_frame_record()
+            if record is None:
+                # cameră oprită temporar (reconfigurare, timeout) — nu ardem CPU
+                self.missed += 1
+                time.sleep(self.idle_sleep_s)
+                continue
+            self.buffer.put(record)
+
+    def get_latest(self, timeout: float = 0.0):
+        return self.buffer.get_latest(timeout)
+
+    def stats(self) -> dict:
+        stats = self.buffer.stats()
+        stats['missed'] = self.missed
+        return stats
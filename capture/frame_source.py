@@ -0,0 +1,166 @@
+# capture/frame_source.py
+"""
+Interfața comună pentru sursele de cadre (cameră FLIR, replay, generator sintetic).
+Restul aplicației folosește doar get_frame / get_frame_record / get_resolution /
+release și max_fps.
+"""
+import contextlib
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from capture.camera_settings import CameraSettings
+
+
+@dataclass
+class FrameRecord:
+    """
+    Un cadru împreună cu metadatele lui.
+    timestamp – momentul expunerii în secunde, pe ceasul sursei (ceasul camerei
+                pentru FLIR, timpul din înregistrare pentru replay); doar
+                diferențele dintre timestamp-uri au sens
+    host_time – time.monotonic() la primirea cadrului pe host
+    """
+    image: Any
+    frame_id: int
+    timestamp: float
+    host_time: float
+
+
+class FrameStats:
+    #Contorizează cadrele primite și cadrele pierdute (goluri în frame ID).
+    def __init__(self):
+        self.received = 0
+        self.dropped = 0
+        self.incomplete = 0
+        self.restarts = 0        # ID-ul a luat-o de la capăt (ex. după reconfigurare)
+        self.last_frame_id = None
+        self.last_host_time = None
+
+    def update(self, frame_id, host_time):
+        if self.last_frame_id is not None:
+            gap = frame_id - self.last_frame_id - 1
+            if gap > 0:
+                self.dropped += gap
+            elif gap < 0:
+                self.restarts += 1
+        self.last_frame_id = frame_id
+        self.last_host_time = host_time
+        self.received += 1
+
+    @property
+    def drop_rate(self) -> float:
+        total = self.received + self.dropped + self.incomplete
+        return (self.dropped + self.incomplete) / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            'received': self.received,
+            'dropped': self.dropped,
+            'incomplete': self.incomplete,
+            'restarts': self.restarts,
+            'drop_rate': self.drop_rate,
+        }
+
+
+class FrameSource:
+    # FPS nominal al sursei (folosit de GUI și de detectorul de microsomn)
+    max_fps = 30.0
+    # Sursa știe să se redeschidă singură după o pierdere de conexiune (vezi CameraWatchdog)
+    can_reconnect = False
+
+    def __init__(self):
+        self.stats = FrameStats()
+        self._next_id = 0
+
+    def get_frame(self):
+        #Returnează următorul cadru (ndarray) sau None dacă nu e disponibil.
+        raise NotImplementedError
+
+    def get_frame_record(self):
+        """
+        Returnează următorul cadru ca FrameRecord (sau None).
+        Implicit numerotează cadrele și le datează cu ceasul host-ului;
+        sursele care au metadate proprii suprascriu metoda.
+        """
+        image = self.get_frame()
+        if image is None:
+            return None
+        now = time.monotonic()
+        self._next_id += 1
+        self.stats.update(self._next_id, now)
+        return FrameRecord(image, self._next_id, now, now)
+
+    def get_resolution(self):
+        #Returnează (width, height) pentru cadrele produse.
+        raise NotImplementedError
+
+    def release(self):
+        #Eliberează resursele sursei.
+        pass
+
+    def reconnect(self):
+        #Redeschide sursa și restaurează setările; ridică excepție la eșec.
+        raise NotImplementedError(f"{type(self).__name__} nu suportă reconectarea")
+
+    # ─── Reconfigurare tranzacțională ─────────────────────────────────────────
+    def apply(self, settings):
+        #Aplică un CameraSettings; returnează durata întreruperii stream-ului (s).
+        self._unsupported("reconfigurarea")
+        return 0.0
+
+    @contextlib.contextmanager
+    def configure(self):
+        """
+        Grupează mai multe setări într-o singură aplicare:
+            with camera.configure() as s:
+                s.width, s.height, s.fps = 800, 600, 30
+        """
+        settings = CameraSettings()
+        yield settings
+        self.apply(settings)
+
+    # ─── Setări de cameră: sursele care nu le suportă le ignoră ───────────────
+    def _unsupported(self, name):
+        print(f"⚠️ {type(self).__name__} nu suportă {name} — ignorat.")
+
+    def set_gain_manual(self, value):
+        self._unsupported("gain manual")
+
+    def set_exposure_manual(self, value):
+        self._unsupported("expunere manuală")
+
+    def set_frame_rate(self, fps):
+        self._unsupported("setarea FPS")
+
+    def set_auto_gain(self, mode, manual_value=None):
+        self._unsupported("gain automat")
+
+    def set_auto_exposure(self, mode, manual_value=None):
+        self._unsupported("expunere automată")
+
+    def set_auto_white_balance(self, mode, wb_value=None):
+        self._unsupported("balans de alb")
+
+    def set_pixel_format(self, format_name):
+        self._unsupported("formatul de pixel")
+
+    def set_resolution(self, width, height):
+        self._unsupported("setarea rezoluției")
+
+    def set_offset(self, x_offset, y_offset):
+        self._unsupported("offset ROI")
+
+    def center_roi(self):
+        self._unsupported("centrarea ROI")
+
+    def set_acquisition_profile(self, name):
+        self._unsupported("profilurile de achiziție")
+        return None
+
+    def get_roi(self):
+        return (0, 0) + tuple(self.get_resolution())
+
+    def set_roi(self, x, y, width, height, fps=None):
+        self._unsupported("ROI hardware")
+        return None
@@ -0,0 +1,188 @@
+# capture/replay_source.py
+"""
+Surse de cadre fără cameră fizică: redare din fișier video / secvență de imagini
+și generator sintetic pentru teste de anduranță.
+"""
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+from capture.frame_source import FrameSource, FrameRecord
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".pgm")
+
+
+class _Pacer:
+    # Menține ritmul de redare la `fps` când modul realtime este activ
+    def __init__(self, fps, realtime):
+        self.period = 1.0 / fps if fps else 0.0
+        self.realtime = realtime
+        self.next_t = None
+
+    def wait(self):
+        if not self.realtime or self.period <= 0:
+            return
+        now = time.perf_counter()
+        if self.next_t is None:
+            self.next_t = now
+        elif self.next_t > now:
+            time.sleep(self.next_t - now)
+        # dacă am rămas în urmă nu încercăm să recuperăm
+        self.next_t = max(self.next_t, now) + self.period
+
+    def reset(self):
+        self.next_t = None
+
+
+def _media_record(source, image):
+    # Timestamp = poziția în înregistrare, ca duratele să fie corecte la orice viteză de redare
+    if image is None:
+        return None
+    frame_id = source.frames_read
+    host_time = time.monotonic()
+    source.stats.update(frame_id, host_time)
+    return FrameRecord(image, frame_id, (frame_id - 1) / source.max_fps, host_time)
+
+
+class ReplaySource(FrameSource):
+    """
+    Redă un fișier video, un director de imagini sau un glob (ex. "clip/*.png").
+    realtime=False rulează cât de repede permite pipeline-ul (benchmark),
+    realtime=True respectă FPS-ul înregistrării.
+    """
+    def __init__(self, path, realtime=False, fps=None, loop=False, grayscale=False):
+        super().__init__()
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.grayscale = grayscale
+        self.frames_read = 0
+        self.finished = False
+        self._cap = None
+        self._files = None
+        self._index = 0
+
+        if os.path.isdir(path):
+            self._files = sorted(
+                f for f in glob.glob(os.path.join(path, "*"))
+                if f.lower().endswith(IMAGE_EXTENSIONS)
+            )
+        elif any(ch in path for ch in "*?["):
+            self._files = sorted(glob.glob(path))
+
+        if self._files is not None:
+            if not self._files:
+                raise RuntimeError(f"Nicio imagine găsită în: {path}")
+            first = self._read_image(self._files[0])
+            self._height, self._width = first.shape[:2]
+            self.max_fps = float(fps or 30.0)
+        else:
+            self._cap = cv2.VideoCapture(path)
+            if not self._cap.isOpened():
+                raise RuntimeError(f"Nu pot deschide fișierul video: {path}")
+            self._width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            self._height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            self.max_fps = float(fps or self._cap.get(cv2.CAP_PROP_FPS) or 30.0)
+
+        self._pacer = _Pacer(self.max_fps, realtime)
+
+    def _read_image(self, file_path):
+        flag = cv2.IMREAD_GRAYSCALE if self.grayscale else cv2.IMREAD_COLOR
+        img = cv2.imread(file_path, flag)
+        if img is None:
+            raise RuntimeError(f"Nu pot citi imaginea: {file_path}")
+        return img
+
+    def _rewind(self):
+        self._index = 0
+        if self._cap is not None:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self._pacer.reset()
+
+    def _next(self):
+        if self._files is not None:
+            if self._index >= len(self._files):
+                return None
+            frame = self._read_image(self._files[self._index])
+            self._index += 1
+            return frame
+        ok, frame = self._cap.read()
+        if not ok:
+            return None
+        if self.grayscale and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return frame
+
+    def get_frame(self):
+        if self.finished:
+            return None
+        frame = self._next()
+        if frame is None and self.loop:
+            self._rewind()
+            frame = self._next()
+        if frame is None:
+            self.finished = True
+            return None
+        self._pacer.wait()
+        self.frames_read += 1
+        return frame
+
+    def get_frame_record(self):
+        return _media_record(self, self.get_frame())
+
+    def get_resolution(self):
+        return self._width, self._height
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generator de cadre care nu are nevoie de fișiere: un model care se
+    deplasează plus zgomot. n_frames=None înseamnă flux infinit.
+    """
+    def __init__(self, width=640, height=480, fps=30.0, n_frames=None,
+                 realtime=False, grayscale=False, seed=0):
+        super().__init__()
+        self._width = width
+        self._height = height
+        self.max_fps = float(fps)
+        self.n_frames = n_frames
+        self.grayscale = grayscale
+        self.frames_read = 0
+        self.finished = False
+        self._rng = np.random.default_rng(seed)
+        self._pacer = _Pacer(self.max_fps, realtime)
+
+        # Modelul de bază se calculează o singură dată; per cadru doar îl deplasăm
+        yy, xx = np.mgrid[0:height, 0:width]
+        base = ((xx + yy) % 256).astype(np.uint8)
+        cv2.ellipse(base, (width // 2, height // 2), (width // 6, height // 4),
+                    0, 0, 360, 200, -1)
+        self._base = base
+
+    def get_frame(self):
+        if self.n_frames is not None and self.frames_read >= self.n_frames:
+            self.finished = True
+            return None
+        shift = (self.frames_read * 3) % self._width
+        frame = np.roll(self._base, shift, axis=1)
+        noise = self._rng.integers(0, 16, size=frame.shape, dtype=np.uint8)
+        frame = cv2.add(frame, noise)
+        if not self.grayscale:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        self._pacer.wait()
+        self.frames_read += 1
+        return frame
+
+    def get_frame_record(self):
+        return _media_record(self, self.get_frame())
+
+    def get_resolution(self):
+        return self._width, self._height
@@ -0,0 +1,125 @@
+# capture/roi_tracker.py
+"""
+Urmărire automată a feței cu ROI-ul hardware al camerei.
+Din bounding box-ul landmark-urilor se calculează un ROI cu margine, care se
+reprogramează pe senzor doar când fața se apropie de marginea ROI-ului curent
+sau când ROI-ul e mult prea mare (histerezis). La pierderea feței revine la
+cadrul complet.
+"""
+
+
+def face_bbox(landmarks):
+    #Bounding box normalizat (x0, y0, x1, y1) al landmark-urilor.
+    xs = [lm.x for lm in landmarks]
+    ys = [lm.y for lm in landmarks]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class FaceRoiTracker:
+    def __init__(self, camera, padding=0.6, min_size=(320, 320), edge_margin=0.1,
+                 shrink_ratio=1.6, lost_frames=10, cooldown_frames=15, target_fps=None):
+        """
+        padding        – margine adăugată în jurul feței, ca fracție din latura ei mare
+        edge_margin    – fracția din ROI în care fața declanșează mutarea ROI-ului
+        shrink_ratio   – ROI-ul se micșorează doar dacă aria lui depășește ținta de atâtea ori
+        lost_frames    – după câte cadre fără față revenim la cadrul complet
+        cooldown_frames – cadre minime între două reprogramări ale senzorului
+        target_fps     – dacă e setat, FPS-ul cerut după fiecare schimbare de ROI
+        """
+        self.camera = camera
+        self.padding = padding
+        self.min_size = min_size
+        self.edge_margin = edge_margin
+        self.shrink_ratio = shrink_ratio
+        self.lost_frames = lost_frames
+        self.cooldown_frames = cooldown_frames
+        self.target_fps = target_fps
+
+        self.roi = tuple(camera.get_roi())
+        self.lost = 0
+        self.reprograms = 0
+        self._frames_since_change = cooldown_frames
+
+    @property
+    def full_frame(self):
+        sensor_w, sensor_h = self.camera.sensor_size
+        return (0, 0, sensor_w, sensor_h)
+
+    def _align(self, value, inc):
+        inc = max(1, int(inc or 1))
+        return int(value) - int(value) % inc
+
+    def _target_roi(self, fx0, fy0, fx1, fy1):
+        # ROI cu margine în jurul feței, aliniat la incrementele camerei
+        sensor_w, sensor_h = self.camera.sensor_size
+        bw, bh = fx1 - fx0, fy1 - fy0
+        pad = self.padding * max(bw, bh)
+        w = min(sensor_w, max(bw + 2 * pad, self.min_size[0]))
+        h = min(sensor_h, max(bh + 2 * pad, self.min_size[1]))
+        w = self._align(w, getattr(self.camera, 'width_inc', 1))
+        h = self._align(h, getattr(self.camera, 'height_inc', 1))
+        cx, cy = (fx0 + fx1) / 2.0, (fy0 + fy1) / 2.0
+        x = max(0, min(cx - w / 2.0, sensor_w - w))
+        y = max(0, min(cy - h / 2.0, sensor_h - h))
+        x = self._align(x, getattr(self.camera, 'offset_x_inc', 1))
+        y = self._align(y, getattr(self.camera, 'offset_y_inc', 1))
+        return (x, y, w, h)
+
+    def _face_near_edge(self, fx0, fy0, fx1, fy1):
+        # Fața e prea aproape de o margine a ROI-ului care se mai poate muta
+        rx, ry, rw, rh = self.roi
+        sensor_w, sensor_h = self.camera.sensor_size
+        mx, my = self.edge_margin * rw, self.edge_margin * rh
+        left = fx0 < rx + mx and rx > 0
+        right = fx1 > rx + rw - mx and rx + rw < sensor_w
+        top = fy0 < ry + my and ry > 0
+        bottom = fy1 > ry + rh - my and ry + rh < sensor_h
+        return left or right or top or bottom
+
+    def _apply(self, roi):
+        if tuple(roi) == self.roi:
+            return False
+        applied = self.camera.set_roi(*roi, fps=self.target_fps)
+        if applied is None:
+            return False
+        self.roi = tuple(applied)
+        self.reprograms += 1
+        self._frames_since_change = 0
+        return True
+
+    def reset_full_frame(self):
+        self.lost = 0
+        return self._apply(self.full_frame)
+
+    def update(self, landmarks, frame_size=None):
+        """
+        Actualizează ROI-ul pe baza landmark-urilor din cadrul curent
+        (coordonate normalizate relativ la ROI). Returnează True dacă senzorul
+        a fost reprogramat.
+        """
+        self._frames_since_change += 1
+        rx, ry, rw, rh = self.roi
+        if frame_size is not None and tuple(frame_size) != (rw, rh):
+            # cadru capturat cu alt ROI (din buffer sau setat manual) — resincronizăm
+            self.roi = tuple(self.camera.get_roi())
+            return False
+
+        if landmarks is None:
+            self.lost += 1
+            if self.lost >= self.lost_frames and self.roi != self.full_frame:
+                return self.reset_full_frame()
+            return False
+        self.lost = 0
+
+        if self._frames_since_change < self.cooldown_frames:
+            return False
+
+        nx0, ny0, nx1, ny1 = face_bbox(landmarks)
+        fx0, fy0 = rx + nx0 * rw, ry + ny0 * rh
+        fx1, fy1 = rx + nx1 * rw, ry + ny1 * rh
+
+        target = self._target_roi(fx0, fy0, fx1, fy1)
+        too_big = rw * rh > self.shrink_ratio * target[2] * target[3]
+        if not too_big and not self._face_near_edge(fx0, fy0, fx1, fy1):
+            return False
+        return self._apply(target)
@@ -0,0 +1,146 @@
+# capture/watchdog.py
+"""
+Watchdog pentru sursa de cadre. Rulează pe un fir separat, urmărește vârsta
+ultimului cadru și rata de cadre incomplete, iar la blocarea stream-ului
+reconectează camera cu backoff exponențial, fără să blocheze GUI-ul.
+Firul de captură continuă să citească din sursă, deci analiza se reia singură
+după reconectare.
+"""
+import threading
+import time
+
+# Stările conexiunii
+CONNECTED = "connected"
+STALLED = "stalled"            # problemă detectată, urmează reconectarea
+RECONNECTING = "reconnecting"  # reconectare în curs (cu reîncercări)
+
+
+class CameraWatchdog:
+    def __init__(self, camera, stall_timeout_s=2.0, max_incomplete_rate=0.5, min_samples=10,
+                 check_interval_s=0.5, backoff_initial_s=0.5, backoff_max_s=30.0):
+        """
+        stall_timeout_s     – după câte secunde fără cadru considerăm stream-ul blocat
+        max_incomplete_rate – fracția maximă de cadre incomplete între două verificări
+        min_samples         – câte cadre trebuie să existe între verificări ca rata să conteze
+        backoff_*           – pauza inițială / maximă între încercările de reconectare
+        """
+        if not getattr(camera, 'can_reconnect', False):
+            raise ValueError(f"{type(camera).__name__} nu suportă reconectarea")
+        self.camera = camera
+        self.stall_timeout_s = stall_timeout_s
+        self.max_incomplete_rate = max_incomplete_rate
+        self.min_samples = min_samples
+        self.check_interval_s = check_interval_s
+        self.backoff_initial_s = backoff_initial_s
+        self.backoff_max_s = backoff_max_s
+
+        self.state = CONNECTED
+        self.incidents = []     # un dict per incident: motiv, încercări, downtime
+        self._listeners = []
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._reset_reference()
+
+    # ─── Pornire / oprire ─────────────────────────────────────────────────────
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._reset_reference()
+        self._thread = threading.Thread(target=self._run, name="camera-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def add_listener(self, callback):
+        """
+        callback(state, incident) e apelat pe firul watchdog-ului la fiecare
+        schimbare de stare; incident e None, cu excepția revenirii la CONNECTED.
+        """
+        self._listeners.append(callback)
+
+    @property
+    def total_downtime_s(self) -> float:
+        return sum(i['downtime_s'] for i in self.incidents)
+
+    # ─── Detecție ─────────────────────────────────────────────────────────────
+    def _reset_reference(self):
+        # Punct de plecare pentru vârsta cadrului și pentru rata de incomplete
+        stats = self.camera.stats
+        self._since = time.monotonic()
+        self._received = stats.received
+        self._incomplete = stats.incomplete
+
+    def check(self, now=None):
+        #Returnează motivul blocării stream-ului sau None dacă totul e în regulă.
+        now = time.monotonic() if now is None else now
+        stats = self.camera.stats
+        last = max(stats.last_host_time or 0.0, self._since)
+        age = now - last
+
+        received = stats.received - self._received
+        incomplete = stats.incomplete - self._incomplete
+        self._received, self._incomplete = stats.received, stats.incomplete
+
+        if age > self.stall_timeout_s:
+            return f"niciun cadru de {age:.1f} s"
+        total = received + incomplete
+        if total >= self.min_samples and incomplete / total > self.max_incomplete_rate:
+            return f"{incomplete}/{total} cadre incomplete"
+        return None
+
+    def _set_state(self, state, incident=None):
+        if state == self.state:
+            return
+        self.state = state
+        for callback in self._listeners:
+            try:
+                callback(state, incident)
+            except Exception as e:
+                print(f"⚠️ Eroare în listener-ul watchdog: {e}")
+
+    # ─── Reconectare ──────────────────────────────────────────────────────────
+    def _run(self):
+        while not self._stop_event.wait(self.check_interval_s):
+            reason = self.check()
+            if reason is not None:
+                self._recover(reason)
+
+    def _recover(self, reason):
+        # Downtime-ul se măsoară de la ultimul cadru bun până la reconectare
+        started = max(self.camera.stats.last_host_time or 0.0, self._since)
+        print(f"⚠️ Stream blocat ({reason}) — reconectez camera")
+        self._set_state(STALLED)
+        self._set_state(RECONNECTING)
+
+        delay = self.backoff_initial_s
+        attempts = 0
+        reconnected = False
+        while not self._stop_event.is_set():
+            attempts += 1
+            try:
+                self.camera.reconnect()
+                reconnected = True
+                break
+            except Exception as e:
+                print(f"‼️ Reconectare eșuată (încercarea {attempts}): {e} — reîncerc în {delay:.1f} s")
+                if self._stop_event.wait(delay):
+                    return
+                delay = min(delay * 2, self.backoff_max_s)
+        if not reconnected:
+            return      # oprit înainte de prima încercare: nicio reconectare de raportat
+
+        incident = {
+            'reason': reason,
+            'attempts': attempts,
+            'started': started,
+            'downtime_s': time.monotonic() - started,
+        }
+        self.incidents.append(incident)
+        print(f"✅ Cameră reconectată după {incident['downtime_s']:.1f} s ({attempts} încercări)")
+        self._reset_reference()
+        self._set_state(CONNECTED, incident)
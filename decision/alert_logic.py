@@ -22,10 +22,12 @@ class AlertLogic:
         self.sleep_eye_frames = 0
         self.yawn_frames = 0
         self.pitch_frames = 0
-        self.last_alert_time = 0
+        self.last_alert_time = None
         self.pitch_high_since = None 
+        self.last_time = None       # ultimul moment evaluat (detectează ceasul care o ia de la capăt)
 
-    def evaluate(self, ear, mar, pitch, distract_detected):
+    def evaluate(self, ear, mar, pitch, distract_detected, timestamp=None):
+        # timestamp = momentul cadrului (s); implicit ceasul host-ului la evaluare
         ear_thr_yaml = self.ear_threshold
         ear_thr_calib = None
         if self.calibrator and getattr(self.calibrator, "ear_threshold", None) is not None:
@@ -55,10 +57,16 @@ class AlertLogic:
             f"[DEBUG USED] ear_thr={ear_thr:.3f}, mar_thr={mar_thr:.3f}, pitch_thr={pitch_thr:.1f}"
         )
         events = []
-        current_time = time.time()
+        current_time = timestamp if timestamp is not None else time.time()
+        if self.last_time is not None and current_time < self.last_time:
+            # ceasul cadrelor a luat-o de la capăt (ex. reconectarea camerei): cooldown-ul
+            # și durata capului plecat nu se mai pot măsura față de vechiul ceas
+            self.last_alert_time = None
+            self.pitch_high_since = None
+        self.last_time = current_time
 
         # Respectăm cooldown-ul dintre alerte
-        if current_time - self.last_alert_time < self.alert_cooldown:
+        if self.last_alert_time is not None and current_time - self.last_alert_time < self.alert_cooldown:
             return events  # Încă în cooldown, nu generăm evenimente noi
 
         # — OCHI ÎNCHIȘI (folosim prag dinamic dacă există)
@@ -88,8 +96,8 @@ class AlertLogic:
         # CAP ÎNCLINAT (plecat)
         if pitch > self.pitch_threshold:
             if self.pitch_high_since is None:
-                self.pitch_high_since = time.time()
-            elif time.time() - self.pitch_high_since > 2.0:
+                self.pitch_high_since = current_time
+            elif current_time - self.pitch_high_since > 2.0:
                 events.append("cap_plecat")
         else:
             self.pitch_high_since = None
@@ -0,0 +1,113 @@
+# feature_extraction/backends.py
+"""
+Backend-uri de landmark-uri interschimbabile. Toate au aceeași interfață
+(find_landmarks(frame) → LandmarkArray sau None, reset_tracking(), close()),
+iar LandmarkArray-ul returnat poartă LandmarkIndex-ul backend-ului, deci
+EAR / MAR / pitch se calculează identic indiferent de model:
+
+    mediapipe       – FaceMesh cu iris (478 puncte), implicit
+    mediapipe_lite  – FaceMesh fără rafinarea ochi/buze (468 puncte), mai rapid
+    dlib            – detector HOG + predictor cu 68 de puncte (necesită dlib și modelul .dat)
+"""
+import inspect
+import os
+
+import cv2
+import numpy as np
+
+from feature_extraction.face_mesh import FaceMeshDetector
+from feature_extraction.landmarks import DLIB68_INDEX, LandmarkArray
+
+DEFAULT_DLIB_MODEL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'models', 'shape_predictor_68_face_landmarks.dat')
+
+
+class DlibDetector:
+    name = 'dlib'
+    index = DLIB68_INDEX
+
+    def __init__(self, dlib_model=DEFAULT_DLIB_MODEL, upsample=0, inference_width=None):
+        """
+        dlib_model      – calea către shape_predictor_68_face_landmarks.dat
+        upsample        – de câte ori mărește detectorul HOG imaginea (fețe mici)
+        inference_width – lățimea (px) la care se micșorează imaginea; None = originală
+        """
+        try:
+            import dlib
+        except ImportError as e:
+            raise RuntimeError("Backend-ul 'dlib' cere pachetul dlib (pip install dlib)") from e
+        if not os.path.exists(dlib_model):
+            raise RuntimeError(f"Modelul dlib nu există: {dlib_model}")
+        self.detector = dlib.get_frontal_face_detector()
+        self.predictor = dlib.shape_predictor(dlib_model)
+        self.upsample = upsample
+        self.inference_width = inference_width
+        self._gray_buf = None
+
+    def _prepare(self, frame):
+        # Mono8 la lățimea de inferență; dlib lucrează bine direct pe nivele de gri
+        h, w = frame.shape[:2]
+        if frame.ndim == 3:
+            if self._gray_buf is None or self._gray_buf.shape != (h, w):
+                self._gray_buf = np.empty((h, w), dtype=np.uint8)
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+        if self.inference_width and w > self.inference_width:
+            tw = int(self.inference_width)
+            frame = cv2.resize(frame, (tw, max(1, int(round(h * tw / w)))), interpolation=cv2.INTER_AREA)
+        return frame
+
+    def find_landmarks(self, frame):
+        #Cele 68 de puncte ale celei mai mari fețe ca LandmarkArray (z = 0) sau None.
+        img = self._prepare(frame)
+        faces = self.detector(img, self.upsample)
+        if len(faces) == 0:
+            return None
+        face = max(faces, key=lambda r: r.width() * r.height())
+        shape = self.predictor(img, face)
+        h, w = img.shape[:2]
+        arr = np.zeros((shape.num_parts, 3), dtype=np.float32)
+        for i in range(shape.num_parts):
+            p = shape.part(i)
+            arr[i, 0] = p.x / w
+            arr[i, 1] = p.y / h
+        return LandmarkArray(arr, DLIB68_INDEX)
+
+    def reset_tracking(self):
+        # Fără stare între cadre
+        pass
+
+    def close(self):
+        pass
+
+
+# nume → (clasă, parametri fixați de variantă)
+BACKENDS = {
+    'mediapipe': (FaceMeshDetector, {'refine_landmarks': True}),
+    'mediapipe_lite': (FaceMeshDetector, {'refine_landmarks': False}),
+    'dlib': (DlibDetector, {}),
+}
+
+
+def backend_class(backend='mediapipe'):
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de landmark-uri necunoscut: {backend} (disponibile: {', '.join(BACKENDS)})")
+    return BACKENDS[backend][0]
+
+
+def create_backend(backend='mediapipe', **kwargs):
+    """
+    Creează detectorul de landmark-uri `backend` din secțiunea face_mesh a
+    configurației. Parametrii pe care backend-ul nu îi are (ex. tracking pentru
+    dlib) sunt ignorați, cu avertisment dacă au fost setați.
+    """
+    cls = backend_class(backend)
+    accepted = inspect.signature(cls.__init__).parameters
+    # None = valoarea implicită a backend-ului (ex. dlib_model: null în settings.yaml)
+    params = {k: v for k, v in kwargs.items() if k in accepted and v is not None}
+    ignored = [k for k, v in kwargs.items() if k not in accepted and v]
+    if ignored:
+        print(f"⚠️ Backend-ul {backend} ignoră parametrii: {', '.join(ignored)}")
+    params.update(BACKENDS[backend][1])
+    detector = cls(**params)
+    detector.name = backend
+    return detector
@@ -0,0 +1,191 @@
+# feature_extraction/blink.py
+"""
+Segmentarea clipirilor din fluxul EAR per cadru, în timp real. O clipire începe
+când EAR coboară sub nivelul „deschis” (prag + histerezis), trebuie să treacă
+sub pragul de ochi închiși și se încheie când EAR revine peste nivelul deschis.
+Pentru fiecare clipire se raportează durata, fazele de închidere / redeschidere
+și vitezele lor (unități EAR / s).
+
+Statisticile pe fereastră (frecvență pe minut, durată medie și percentile,
+viteze medii) folosesc memorie fixă: o coadă limitată de evenimente, sume
+curente și o histogramă a duratelor cu bin-uri fixe — O(1) per cadru.
+"""
+import collections
+from dataclasses import dataclass
+
+import numpy as np
+
+# Histograma duratelor: bin-uri de 10 ms până la DURATION_MAX_S
+DURATION_BIN_S = 0.01
+DURATION_MAX_S = 2.0
+
+BlinkStats = collections.namedtuple(
+    'BlinkStats', 'count rate_per_min mean_duration_s p50_duration_s p90_duration_s '
+                  'mean_closing_speed mean_reopening_speed')
+
+
+@dataclass
+class BlinkEvent:
+    start: float            # EAR coboară sub nivelul deschis (s, ceasul cadrelor)
+    end: float              # EAR revine peste nivelul deschis
+    duration: float
+    closing_s: float        # de la start la minimul EAR
+    reopening_s: float      # de la minimul EAR la end
+    min_ear: float
+    amplitude: float        # EAR deschis înainte de clipire − minimul EAR
+    closing_speed: float    # amplitude / closing_s
+    reopening_speed: float  # amplitude / reopening_s
+
+
+class BlinkDetector:
+    def __init__(self, window_s=60.0, hysteresis=0.03, max_duration_s=0.8, max_events=512):
+        """
+        window_s       – fereastra statisticilor (frecvență, durate)
+        hysteresis     – nivelul deschis = prag EAR + hysteresis
+        max_duration_s – închiderile mai lungi nu sunt clipiri (vezi MicroSleepDetector)
+        max_events     – limita cozii de clipiri din fereastră (memorie fixă)
+        """
+        self.window_s = window_s
+        self.hysteresis = hysteresis
+        self.max_duration_s = max_duration_s
+        self.count = 0
+        self.last_event = None
+        # (end, bin durată, durată, viteză închidere, viteză redeschidere) per clipire din fereastră
+        self._events = collections.deque(maxlen=max_events)
+        self._hist = np.zeros(int(round(DURATION_MAX_S / DURATION_BIN_S)), dtype=np.int64)
+        self._sum_dur = self._sum_close = self._sum_open = 0.0
+        self._t_first = None
+        self._last_t = None
+        self.reset()
+
+    def reset(self):
+        #Uită clipirea în curs (ex. față pierdută); statisticile rămân.
+        self._in_blink = False
+        self._crossed = False       # a trecut sub pragul de ochi închiși
+        self._too_long = False      # închidere mai lungă decât max_duration_s
+        self._start = None
+        self._min_ear = None
+        self._min_t = None
+        self._open_ear = None       # ultimul EAR peste nivelul deschis
+
+    def clear(self):
+        #Sesiune nouă: uită și clipirea în curs, și statisticile.
+        self.count = 0
+        self.last_event = None
+        self._restart_window()
+        self.reset()
+
+    def _restart_window(self):
+        # Golește fereastra statisticilor; totalul `count` rămâne
+        self._events.clear()
+        self._hist[:] = 0
+        self._sum_dur = self._sum_close = self._sum_open = 0.0
+        self._t_first = self._last_t = None
+
+    def update(self, ear, ear_threshold, timestamp):
+        #Eșantion EAR; returnează BlinkEvent când o clipire tocmai s-a încheiat, altfel None.
+        t = float(timestamp)
+        if self._last_t is not None and t < self._last_t:
+            # ceasul cadrelor a luat-o de la capăt (ex. reconectare): clipirile vechi
+            # n-ar mai ieși din fereastră, iar clipirea în curs are startul pe vechiul ceas
+            self._restart_window()
+            self.reset()
+        if self._t_first is None:
+            self._t_first = t
+        self._last_t = t
+        self._evict(t)
+        open_level = ear_threshold + self.hysteresis
+
+        if not self._in_blink:
+            if ear >= open_level:
+                self._open_ear = ear
+                return None
+            self._in_blink = True
+            self._crossed = self._too_long = False
+            self._start = t
+            self._min_ear, self._min_t = ear, t
+        if ear < self._min_ear:
+            self._min_ear, self._min_t = ear, t
+        if ear < ear_threshold:
+            self._crossed = True
+        if t - self._start > self.max_duration_s:
+            # închidere prea lungă pentru o clipire: o ignorăm până la redeschidere
+            self._too_long = True
+        if ear < open_level:
+            return None
+
+        # EAR a revenit peste nivelul deschis: clipire încheiată (dacă a fost una reală)
+        event = None
+        if self._crossed and not self._too_long and self._open_ear is not None:
+            event = self._make_event(t)
+            self._record(event)
+        self._in_blink = False
+        self._open_ear = ear
+        return event
+
+    def update_no_face(self):
+        # Fără față nu putem urmări clipirea în curs
+        self.reset()
+
+    def _make_event(self, end):
+        amplitude = max(self._open_ear - self._min_ear, 0.0)
+        closing = self._min_t - self._start
+        reopening = end - self._min_t
+        return BlinkEvent(
+            start=self._start, end=end, duration=end - self._start,
+            closing_s=closing, reopening_s=reopening,
+            min_ear=self._min_ear, amplitude=amplitude,
+            closing_speed=amplitude / closing if closing > 0 else 0.0,
+            reopening_speed=amplitude / reopening if reopening > 0 else 0.0,
+        )
+
+    def _record(self, event):
+        if len(self._events) == self._events.maxlen:
+            self._drop(self._events[0])
+        b = min(int(event.duration / DURATION_BIN_S), len(self._hist) - 1)
+        self._events.append((event.end, b, event.duration, event.closing_speed, event.reopening_speed))
+        self._hist[b] += 1
+        self._sum_dur += event.duration
+        self._sum_close += event.closing_speed
+        self._sum_open += event.reopening_speed
+        self.count += 1
+        self.last_event = event
+
+    def _drop(self, item):
+        _, b, dur, close, reopen = item
+        self._hist[b] -= 1
+        self._sum_dur -= dur
+        self._sum_close -= close
+        self._sum_open -= reopen
+
+    def _evict(self, t):
+        while self._events and self._events[0][0] < t - self.window_s:
+            self._drop(self._events.popleft())
+
+    def _duration_quantile(self, q):
+        n = len(self._events)
+        cum = np.cumsum(self._hist)
+        i = int(np.searchsorted(cum, q * n))
+        return (min(i, len(self._hist) - 1) + 0.5) * DURATION_BIN_S
+
+    def stats(self, now=None) -> BlinkStats:
+        """
+        Statisticile clipirilor din ultimele window_s secunde. Frecvența se raportează
+        la timpul acoperit (sub window_s la începutul sesiunii).
+        """
+        now = self._last_t if now is None else float(now)
+        if now is not None:
+            self._evict(now)
+        n = len(self._events)
+        if n == 0:
+            return BlinkStats(self.count, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        span = min(self.window_s, max(now - self._t_first, 1.0))
+        return BlinkStats(
+            count=self.count,
+            rate_per_min=n * 60.0 / span,
+            mean_duration_s=self._sum_dur / n,
+            p50_duration_s=self._duration_quantile(0.5),
+            p90_duration_s=self._duration_quantile(0.9),
+            mean_closing_speed=self._sum_close / n,
+            mean_reopening_speed=self._sum_open / n,
+        )
@@ -1,8 +1,11 @@
-import time
-import threading
 import numpy as np
 
+from feature_extraction.phase_collector import PhaseCollector
+
 class Calibrator:
+    # faza de calibrare → metrica colectată
+    PHASES = {'ear_open': 'ear', 'ear_closed': 'ear', 'mar_closed': 'mar', 'mar_open': 'mar'}
+
     def __init__(self):
         self.ear_open = []
         self.ear_closed = []
@@ -15,76 +18,33 @@ class Calibrator:
         self.mar_threshold = None
         self.pitch_threshold = None
         self._collecting = False
-        self._step = 0 
+        self._collector = None
         self._on_done = None
 
-    def start_ear_open_calibration(self, duration_s, get_metrics_callback, on_done=None):
-        self.ear_open.clear()
+    def start_phase(self, phase, duration_s, on_done=None):
+        """
+        Pornește o fază (ear_open / ear_closed / mar_closed / mar_open); eșantioanele
+        vin din on_frame(), câte unul per cadru cu față, timp de duration_s secunde.
+        """
+        metric = self.PHASES[phase]
+        getattr(self, phase).clear()
         self._collecting = True
-        self._step = 1
         self._on_done = on_done
-        def _collect():
-            start = time.time()
-            while time.time() - start < duration_s:
-                ear, _ = get_metrics_callback()
-                if ear is not None:
-                    self.ear_open.append(ear)
-                time.sleep(0.05)
-            self._collecting = False
-            if self._on_done:
-                self._on_done()
-        threading.Thread(target=_collect, daemon=True).start()
 
-    def start_ear_closed_calibration(self, duration_s, get_metrics_callback, on_done=None):
-        self.ear_closed.clear()
-        self._collecting = True
-        self._step = 2
-        self._on_done = on_done
-        def _collect():
-            start = time.time()
-            while time.time() - start < duration_s:
-                ear, _ = get_metrics_callback()
-                if ear is not None:
-                    self.ear_closed.append(ear)
-                time.sleep(0.05)
+        def finished(collector):
+            getattr(self, phase).extend(collector.values)
             self._collecting = False
+            self._collector = None
             if self._on_done:
                 self._on_done()
-        threading.Thread(target=_collect, daemon=True).start()
 
-    def start_mar_closed_calibration(self, duration_s, get_metrics_callback, on_done=None):
-        self.mar_closed.clear()
-        self._collecting = True
-        self._step = 3
-        self._on_done = on_done
-        def _collect():
-            start = time.time()
-            while time.time() - start < duration_s:
-                _, mar = get_metrics_callback()
-                if mar is not None:
-                    self.mar_closed.append(mar)
-                time.sleep(0.05)
-            self._collecting = False
-            if self._on_done:
-                self._on_done()
-        threading.Thread(target=_collect, daemon=True).start()
+        self._collector = PhaseCollector(
+            duration_s, lambda ctx: getattr(ctx, metric) if ctx.face else None, on_done=finished)
 
-    def start_mar_open_calibration(self, duration_s, get_metrics_callback, on_done=None):
-        self.mar_open.clear()
-        self._collecting = True
-        self._step = 4
-        self._on_done = on_done
-        def _collect():
-            start = time.time()
-            while time.time() - start < duration_s:
-                _, mar = get_metrics_callback()
-                if mar is not None:
-                    self.mar_open.append(mar)
-                time.sleep(0.05)
-            self._collecting = False
-            if self._on_done:
-                self._on_done()
-        threading.Thread(target=_collect, daemon=True).start()
+    def on_frame(self, ctx):
+        #Cadrul analizat (FrameContext) ajunge la faza în curs, dacă există.
+        if self._collector is not None:
+            self._collector.feed(ctx)
 
     def compute_thresholds(self):
         if self.ear_open and self.ear_closed:
@@ -1,6 +1,7 @@
 import time
 import numpy as np
-import threading
+
+from feature_extraction.phase_collector import PhaseCollector
 
 class CalibratorFull:
     STATE_ORDER = ['alert', 'moderate', 'tired']
@@ -13,25 +14,39 @@ class CalibratorFull:
         self.metric_indices = {name: i for i, name in enumerate(self.metrics_names)}
         self.pitch_baseline = 0.0
         self.system_start_time = time.time()
-        self.last_scores = []
+        self.warmed_up = False
         self.max_score_buffer = 5
         self.MIN_PERCLOS_LEN = 10
-
-    def start_collect(self, state, duration_sec, metrics_callback, on_done=None, interval_sec=1.0):
-        def collect():
-            start_time = time.time()
-            samples = []
-            while time.time() - start_time < duration_sec:
-                values = metrics_callback()
-                if values is not None:
-                    samples.append(values)
-                time.sleep(interval_sec)
-            self.data[state].extend(samples)
-            print(f"[CALIBRATOR] Collected {len(samples)} samples for state: {state}")
+        self._collector = None
+        self._kernel = None
+        self._kernel_src = (None, None)
+        # media mobilă a scorului: buffer circular + sumă curentă
+        self._score_buf = np.zeros(self.max_score_buffer)
+        self._score_n = 0
+        self._score_pos = 0
+        self._score_sum = 0.0
+
+    def start_collect(self, state, duration_sec, on_done=None):
+        """
+        Colectează starea `state` din fluxul de cadre (on_frame): un rând
+        (ear, mar, perclos, pitch) per cadru cu față, timp de duration_sec secunde.
+        """
+        def finished(collector):
+            self.data[state].extend(collector.values)
+            self._collector = None
+            print(f"[CALIBRATOR] Collected {len(collector)} samples for state: {state}")
             if on_done:
                 on_done()
 
-        threading.Thread(target=collect, daemon=True).start()
+        self._collector = PhaseCollector(
+            duration_sec,
+            lambda ctx: (ctx.ear, ctx.mar, ctx.perclos, ctx.pitch) if ctx.face else None,
+            on_done=finished)
+
+    def on_frame(self, ctx):
+        #Cadrul analizat (FrameContext) ajunge la starea colectată, dacă există.
+        if self._collector is not None:
+            self._collector.feed(ctx)
 
     def _get_metric_avg(self, state, metric):
         idx = self.metric_indices[metric]
@@ -39,11 +54,6 @@ class CalibratorFull:
             return 0.0
         return float(np.nanmean([row[idx] for row in self.data[state]]))
 
-    def _normalize_score(self, val, baseline, target):
-        if target == baseline:
-            return 0.0
-        return np.clip((val - baseline) / (target - baseline), 0, 1)
-
     def compute_thresholds_and_weights(self):
         thresholds = {}
         weights = {}
@@ -72,48 +82,96 @@ class CalibratorFull:
         self.thresholds = thresholds
         self.weights = weights
         self.pitch_baseline = self._get_metric_avg('alert', 'pitch')
+        self._compile()
 
         print("[ADV] thresholds and weights computed")
         print(f"[ADV] pitch_baseline = {self.pitch_baseline:.2f}")
 
-    def score_state(self, values):
-        if time.time() - self.system_start_time < 5.0:
-            return 0.0
-
-        score = 0
-        for metric in self.metrics_names:
-            idx = self.metric_indices[metric]
-            val = values[idx]
-
-            if metric == 'pitch':
-                val = max(0.0, val - self.pitch_baseline)
-            if metric == 'perclos':
-                val = min(val, 100.0)
-                if hasattr(self, 'perclos_buffer') and len(self.perclos_buffer) < self.MIN_PERCLOS_LEN:
-                    val = 0.0
-            if metric == 'mar' and val < 0.01:
-                val = 0.0
-
+    def _compile(self):
+        # Pragurile și ponderile devin vectori: baseline, 1 / (target - baseline), ponderi
+        n = len(self.metrics_names)
+        baseline = np.zeros(n)
+        inv_span = np.zeros(n)          # 0 unde target == baseline → metrica nu contează
+        weights = np.zeros(n)
+        for i, metric in enumerate(self.metrics_names):
             t = self.thresholds[metric]
-            w = self.weights[metric]
-
-            baseline = min(t['enter_hi'], t['exit_lo'])
-            target = max(t['enter_hi'], t['exit_lo'])
-            normalized = self._normalize_score(val, baseline, target)
-
-            score += w * normalized
+            lo = min(t['enter_hi'], t['exit_lo'])
+            hi = max(t['enter_hi'], t['exit_lo'])
+            baseline[i] = lo
+            if hi != lo:
+                inv_span[i] = 1.0 / (hi - lo)
+            weights[i] = self.weights[metric]
+        idx = self.metric_indices
+        self._kernel = {
+            'baseline': baseline, 'inv_span': inv_span, 'weights': weights,
+            'pitch': idx.get('pitch'), 'perclos': idx.get('perclos'), 'mar': idx.get('mar'),
+        }
+        self._kernel_src = (self.thresholds, self.weights)
+
+    def _ensure_kernel(self):
+        # thresholds / weights pot fi atribuite direct (ex. încărcare din JSON)
+        src = self._kernel_src
+        if self._kernel is None or src[0] is not self.thresholds or src[1] is not self.weights:
+            self._compile()
+        return self._kernel
+
+    def raw_scores(self, values):
+        """
+        Scorul nenetezit (0–1) pentru o matrice (T, n_metrici) în ordinea
+        metrics_names: ajustările per metrică, apoi clip și produs scalar cu ponderile.
+        """
+        k = self._ensure_kernel()
+        v = np.array(values, dtype=np.float64, ndmin=2)
+        if k['pitch'] is not None:
+            v[:, k['pitch']] = np.maximum(v[:, k['pitch']] - self.pitch_baseline, 0.0)
+        if k['perclos'] is not None:
+            v[:, k['perclos']] = np.minimum(v[:, k['perclos']], 100.0)
+        if k['mar'] is not None:
+            mar = v[:, k['mar']]
+            mar[mar < 0.01] = 0.0
+        norm = np.clip((v - k['baseline']) * k['inv_span'], 0.0, 1.0)
+        return norm @ k['weights']
 
-        self.last_scores.append(score)
-        if len(self.last_scores) > self.max_score_buffer:
-            self.last_scores.pop(0)
-        return float(np.mean(self.last_scores))
+    def score_state(self, values):
+        if not self.warmed_up:
+            if time.time() - self.system_start_time < 5.0:
+                return 0.0
+            self.warmed_up = True
+
+        score = float(self.raw_scores(values)[0])
+
+        # media mobilă pe ultimele max_score_buffer scoruri
+        if self._score_n == self.max_score_buffer:
+            self._score_sum -= self._score_buf[self._score_pos]
+        else:
+            self._score_n += 1
+        self._score_buf[self._score_pos] = score
+        self._score_sum += score
+        self._score_pos = (self._score_pos + 1) % self.max_score_buffer
+        return self._score_sum / self._score_n
+
+    def score_batch(self, values, smooth=True):
+        """
+        Scorurile pentru o înregistrare întreagă (matrice (T, n_metrici)), ex. la
+        redare offline. Cu smooth=True aplică aceeași medie mobilă ca score_state,
+        pornind cu bufferul gol; nu modifică starea calibratorului.
+        """
+        raw = self.raw_scores(values)
+        if not smooth or len(raw) == 0:
+            return raw
+        n = self.max_score_buffer
+        csum = np.concatenate(([0.0], np.cumsum(raw)))
+        ends = np.arange(1, len(raw) + 1)
+        starts = np.maximum(ends - n, 0)
+        return (csum[ends] - csum[starts]) / (ends - starts)
 
     def set_custom_config(self, config):
         self.thresholds = config["thresholds"]
         self.weights = config["weights"]
-        self.metrics_names = config["metrics_names"]
+        self.metrics_names = config.get("metrics_names", self.metrics_names)
         self.metric_indices = {name: i for i, name in enumerate(self.metrics_names)}
         self.pitch_baseline = self._get_metric_avg('alert', 'pitch')
+        self._compile()
 
     def get_advanced_config(self):
         return {
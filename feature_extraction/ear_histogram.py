@@ -0,0 +1,62 @@
+# feature_extraction/ear_histogram.py
+"""
+Histogramă EAR cu bin-uri fixe, ponderată cu timpul. Se actualizează
+incremental (add / remove la intrarea și ieșirea din fereastră) și răspunde în
+O(bins) la „ce procent din fereastră a avut EAR sub pragul X” pentru orice X,
+deci pragul se poate schimba oricând (ex. după calibrare) fără a reface istoricul.
+"""
+import numpy as np
+
+DEFAULT_BINS = 100
+DEFAULT_MAX_EAR = 0.5   # EAR peste această valoare (ochi larg deschiși) intră în ultimul bin
+
+
+class EARHistogram:
+    def __init__(self, bins: int = DEFAULT_BINS, max_ear: float = DEFAULT_MAX_EAR):
+        self.bins = bins
+        self.max_ear = max_ear
+        self.width = max_ear / bins
+        self.counts = np.zeros(bins, dtype=np.float64)
+        self.total = 0.0
+
+    def bin_of(self, ear: float) -> int:
+        #Bin-ul unei valori EAR (valorile din afara intervalului merg în primul / ultimul bin).
+        return min(max(int(ear / self.width), 0), self.bins - 1)
+
+    def add(self, b: int, weight: float = 1.0):
+        self.counts[b] += weight
+        self.total += weight
+
+    def remove(self, b: int, weight: float = 1.0):
+        self.counts[b] -= weight
+        self.total -= weight
+
+    def clear(self):
+        self.counts[:] = 0.0
+        self.total = 0.0
+
+    def fraction_below(self, threshold: float) -> float:
+        """
+        Fracția (0–1) din greutatea totală cu EAR < threshold. Bin-urile întregi
+        sub prag se adună; bin-ul în care cade pragul contribuie proporțional.
+        """
+        if self.total <= 0:
+            return 0.0
+        k = threshold / self.width
+        i = int(np.clip(np.floor(k), 0, self.bins))
+        below = self.counts[:i].sum()
+        if i < self.bins:
+            below += self.counts[i] * min(max(k - i, 0.0), 1.0)
+        return min(max(below / self.total, 0.0), 1.0)
+
+    def quantile(self, q: float) -> float:
+        #Valoarea EAR sub care se află fracția q din greutate (interpolată în bin).
+        if self.total <= 0:
+            return 0.0
+        cum = np.cumsum(np.maximum(self.counts, 0.0))
+        target = q * cum[-1]
+        i = int(np.searchsorted(cum, target))
+        i = min(i, self.bins - 1)
+        prev = cum[i - 1] if i else 0.0
+        inside = (target - prev) / self.counts[i] if self.counts[i] > 0 else 0.0
+        return (i + min(max(inside, 0.0), 1.0)) * self.width
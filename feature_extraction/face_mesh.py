@@ -4,23 +4,134 @@ Modul pentru detectarea feței și landmark-urilor faciale cu MediaPipe FaceMesh
 """
 import cv2
 import mediapipe as mp
+import numpy as np
+
+from feature_extraction.landmarks import MEDIAPIPE_INDEX, LandmarkArray, landmarks_to_array
+
+# Latura crop-ului se rotunjește la multiplu de atât, ca buffer-ul RGB să poată fi refolosit
+CROP_ALIGN = 32
 
 class FaceMeshDetector:
-    def __init__(self, max_faces=1, min_detection_confidence=0.5):
+    name = 'mediapipe'
+    index = MEDIAPIPE_INDEX
+
+    def __init__(self, max_faces=1, min_detection_confidence=0.5, refine_landmarks=True,
+                 tracking=False, padding=0.5, redetect_every=30, min_crop=128, inference_width=None):
+        """
+        inference_width – lățimea (px) la care se micșorează imaginea înainte de model;
+                          None = rezoluția originală. Coordonatele normalizate nu se schimbă
+        tracking       – rulează modelul doar pe o zonă în jurul feței din cadrul anterior
+        padding        – marginea crop-ului, ca fracție din latura mare a feței
+        redetect_every – la câte cadre se face oricum o detecție pe cadrul complet
+        min_crop       – latura minimă a crop-ului, în pixeli
+        """
         self.mp_face = mp.solutions.face_mesh
         self.face_mesh = self.mp_face.FaceMesh(static_image_mode=False,
                                                max_num_faces=max_faces,
-                                               refine_landmarks=True,
+                                               refine_landmarks=refine_landmarks,
                                                min_detection_confidence=min_detection_confidence)
+        # Buffere refolosite de la un cadru la altul (alocate la prima rezoluție)
+        self._rgb_buf = None
+        self._small_buf = None
+        self.inference_width = inference_width
 
-    def find_landmarks(self, frame):
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.face_mesh.process(rgb_frame)
+        self.tracking = tracking
+        self.padding = padding
+        self.redetect_every = redetect_every
+        self.min_crop = min_crop
+        self._box = None            # (x0, y0, x1, y1) în pixeli, zona de urmărire
+        self._since_detect = 0
+        self.full_frames = 0        # inferențe pe cadrul complet
+        self.crop_frames = 0        # inferențe pe crop
+
+    def _to_rgb(self, frame):
+        # Singurul punct în care un cadru Mono8 devine 3 canale: modelul cere RGB
+        code = cv2.COLOR_GRAY2RGB if frame.ndim == 2 else cv2.COLOR_BGR2RGB
+        h, w = frame.shape[:2]
+        if self._rgb_buf is None or self._rgb_buf.shape[:2] != (h, w):
+            self._rgb_buf = np.empty((h, w, 3), dtype=np.uint8)
+        cv2.cvtColor(frame, code, dst=self._rgb_buf)
+        return self._rgb_buf
+
+    def _downscale(self, frame):
+        # Micșorare uniformă (aceeași scară pe x și y): coordonatele normalizate rămân
+        # valabile pentru cadrul original, deci nu e nevoie de remapare
+        h, w = frame.shape[:2]
+        if not self.inference_width or w <= self.inference_width:
+            return frame
+        tw = int(self.inference_width)
+        th = max(1, int(round(h * tw / w)))
+        shape = (th, tw) + frame.shape[2:]
+        if self._small_buf is None or self._small_buf.shape != shape:
+            self._small_buf = np.empty(shape, dtype=frame.dtype)
+        cv2.resize(frame, (tw, th), dst=self._small_buf, interpolation=cv2.INTER_AREA)
+        return self._small_buf
+
+    def _process(self, frame):
+        # Întâi micșorăm (încă Mono8 / BGR), apoi convertim la RGB doar imaginea mică
+        results = self.face_mesh.process(self._to_rgb(self._downscale(frame)))
         if results.multi_face_landmarks:
             # Returnează landmarks pentru prima față detectată
             return results.multi_face_landmarks[0].landmark
         return None
 
+    def find_landmarks(self, frame):
+        #Landmark-urile primei fețe ca LandmarkArray (tablou (478, 3) float32) sau None.
+        if self.tracking:
+            return self._find_tracked(frame)
+        landmarks = self._process(frame)
+        if landmarks is None:
+            return None
+        return LandmarkArray(landmarks_to_array(landmarks))
+
+    # ─── Modul de urmărire (crop în jurul feței) ───────────────────────────────
+    def _find_tracked(self, frame):
+        h, w = frame.shape[:2]
+        if self._box is not None and (self._box[2] > w or self._box[3] > h):
+            self._box = None    # cadrul s-a micșorat (ROI nou pe cameră)
+        if self._box is not None and self._since_detect < self.redetect_every:
+            x0, y0, x1, y1 = self._box
+            landmarks = self._process(frame[y0:y1, x0:x1])
+            if landmarks is not None:
+                self.crop_frames += 1
+                self._since_detect += 1
+                # din coordonate normalizate în crop → normalizate în cadrul complet
+                arr = landmarks_to_array(landmarks)
+                cw, ch = x1 - x0, y1 - y0
+                arr[:, 0] = (x0 + arr[:, 0] * cw) / w
+                arr[:, 1] = (y0 + arr[:, 1] * ch) / h
+                arr[:, 2] *= cw / w
+                self._box = self._track_box(arr, w, h)
+                return LandmarkArray(arr)
+
+        # fața s-a pierdut sau e timpul unei redetecții: cadrul complet
+        self.full_frames += 1
+        self._since_detect = 0
+        landmarks = self._process(frame)
+        if landmarks is None:
+            self._box = None
+            return None
+        arr = landmarks_to_array(landmarks)
+        self._box = self._track_box(arr, w, h)
+        return LandmarkArray(arr)
+
+    def _track_box(self, arr, w, h):
+        # Crop pătrat cu margine în jurul feței, latura aliniată la CROP_ALIGN
+        xs, ys = arr[:, 0] * w, arr[:, 1] * h
+        x0, x1, y0, y1 = xs.min(), xs.max(), ys.min(), ys.max()
+        side = max(x1 - x0, y1 - y0) * (1 + 2 * self.padding)
+        side = max(side, self.min_crop)
+        side = int(np.ceil(side / CROP_ALIGN)) * CROP_ALIGN
+        cw, ch = min(side, w), min(side, h)
+        cx, cy = (x0 + x1) / 2.0, (y0 + y1) / 2.0
+        bx = int(min(max(cx - cw / 2.0, 0), w - cw))
+        by = int(min(max(cy - ch / 2.0, 0), h - ch))
+        return bx, by, bx + cw, by + ch
+
+    def reset_tracking(self):
+        #Următorul cadru se analizează complet (ex. după schimbarea ROI-ului camerei).
+        self._box = None
+
     def close(self):
         #Eliberăm resurse MediaPipe.
         self.face_mesh.close()
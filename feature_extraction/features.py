@@ -0,0 +1,65 @@
+# feature_extraction/features.py
+"""
+EAR (ambii ochi), MAR și pitch calculate vectorizat, dintr-un singur apel,
+direct pe tabloul de landmark-uri (N, 3) sau pe un lot (T, N, 3) — același cod
+pentru analiza live și pentru analiza offline a unei înregistrări.
+Formulele sunt cele din ear.py / mar.py / pitch.py, fără rotunjirea la pixeli întregi.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from feature_extraction.landmarks import LandmarkArray, MEDIAPIPE_INDEX, landmarks_to_array
+
+Features = namedtuple('Features', 'ear ear_left ear_right mar pitch')
+
+
+def as_array(landmarks):
+    #Tabloul float32 (..., N, 3) din LandmarkArray, listă MediaPipe sau ndarray.
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+    if isinstance(landmarks, LandmarkArray):
+        return landmarks.array
+    return landmarks_to_array(landmarks)
+
+
+def _ratio(num, den):
+    # num / den, cu 0 unde numitorul e 0 (ca în funcțiile scalare)
+    out = np.zeros_like(num)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+def compute_features(landmarks, width, height, index=None):
+    """
+    Returnează Features(ear, ear_left, ear_right, mar, pitch).
+    Pentru un singur cadru valorile sunt float; pentru un lot (T, N, 3) sunt tablouri (T,).
+    index – LandmarkIndex al backend-ului; implicit cel purtat de LandmarkArray sau MediaPipe.
+    """
+    if index is None:
+        index = getattr(landmarks, 'index', MEDIAPIPE_INDEX)
+    lm = as_array(landmarks)
+    scale = np.array([width, height], dtype=np.float64)
+
+    # ochi: P1..P6 (P1-P4 orizontal, P2-P6 și P3-P5 vertical)
+    eyes = lm[..., index.eyes, :2] * scale                     # (..., 2, 6, 2)
+    def eye_dist(a, b):
+        return np.linalg.norm(eyes[..., a, :] - eyes[..., b, :], axis=-1)   # (..., 2)
+    ear_eyes = _ratio(eye_dist(1, 5) + eye_dist(2, 4), 2.0 * eye_dist(0, 3))
+
+    mouth = lm[..., index.mouth, :2] * scale                   # (..., 4, 2)
+    horizontal = np.linalg.norm(mouth[..., 0, :] - mouth[..., 1, :], axis=-1)
+    vertical = np.linalg.norm(mouth[..., 2, :] - mouth[..., 3, :], axis=-1)
+    mar = _ratio(vertical, horizontal)
+
+    # Unghiul vectorului nas → bărbie față de verticală
+    v = (lm[..., index.chin, :2] - lm[..., index.nose, :2]) * scale
+    norm = np.linalg.norm(v, axis=-1)
+    cos_angle = np.clip(_ratio(v[..., 1], norm), -1.0, 1.0)
+    pitch = np.where(norm == 0, 0.0, np.degrees(np.arccos(cos_angle)))
+
+    ear_left, ear_right = ear_eyes[..., 0], ear_eyes[..., 1]
+    ear = (ear_left + ear_right) / 2.0
+    if lm.ndim == 2:
+        return Features(float(ear), float(ear_left), float(ear_right), float(mar), float(pitch))
+    return Features(ear, ear_left, ear_right, mar, pitch)
@@ -0,0 +1,144 @@
+# feature_extraction/inference_scheduler.py
+"""
+Rulează FaceMesh doar pe cadrele cheie. Pe cadrele în care fața nu se mișcă
+(miniaturile feței și ale ochilor diferă puțin față de ultimul cadru cheie)
+landmark-urile se extrapolează liniar din ultimele două cadre cheie, deci
+EAR / MAR / pitch primesc o valoare la fiecare cadru. Când EAR-ul scade sau se
+apropie de prag (început de clipit / microsomn) inferența revine la fiecare cadru.
+"""
+import cv2
+import numpy as np
+
+from feature_extraction.features import compute_features
+from feature_extraction.landmarks import LandmarkArray, MEDIAPIPE_INDEX, landmarks_to_array
+
+# Latura miniaturilor (față / ochi) folosite pentru detecția de mișcare
+THUMB_SIZE = 32
+EYE_THUMB_SIZE = 16
+
+
+class InferenceScheduler:
+    def __init__(self, detector, max_skip=2, motion_threshold=3.0, ear_threshold=0.2,
+                 ear_margin=0.05, ear_drop=0.02, hold_frames=10):
+        """
+        detector         – obiect cu find_landmarks(frame) (ex. FaceMeshDetector)
+        max_skip         – câte cadre consecutive se pot sări (rata minimă = 1/(max_skip+1))
+        motion_threshold – diferența medie (nivele de gri) a miniaturii peste care inferăm
+        ear_threshold    – pragul EAR; sub ear_threshold + ear_margin inferăm la fiecare cadru
+        ear_drop         – scăderea EAR între două cadre cheie care anunță un clipit
+        hold_frames      – câte cadre rămânem la rată maximă după un semnal de EAR
+        """
+        self.detector = detector
+        self.max_skip = max_skip
+        self.motion_threshold = motion_threshold
+        self.ear_threshold = ear_threshold
+        self.ear_margin = ear_margin
+        self.ear_drop = ear_drop
+        self.hold_frames = hold_frames
+
+        self.keyframes = 0
+        self.skipped = 0
+        self._frame_index = 0
+        self.reset_tracking()
+
+    def reset_tracking(self):
+        #Uită cadrele cheie; următorul cadru trece prin model.
+        self._prev = None           # (t, tablou landmark-uri) cadrul cheie anterior
+        self._last = None           # (t, tablou landmark-uri) ultimul cadru cheie
+        self._last_ear = None
+        self._thumbs_ref = None     # miniaturile ultimului cadru cheie
+        self._index = MEDIAPIPE_INDEX   # schema backend-ului care a produs landmark-urile
+        self._skipped_run = 0
+        self._hold = 0
+        if hasattr(self.detector, 'reset_tracking'):
+            self.detector.reset_tracking()
+
+    @property
+    def inference_ratio(self) -> float:
+        #Fracția de cadre care au trecut prin model.
+        total = self.keyframes + self.skipped
+        return self.keyframes / total if total else 0.0
+
+    def _region_thumb(self, frame, x0, y0, x1, y1, size):
+        # Miniatura unei zone (un singur canal), ieftină de comparat
+        h, w = frame.shape[:2]
+        x0, x1 = int(max(x0 * w, 0)), int(min(x1 * w + 1, w))
+        y0, y1 = int(max(y0 * h, 0)), int(min(y1 * h + 1, h))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        crop = frame[y0:y1, x0:x1]
+        if crop.ndim == 3:
+            crop = crop[:, :, 1]
+        return cv2.resize(crop, (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def _thumbs(self, frame, arr, index):
+        # Fața întreagă (mișcarea capului) + câte o zonă pătrată pe fiecare ochi (clipitul
+        # schimbă prea puțini pixeli ca să se vadă în miniatura feței)
+        thumbs = [self._region_thumb(frame, arr[:, 0].min(), arr[:, 1].min(),
+                                     arr[:, 0].max(), arr[:, 1].max(), THUMB_SIZE)]
+        for eye_idx in index.eyes:
+            eye = arr[eye_idx]
+            cx, cy = eye[:, 0].mean(), eye[:, 1].mean()
+            r = 0.75 * (eye[:, 0].max() - eye[:, 0].min())
+            thumbs.append(self._region_thumb(frame, cx - r, cy - r, cx + r, cy + r, EYE_THUMB_SIZE))
+        return None if any(t is None for t in thumbs) else thumbs
+
+    def _must_infer(self, frame):
+        if self._last is None or self._hold > 0 or self._skipped_run >= self.max_skip:
+            return True
+        thumbs = self._thumbs(frame, self._last[1], self._index)
+        if thumbs is None or self._thumbs_ref is None:
+            return True
+        motion = max(float(np.mean(np.abs(a - b))) for a, b in zip(thumbs, self._thumbs_ref))
+        return motion > self.motion_threshold
+
+    def _extrapolate(self, t):
+        # Liniar din ultimele două cadre cheie; fără al doilea cadru → ultimul cadru cheie
+        t1, a1 = self._last
+        if self._prev is None:
+            return a1.copy()
+        t0, a0 = self._prev
+        if t1 <= t0:
+            return a1.copy()
+        k = min((t - t1) / (t1 - t0), 1.0)
+        return a1 + (a1 - a0) * k
+
+    def find_landmarks(self, frame, timestamp=None):
+        """
+        Landmark-uri pentru cadrul curent (LandmarkArray sau None): din model pe
+        cadrele cheie, extrapolate pe cele sărite.
+        """
+        t = float(self._frame_index if timestamp is None else timestamp)
+        self._frame_index += 1
+
+        if not self._must_infer(frame):
+            self.skipped += 1
+            self._skipped_run += 1
+            return LandmarkArray(self._extrapolate(t), self._index)
+
+        self.keyframes += 1
+        self._skipped_run = 0
+        self._hold = max(self._hold - 1, 0)
+        landmarks = self.detector.find_landmarks(frame)
+        if landmarks is None:
+            self._prev = self._last = None
+            self._last_ear = None
+            return None
+
+        arr = landmarks_to_array(landmarks)
+        self._index = getattr(landmarks, 'index', MEDIAPIPE_INDEX)
+        lm = LandmarkArray(arr, self._index)
+        self._prev, self._last = self._last, (t, arr)
+        self._thumbs_ref = self._thumbs(frame, arr, self._index)
+
+        # EAR-ul decide dacă urmează un clipit: aproape de prag sau în scădere → rată maximă
+        h, w = frame.shape[:2]
+        ear = compute_features(arr, w, h, self._index).ear
+        closing = self._last_ear is not None and self._last_ear - ear > self.ear_drop
+        if closing or ear < self.ear_threshold + self.ear_margin:
+            self._hold = self.hold_frames
+        self._last_ear = ear
+        return lm
+
+    def close(self):
+        self.detector.close()
@@ -0,0 +1,195 @@
+# feature_extraction/landmark_service.py
+"""
+Serviciu de inferență FaceMesh în procese separate. Cadrele ajung la
+procesele worker prin memorie partajată (fără pickle pe imagine), iar
+landmark-urile se întorc ca tablou compact (N, 3) float32, tot prin memorie
+partajată. Numărul de cadre aflate în procesare e limitat (max_in_flight), iar
+rezultatele se livrează mereu în ordinea în care cadrele au fost trimise.
+"""
+import multiprocessing
+import queue
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Optional
+
+import numpy as np
+
+from feature_extraction.backends import backend_class
+from feature_extraction.landmarks import LandmarkArray, NUM_LANDMARKS, landmarks_to_array
+
+# Suficient pentru un cadru BGR la rezoluția maximă a camerei (1920×1200)
+DEFAULT_MAX_FRAME_BYTES = 1920 * 1200 * 3
+_OUT_BYTES = NUM_LANDMARKS * 3 * np.dtype(np.float32).itemsize
+
+
+@dataclass
+class LandmarkResult:
+    seq: int                                # numărul de ordine al trimiterii
+    frame_id: Any
+    landmarks: Optional[LandmarkArray]      # None dacă nu s-a detectat nicio față
+    infer_ms: float
+    meta: Any = None                        # obiectul dat la submit (ex. FrameRecord), rămâne în procesul principal
+
+
+def _worker_main(task_q, result_q, frame_names, out_names, detector_kwargs):
+    # Rulează într-un proces separat: un detector propriu, cadre citite din memoria partajată
+    from feature_extraction.backends import create_backend
+
+    # Blocurile sunt create (și șterse) de procesul principal; aici doar le atașăm
+    frames = [shared_memory.SharedMemory(name=n) for n in frame_names]
+    outs = [shared_memory.SharedMemory(name=n) for n in out_names]
+    detector = create_backend(**detector_kwargs)
+    try:
+        while True:
+            task = task_q.get()
+            if task is None:
+                break
+            seq, slot, shape = task
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=frames[slot].buf)
+            t0 = time.perf_counter()
+            landmarks = detector.find_landmarks(frame)
+            count = 0
+            if landmarks is not None:
+                out = np.ndarray((NUM_LANDMARKS, 3), dtype=np.float32, buffer=outs[slot].buf)
+                count = len(landmarks_to_array(landmarks, out))
+            result_q.put((seq, slot, count, (time.perf_counter() - t0) * 1000.0))
+    finally:
+        detector.close()
+        for shm in frames + outs:
+            shm.close()
+
+
+class LandmarkService:
+    def __init__(self, workers=1, max_in_flight=2, max_frame_bytes=DEFAULT_MAX_FRAME_BYTES,
+                 detector_kwargs=None):
+        """
+        workers         – câte procese FaceMesh rulează în paralel
+        max_in_flight   – câte cadre pot fi trimise și încă nelivrate; submit()
+                          refuză cadrele peste această limită
+        max_frame_bytes – dimensiunea maximă a unui cadru (uint8) în memoria partajată
+        detector_kwargs – parametrii create_backend din fiecare proces (secțiunea face_mesh)
+        """
+        if workers < 1 or max_in_flight < 1:
+            raise ValueError("workers și max_in_flight trebuie să fie cel puțin 1")
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.max_frame_bytes = max_frame_bytes
+        # Schema punctelor returnate de backend, atașată landmark-urilor primite
+        self._index = backend_class((detector_kwargs or {}).get('backend', 'mediapipe')).index
+
+        # Un slot (cadru + landmark-uri) pentru fiecare cadru aflat în procesare
+        self._frame_shm = [shared_memory.SharedMemory(create=True, size=max_frame_bytes)
+                           for _ in range(max_in_flight)]
+        self._out_shm = [shared_memory.SharedMemory(create=True, size=_OUT_BYTES)
+                         for _ in range(max_in_flight)]
+        self._free = list(range(max_in_flight))
+        self._pending = {}      # seq -> (slot, frame_id, meta), trimise și încă neterminate
+        self._ready = {}        # seq -> LandmarkResult, terminate dar încă nelivrate (reordonare)
+        self._next_seq = 0      # următorul seq dat la submit
+        self._next_out = 0      # următorul seq de livrat
+        self._closed = False
+
+        # 'spawn': procesele nu moștenesc starea Tk / MediaPipe a procesului principal
+        ctx = multiprocessing.get_context('spawn')
+        self._task_q = ctx.Queue()
+        self._result_q = ctx.Queue()
+        self._procs = [
+            ctx.Process(target=_worker_main, name=f"landmarks-{i}", daemon=True,
+                        args=(self._task_q, self._result_q,
+                              [s.name for s in self._frame_shm],
+                              [s.name for s in self._out_shm],
+                              dict(detector_kwargs or {})))
+            for i in range(workers)
+        ]
+        for proc in self._procs:
+            proc.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def in_flight(self) -> int:
+        #Cadre trimise și încă nelivrate.
+        return self._next_seq - self._next_out
+
+    def submit(self, frame, frame_id=None, meta=None):
+        """
+        Trimite un cadru la inferență. Returnează numărul de ordine sau None dacă
+        limita de cadre în procesare e atinsă (cadrul nu e analizat).
+        """
+        if self.in_flight >= self.max_in_flight:
+            return None
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if frame.nbytes > self.max_frame_bytes:
+            raise ValueError(f"Cadru prea mare pentru memoria partajată: {frame.nbytes} > {self.max_frame_bytes}")
+        # Sloturile se eliberează când sosește rezultatul, deci există unul liber
+        self._collect(0)
+        slot = self._free.pop()
+        np.ndarray(frame.shape, dtype=np.uint8, buffer=self._frame_shm[slot].buf)[...] = frame
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._pending[seq] = (slot, frame_id, meta)
+        self._task_q.put((seq, slot, frame.shape))
+        return seq
+
+    def _collect(self, timeout):
+        # Preia rezultatele sosite; așteaptă cel mult `timeout` după primul (None = oricât)
+        block = timeout is None or timeout > 0
+        while True:
+            try:
+                seq, slot, count, infer_ms = self._result_q.get(block, timeout)
+            except queue.Empty:
+                return
+            block = False
+            _, frame_id, meta = self._pending.pop(seq)
+            landmarks = None
+            if count:
+                out = np.ndarray((NUM_LANDMARKS, 3), dtype=np.float32, buffer=self._out_shm[slot].buf)
+                landmarks = LandmarkArray(out[:count].copy(), self._index)
+            self._free.append(slot)
+            self._ready[seq] = LandmarkResult(seq, frame_id, landmarks, infer_ms, meta)
+
+    def _check_workers(self):
+        if any(not proc.is_alive() for proc in self._procs):
+            raise RuntimeError("Un proces de inferență FaceMesh s-a oprit neașteptat")
+
+    def get_result(self, timeout=0.0):
+        """
+        Următorul rezultat, strict în ordinea trimiterii, sau None dacă nu e
+        gata în `timeout` secunde (0 = nu așteaptă, None = așteaptă oricât).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._next_out not in self._ready:
+            if self.in_flight == 0:
+                return None
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self._collect(0)
+                if self._next_out not in self._ready:
+                    return None
+                break
+            self._check_workers()
+            self._collect(min(remaining, 0.5) if remaining is not None else 0.5)
+        result = self._ready.pop(self._next_out)
+        self._next_out += 1
+        return result
+
+    def close(self, timeout=2.0):
+        #Oprește procesele și eliberează memoria partajată.
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._procs:
+            self._task_q.put(None)
+        for proc in self._procs:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        for shm in self._frame_shm + self._out_shm:
+            shm.close()
+            shm.unlink()
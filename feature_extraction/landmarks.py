@@ -0,0 +1,73 @@
+# feature_extraction/landmarks.py
+"""
+Landmark-uri faciale ca tablou NumPy compact (N, 3) float32 — coordonate
+normalizate x, y, z. LandmarkArray păstrează interfața listei MediaPipe
+(`landmarks[i].x`), deci funcțiile EAR/MAR/pitch existente merg neschimbate.
+
+Fiecare backend are propria numerotare a punctelor; LandmarkIndex spune unde
+se află, în tabloul backend-ului, punctele din schema comună ochi / gură /
+nas / bărbie folosite de metrici.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# FaceMesh cu refine_landmarks=True (468 puncte + 10 pentru iris)
+NUM_LANDMARKS = 478
+
+Point = namedtuple('Point', 'x y z')
+
+# Schema comună:
+#   eyes  – (2, 6): ochiul din stânga imaginii, apoi cel din dreapta; în fiecare
+#           P1..P6 (P1-P4 colțuri, P2-P6 și P3-P5 perechi verticale)
+#   mouth – colț stânga, colț dreapta, buza de sus (interior), buza de jos (interior)
+#   nose  – vârful nasului; chin – bărbia
+LandmarkIndex = namedtuple('LandmarkIndex', 'eyes mouth nose chin')
+
+MEDIAPIPE_INDEX = LandmarkIndex(
+    eyes=np.array([[33, 160, 158, 133, 153, 144],
+                   [362, 385, 387, 263, 373, 380]]),
+    mouth=np.array([61, 291, 13, 14]),
+    nose=1,
+    chin=152,
+)
+
+# Predictorul dlib cu 68 de puncte (numerotare de la 0)
+DLIB68_INDEX = LandmarkIndex(
+    eyes=np.array([[36, 37, 38, 39, 40, 41],
+                   [42, 43, 44, 45, 46, 47]]),
+    mouth=np.array([48, 54, 62, 66]),
+    nose=30,
+    chin=8,
+)
+
+
+class LandmarkArray:
+    def __init__(self, array, index=MEDIAPIPE_INDEX):
+        self.array = np.asarray(array, dtype=np.float32)
+        self.index = index
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, i):
+        x, y, z = self.array[i].tolist()
+        return Point(x, y, z)
+
+    def __iter__(self):
+        return (Point(x, y, z) for x, y, z in self.array.tolist())
+
+
+def landmarks_to_array(landmarks, out=None):
+    """
+    Convertește lista de landmark-uri MediaPipe într-un tablou (N, 3) float32.
+    `out` – tablou prealocat în care se scrie rezultatul (ex. memorie partajată).
+    """
+    if isinstance(landmarks, LandmarkArray):
+        arr = landmarks.array
+    else:
+        arr = np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+    if out is None:
+        return arr
+    out[:len(arr)] = arr
+    return out[:len(arr)]
@@ -26,3 +26,10 @@ def normalize_micro(micro_count: int, max_count: int = 5) -> float:
 
 def normalize_pitch(pitch: float, max_deg: float = 20.0) -> float:
     return clamp(fabs(pitch) / max_deg)
+
+def normalize_blink_duration(duration_s: float, ref: float = 0.15, max_val: float = 0.40) -> float:
+    # Clipirile lente (> ~300 ms) apar odată cu somnolența
+    return clamp((duration_s - ref) / (max_val - ref))
+
+def normalize_blink_rate(rate_per_min: float, ref: float = 15.0, max_val: float = 35.0) -> float:
+    return clamp((rate_per_min - ref) / (max_val - ref))
@@ -1,20 +1,117 @@
 # feature_extraction/microsleep.py
+"""
+Detecția micro-adormirilor pe durata reală cu ochii închiși, măsurată pe
+timestamp-urile cadrelor: pragul rămâne corect la FPS variabil, cadre pierdute,
+cadre sărite de planificator sau o captură mai lentă.
+
+Ca la PERCLOS, fiecare eșantion acoperă intervalul de la eșantionul anterior
+până la el, deci o închidere începe la eșantionul deschis dinaintea ei.
+Lipsa feței e tratată explicit: golurile scurte (≤ max_gap_s) sunt ignorate
+(ochii rămân considerați închiși dacă sunt tot închiși după gol), cele lungi
+încheie închiderea curentă la ultimul cadru cu ochii închiși.
+"""
+from dataclasses import dataclass
+
+
+@dataclass
+class MicroSleepEvent:
+    start: float            # secunde, ceasul cadrelor
+    end: float
+    duration: float
+    face_lost: bool = False  # încheiat de pierderea feței, nu de deschiderea ochilor
+
 
 class MicroSleepDetector:
-    def __init__(self, threshold_time_s, fps):
-        self.threshold_frames = int(threshold_time_s * fps)
-        self.frames = 0
-        self.active = False
+    def __init__(self, threshold_time_s, fps=None, max_gap_s=0.5):
+        """
+        threshold_time_s – durata minimă cu ochii închiși (s)
+        fps              – rata nominală: ceasul folosit când update() nu primește
+                           timestamp și durata estimată a unui cadru la pornire
+        max_gap_s        – golul maxim (cadre lipsă sau fără față) peste care
+                           închiderea nu mai continuă
+        """
+        self.threshold_time_s = threshold_time_s
+        self.fps = fps
+        self.max_gap_s = max_gap_s
         self.count = 0
+        self.events = []            # MicroSleepEvent încheiate
+        self.ended = None           # evenimentul încheiat la ultimul apel (sau None)
+        self.reset()
+
+    def reset(self):
+        #Uită închiderea în curs (ex. la repornirea monitorizării); contorul rămâne.
+        self.active = False
+        self._samples = 0
+        self._period = 1.0 / self.fps if self.fps else 1.0 / 30.0   # durata estimată a unui cadru
+        self._last_t = None         # ultimul cadru primit (cu sau fără față)
+        self._last_face_t = None    # ultimul cadru cu față
+        self._closed_start = None
+        self._closed_end = None
+
+    @property
+    def closed_duration(self) -> float:
+        #Durata închiderii în curs (0 dacă ochii sunt deschiși).
+        if self._closed_start is None:
+            return 0.0
+        return self._closed_end - self._closed_start
+
+    def _clock(self, timestamp):
+        if timestamp is None:
+            if not self.fps:
+                raise ValueError("MicroSleepDetector fără fps cere timestamp la update()")
+            timestamp = self._samples / self.fps
+        self._samples += 1
+        t = float(timestamp)
+        if self._last_t is not None and t < self._last_t:
+            # ceasul sursei a luat-o de la capăt (reconectare, redare reluată)
+            self._finish(face_lost=False)
+            self._last_t = self._last_face_t = None
+        return t
+
+    def _finish(self, face_lost):
+        # Încheie închiderea curentă; dacă a fost micro-adormire, înregistrează evenimentul
+        if self._closed_start is not None and self.active:
+            self.ended = MicroSleepEvent(self._closed_start, self._closed_end,
+                                         self._closed_end - self._closed_start, face_lost)
+            self.events.append(self.ended)
+        self.active = False
+        self._closed_start = self._closed_end = None
+
+    def update(self, ear, ear_threshold, timestamp=None):
+        """
+        Eșantion cu față detectată. Returnează True o singură dată per eveniment,
+        în momentul în care închiderea atinge threshold_time_s.
+        """
+        self.ended = None
+        t = self._clock(timestamp)
+        if t == self._last_t:
+            return False
+        gap = t - self._last_t if self._last_t is not None else None
+        if gap is not None and gap <= self.max_gap_s:
+            self._period += 0.1 * (gap - self._period)
+        if self._closed_start is not None and t - self._last_face_t > self.max_gap_s:
+            self._finish(face_lost=True)
+        self._last_t = self._last_face_t = t
 
-    def update(self, ear, ear_threshold):
         if ear < ear_threshold:
-            self.frames += 1
-            if self.frames >= self.threshold_frames and not self.active:
+            if self._closed_start is None:
+                # închiderea acoperă intervalul de la cadrul anterior (cel mult max_gap_s)
+                lead = gap if gap is not None and gap <= self.max_gap_s else self._period
+                self._closed_start = t - lead
+            self._closed_end = t
+            if not self.active and self.closed_duration >= self.threshold_time_s - 1e-9:
                 self.active = True
                 self.count += 1
-                return True  
+                return True
         else:
-            self.frames = 0
-            self.active = False
-        return False  
+            self._finish(face_lost=False)
+        return False
+
+    def update_no_face(self, timestamp=None):
+        #Cadru fără față: închiderea continuă doar peste goluri de cel mult max_gap_s.
+        self.ended = None
+        t = self._clock(timestamp)
+        self._last_t = t
+        if self._closed_start is not None and t - self._last_face_t > self.max_gap_s:
+            self._finish(face_lost=True)
+        return False
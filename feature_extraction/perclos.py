@@ -1,28 +1,131 @@
 import collections
-import time
+
+from feature_extraction.ear_histogram import DEFAULT_BINS, DEFAULT_MAX_EAR, EARHistogram
+
 
 class PERCLOS:
     """
     Calculează procentul de timp în care ochii sunt considerați închiși (EAR < prag)
-    pe o fereastră glisantă de `window_s` secunde.
+    pe o fereastră glisantă de `window_s` secunde (și, opțional, pe ferestre mai lungi
+    în paralel, ex. 5 și 15 minute).
+
+    Fiecare eșantion acoperă intervalul de la eșantionul anterior până la el, deci
+    procentul e ponderat cu timpul real, indiferent de FPS. Eșantioanele nu se
+    binarizează la inserare: fiecare fereastră ține o histogramă EAR ponderată cu
+    timpul, deci PERCLOS se poate cere la orice prag (pragul calibrat se aplică
+    imediat întregii ferestre, variantele P70 / P80 nu costă nimic în plus).
+    Eșantioanele consecutive din același bin se comasează într-un segment din coada
+    comună a ferestrelor: update() e O(1) amortizat, compute() e O(bins).
     """
-    def __init__(self, window_s: int = 60, sample_rate_hz: float = 20.0):
-        # Durata ferestrei în secunde și rata de eșantionare
+    def __init__(self, window_s: float = 60, sample_rate_hz: float = 20.0, extra_windows_s=(),
+                 bins: int = DEFAULT_BINS, max_ear: float = DEFAULT_MAX_EAR):
+        """
+        window_s        – fereastra principală (returnată de compute() fără argument)
+        sample_rate_hz  – rata nominală: durata primului eșantion și ceasul folosit
+                          când update() nu primește timestamp
+        extra_windows_s – ferestre suplimentare, ex. (300, 900)
+        bins, max_ear   – rezoluția histogramei EAR (implicit bin-uri de 0.005)
+        """
         self.window_s = window_s
         self.sample_rate = sample_rate_hz
-        # Buffer circular pentru indicatori binari (1=ochi închiși, 0=ochi deschiși)
-        self.max_len = int(window_s * sample_rate_hz)
-        self.buffer = collections.deque(maxlen=self.max_len)
+        self.windows = [float(window_s)] + [float(w) for w in extra_windows_s if w != window_s]
+        self.bins = bins
+        self.max_ear = max_ear
+        self.threshold = None   # ultimul prag primit la update(), implicit pentru compute()
+        self.reset()
+
+    def reset(self):
+        # Segmente [start, end, bin] cu indici absoluți: segmentul i e la _runs[i - _base]
+        self._runs = collections.deque()
+        self._base = 0
+        self._last_t = None
+        self._samples = 0
+        self._offset = 0.0      # ajustare când ceasul sursei sare înapoi (ex. cameră reconectată)
+        # Pentru fiecare fereastră: [histogramă, segmentul de început, tăietura]
+        self._state = {w: [EARHistogram(self.bins, self.max_ear), 0, None] for w in self.windows}
+
+    def update(self, ear: float, threshold: float = None, timestamp: float = None):
+        """
+        Adaugă un eșantion EAR în fereastră. ear=None = cadru fără față: timpul
+        intră în ultimul bin (ochi deschiși), deci nu crește PERCLOS la niciun prag.
+        threshold – pragul curent (ochi închiși dacă ear < threshold), folosit de compute()
+        timestamp – secunde (ceasul cadrului); fără el, eșantioanele sunt la 1/sample_rate_hz.
+        """
+        if threshold is not None:
+            self.threshold = threshold
+        hist0 = self._state[self.windows[0]][0]
+        b = hist0.bins - 1 if ear is None else hist0.bin_of(ear)
+        t = float(timestamp) if timestamp is not None else self._samples / self.sample_rate
+        self._samples += 1
+        t += self._offset
+        if self._last_t is None:
+            start = t - 1.0 / self.sample_rate
+        elif t == self._last_t:
+            return      # timestamp repetat: nu acoperă niciun interval
+        elif t < self._last_t:
+            # ceasul a luat-o de la capăt: continuăm cronologia cu un eșantion nominal
+            self._offset += self._last_t - t + 1.0 / self.sample_rate
+            t = self._last_t + 1.0 / self.sample_rate
+            start = self._last_t
+        else:
+            start = self._last_t
+        dt = t - start
+        self._last_t = t
+
+        if self._runs and self._runs[-1][2] == b:
+            self._runs[-1][1] = t
+        else:
+            self._runs.append([start, t, b])
+        last = self._base + len(self._runs) - 1
+        for w, st in self._state.items():
+            if st[2] is None:
+                st[1], st[2] = last, start
+            st[0].add(b, dt)
+            self._evict(st, t - w)
 
-    def update(self, ear: float, threshold: float):
-        #Adaugă un nou eșantion la buffer: 1 dacă ear < threshold, altfel 0.
-        self.buffer.append(1 if ear < threshold else 0)
+        # Segmentele ieșite din toate ferestrele nu mai sunt necesare
+        first = min(st[1] for st in self._state.values())
+        while self._base < first:
+            self._runs.popleft()
+            self._base += 1
 
-    def compute(self) -> float:
+    def _evict(self, st, lo):
+        # Scoate din histogramă timpul de dinaintea lui `lo` (începutul ferestrei)
+        runs, base, hist = self._runs, self._base, st[0]
+        while st[2] < lo:
+            start, end, b = runs[st[1] - base]
+            cut_to = min(end, lo)
+            hist.remove(b, cut_to - st[2])
+            if cut_to < end or st[1] - base == len(runs) - 1:
+                st[2] = cut_to
+                break
+            st[1] += 1
+            st[2] = runs[st[1] - base][0]
+
+    def compute(self, window_s: float = None, threshold: float = None) -> float:
         """
-        Returnează PERCLOS ca procent din cadrul ferestrei.
-        Dacă buffer-ul e gol, returnează 0.0.
+        Returnează PERCLOS ca procent din timpul acoperit de fereastră: timpul cu
+        EAR < threshold (implicit ultimul prag dat la update) în fereastra window_s
+        (implicit cea principală). Fără eșantioane sau fără prag → 0.0.
         """
-        if not self.buffer:
+        threshold = threshold if threshold is not None else self.threshold
+        if threshold is None:
             return 0.0
-        return (sum(self.buffer) / len(self.buffer)) * 100.0
+        hist = self._state[float(window_s if window_s is not None else self.window_s)][0]
+        return hist.fraction_below(threshold) * 100.0
+
+    def compute_all(self, threshold: float = None) -> dict:
+        #PERCLOS pentru fiecare fereastră: {durată_s: procent}.
+        return {w: self.compute(w, threshold) for w in self.windows}
+
+    def compute_variants(self, ear_open: float, levels=(0.7, 0.8), window_s: float = None) -> dict:
+        """
+        Variante P70 / P80: procentul de timp cu ochiul închis cel puțin `level`,
+        adică EAR < ear_open * (1 - level), pentru EAR-ul ochiului deschis calibrat.
+        """
+        return {f"P{int(round(level * 100))}": self.compute(window_s, ear_open * (1.0 - level))
+                for level in levels}
+
+    def ear_quantile(self, q: float, window_s: float = None) -> float:
+        #Cuantila q a EAR-ului pe fereastră (ex. 0.5 = mediana).
+        return self._state[float(window_s if window_s is not None else self.window_s)][0].quantile(q)
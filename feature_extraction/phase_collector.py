@@ -0,0 +1,44 @@
+# feature_extraction/phase_collector.py
+"""
+Colectorul unei faze de calibrare, alimentat direct din fluxul de cadre: fiecare
+cadru analizat ajunge o singură dată, cu timestamp-ul lui, fără fire care
+interoghează periodic valorile curente. Durata fazei se măsoară pe ceasul
+cadrelor, deci rezultatul e același la redarea unei înregistrări.
+"""
+
+
+class PhaseCollector:
+    def __init__(self, duration_s, extract, on_done=None):
+        """
+        duration_s – durata fazei (s, ceasul cadrelor), de la primul cadru primit
+        extract    – funcție ctx → valoare; None = cadrul nu intră în eșantion (ex. fără față)
+        on_done    – apelată o dată, cu colectorul, când faza s-a încheiat
+        """
+        self.duration_s = duration_s
+        self.extract = extract
+        self.on_done = on_done
+        self.times = []
+        self.values = []
+        self.done = False
+        self._t0 = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def feed(self, ctx) -> bool:
+        #Un cadru din flux; returnează True la cadrul care încheie faza.
+        if self.done:
+            return False
+        t = ctx.timestamp
+        if self._t0 is None:
+            self._t0 = t
+        if t - self._t0 >= self.duration_s:
+            self.done = True
+            if self.on_done:
+                self.on_done(self)
+            return True
+        value = self.extract(ctx)
+        if value is not None:
+            self.times.append(t)
+            self.values.append(value)
+        return False
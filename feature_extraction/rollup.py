@@ -0,0 +1,154 @@
+# feature_extraction/rollup.py
+"""
+Istoric pe mai multe rezoluții pentru trendurile lungi (ore de condus). Fiecare
+eșantion per cadru se agregă în găleți de 1 s, 1 min și 10 min (număr, sumă,
+min, max); fiecare nivel e un buffer circular prealocat, deci memoria e fixă.
+
+O interogare pe un orizont (ex. „ultimul minut”, „ultima oră”) folosește cel mai
+grosier nivel care are încă cel puțin min_points găleți în orizont, deci costul
+e O(mărimea nivelului), indiferent câte cadre au fost.
+"""
+import math
+
+import numpy as np
+
+from feature_extraction.logic import FatigueRiskLevel
+
+# (rezoluție în secunde, număr de găleți): 1 h la 1 s, 24 h la 1 min, 7 zile la 10 min
+DEFAULT_TIERS = ((1.0, 3600), (60.0, 1440), (600.0, 1008))
+
+
+class RollupTier:
+    #Un nivel: găleți de resolution_s secunde, ultimele `capacity` păstrate.
+    def __init__(self, resolution_s: float, capacity: int):
+        self.resolution_s = float(resolution_s)
+        self.capacity = int(capacity)
+        self._bucket = np.zeros(self.capacity, dtype=np.int64)     # floor(t / rezoluție)
+        self._count = np.zeros(self.capacity, dtype=np.int64)
+        self._sum = np.zeros(self.capacity, dtype=np.float64)
+        self._min = np.zeros(self.capacity, dtype=np.float64)
+        self._max = np.zeros(self.capacity, dtype=np.float64)
+        self.clear()
+
+    def clear(self):
+        self._pos = -1          # slotul găleții curente
+        self._size = 0
+        self._last = None       # indexul găleții curente
+
+    def __len__(self):
+        return self._size
+
+    def add(self, t: float, value: float) -> bool:
+        #Adaugă eșantionul; returnează True când începe o găleată nouă (cea anterioară s-a închis).
+        b = int(math.floor(t / self.resolution_s))
+        closed = False
+        if b != self._last:
+            if self._last is not None and b < self._last:
+                # ceasul sursei a luat-o de la capăt: istoricul vechi nu mai e comparabil
+                self.clear()
+            closed = self._last is not None
+            self._pos = (self._pos + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+            self._last = b
+            self._bucket[self._pos] = b
+            self._count[self._pos] = 0
+            self._sum[self._pos] = 0.0
+            self._min[self._pos] = value
+            self._max[self._pos] = value
+        p = self._pos
+        self._count[p] += 1
+        self._sum[p] += value
+        if value < self._min[p]:
+            self._min[p] = value
+        if value > self._max[p]:
+            self._max[p] = value
+        return closed
+
+    def window(self, t0: float) -> dict:
+        """
+        Gălețile care încep la t ≥ t0 (plus cea care îl conține), în ordine cronologică:
+        t (mijlocul găleții), count, mean, min, max.
+        """
+        idx = (self._pos - self._size + 1 + np.arange(self._size)) % self.capacity
+        keep = idx[self._bucket[idx] >= math.floor(t0 / self.resolution_s)]
+        count = self._count[keep]
+        return {
+            't': (self._bucket[keep] + 0.5) * self.resolution_s,
+            'count': count,
+            'mean': self._sum[keep] / np.maximum(count, 1),
+            'min': self._min[keep],
+            'max': self._max[keep],
+        }
+
+
+class RollupHistory:
+    def __init__(self, tiers=DEFAULT_TIERS, min_points: int = 30):
+        """
+        tiers      – (rezoluție s, număr găleți) de la cel mai fin la cel mai grosier
+        min_points – câte găleți trebuie să aibă un orizont ca nivelul să fie folosit
+        """
+        self.tiers = [RollupTier(res, cap) for res, cap in sorted(tiers)]
+        self.min_points = min_points
+        self.last_t = None
+
+    def add(self, t: float, value: float) -> bool:
+        #Eșantion per cadru; returnează True când s-a închis o găleată a nivelului fin.
+        self.last_t = t
+        closed = [tier.add(t, value) for tier in self.tiers]
+        return closed[0]
+
+    def reset(self):
+        for tier in self.tiers:
+            tier.clear()
+        self.last_t = None
+
+    def tier_for(self, horizon_s: float) -> RollupTier:
+        #Cel mai grosier nivel cu cel puțin min_points găleți în orizont (implicit cel mai fin).
+        best = self.tiers[0]
+        for tier in self.tiers:
+            if horizon_s / tier.resolution_s >= self.min_points:
+                best = tier
+        return best
+
+    def window(self, horizon_s: float, now: float = None) -> dict:
+        #Gălețile din ultimele horizon_s secunde (vezi RollupTier.window).
+        now = self.last_t if now is None else now
+        tier = self.tier_for(horizon_s)
+        if now is None:
+            return tier.window(0.0)         # istoric gol
+        return tier.window(now - horizon_s)
+
+    def stats(self, horizon_s: float, now: float = None) -> dict:
+        #Număr, medie, min și max pe orizont.
+        w = self.window(horizon_s, now)
+        n = int(w['count'].sum())
+        if n == 0:
+            return {'count': 0, 'mean': 0.0, 'min': 0.0, 'max': 0.0}
+        return {
+            'count': n,
+            'mean': float((w['mean'] * w['count']).sum() / n),
+            'min': float(w['min'].min()),
+            'max': float(w['max'].max()),
+        }
+
+    def trend(self, horizon_s: float, now: float = None) -> float:
+        """
+        Panta (unități / secundă) pe orizont: regresie pe mediile găleților,
+        ponderate cu numărul de eșantioane; 0.0 sub 3 găleți.
+        """
+        w = self.window(horizon_s, now)
+        if len(w['t']) < 3:
+            return 0.0
+        weights = w['count'].astype(np.float64)
+        t = w['t'] - w['t'][0]
+        sw = weights.sum()
+        mt = (weights * t).sum() / sw
+        mv = (weights * w['mean']).sum() / sw
+        var = (weights * (t - mt) ** 2).sum()
+        if var <= 0:
+            return 0.0
+        return float((weights * (t - mt) * (w['mean'] - mv)).sum() / var)
+
+    def risk(self, horizon_s: float, now: float = None) -> FatigueRiskLevel:
+        #Nivelul de risc al scorului mediu pe orizont.
+        return FatigueRiskLevel.classify(self.stats(horizon_s, now)['mean'])
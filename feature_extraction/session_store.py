@@ -0,0 +1,143 @@
+# feature_extraction/session_store.py
+"""
+Istoricul metricilor unei sesiuni cu memorie fixă, oricât ar dura monitorizarea:
+
+  • RingBuffer    – ultimele N eșantioane (t, valoare) într-un tablou NumPy prealocat
+  • StreamingStats – sumarul întregii sesiuni: număr, medie, min / max și percentile
+                    dintr-o histogramă cu bin-uri fixe (schiță, eroare ≤ o lățime de bin)
+  • SessionStore  – câte un RingBuffer + StreamingStats pentru fiecare serie (scor, EAR, …)
+"""
+import numpy as np
+
+# Intervalul schiței de percentile per serie; valorile din afara lui merg în bin-ul de capăt
+DEFAULT_RANGES = {
+    'score': (0.0, 100.0),
+    'ear': (0.0, 0.5),
+    'mar': (0.0, 1.5),
+    'pitch': (-90.0, 90.0),
+    'perclos': (0.0, 100.0),
+}
+SKETCH_BINS = 1000
+
+
+class RingBuffer:
+    #Ultimele `capacity` eșantioane (t, valoare), prealocate; append în O(1).
+    def __init__(self, capacity: int, dtype=np.float64):
+        self.capacity = int(capacity)
+        self._t = np.zeros(self.capacity, dtype=np.float64)
+        self._v = np.zeros(self.capacity, dtype=dtype)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, t: float, value: float):
+        self._t[self._next] = t
+        self._v[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def clear(self):
+        self._next = 0
+        self._size = 0
+
+    def _order(self, n):
+        start = (self._next - n) % self.capacity
+        return (start + np.arange(n)) % self.capacity
+
+    def last(self, n: int = None):
+        #Ultimele n eșantioane în ordine cronologică, ca (timpi, valori) — copii.
+        n = self._size if n is None else min(int(n), self._size)
+        idx = self._order(n)
+        return self._t[idx], self._v[idx]
+
+    def since(self, t0: float):
+        #Eșantioanele cu t ≥ t0, în ordine cronologică.
+        t, v = self.last()
+        keep = t >= t0
+        return t[keep], v[keep]
+
+
+class StreamingStats:
+    #Sumarul unei serii pe toată sesiunea, în memorie fixă.
+    def __init__(self, lo: float, hi: float, bins: int = SKETCH_BINS):
+        self.lo = lo
+        self.hi = hi
+        self.width = (hi - lo) / bins
+        self.hist = np.zeros(bins, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        self.hist[:] = 0
+        self.count = 0
+        self.mean = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def add(self, value: float):
+        value = float(value)
+        if not np.isfinite(value):
+            return
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        b = int((value - self.lo) / self.width)
+        self.hist[min(max(b, 0), len(self.hist) - 1)] += 1
+
+    def percentile(self, q: float) -> float:
+        #Percentila q (0–100), interpolată în bin și limitată la [min, max].
+        if not self.count:
+            return 0.0
+        cum = np.cumsum(self.hist)
+        target = q / 100.0 * self.count
+        i = min(int(np.searchsorted(cum, target)), len(self.hist) - 1)
+        prev = cum[i - 1] if i else 0
+        frac = (target - prev) / self.hist[i] if self.hist[i] else 0.0
+        value = self.lo + (i + frac) * self.width
+        return min(max(value, self.min), self.max)
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            'max': self.max if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+        }
+
+
+class SessionStore:
+    def __init__(self, recent_samples: int = 18000, ranges: dict = None, bins: int = SKETCH_BINS):
+        """
+        recent_samples – câte eșantioane brute se păstrează per serie (ex. 10 min la 30 FPS)
+        ranges         – serie → (min, max) pentru schița de percentile (implicit DEFAULT_RANGES)
+        """
+        self.ranges = dict(ranges or DEFAULT_RANGES)
+        self.recent = {name: RingBuffer(recent_samples) for name in self.ranges}
+        self.totals = {name: StreamingStats(lo, hi, bins) for name, (lo, hi) in self.ranges.items()}
+
+    def add(self, t: float, **values):
+        #Un cadru: add(t, score=…, ear=…); seriile necunoscute se ignoră, None = lipsă.
+        for name, value in values.items():
+            if value is None or name not in self.recent:
+                continue
+            self.recent[name].append(t, value)
+            self.totals[name].add(value)
+
+    def series(self, name: str, n: int = None):
+        #Eșantioanele brute recente ale seriei, ca (timpi, valori).
+        return self.recent[name].last(n)
+
+    def summary(self, name: str) -> dict:
+        #Sumarul seriei pe toată sesiunea (vezi StreamingStats.as_dict).
+        return self.totals[name].as_dict()
+
+    def reset(self):
+        for buf in self.recent.values():
+            buf.clear()
+        for st in self.totals.values():
+            st.reset()
@@ -0,0 +1,116 @@
+# feature_extraction/trend.py
+"""
+Regresie liniară incrementală (pantă prin cele mai mici pătrate) pe un flux
+(t, valoare). Ține sumele curente Σw, Σwt, Σwv, Σwt², Σwtv, deci panta se
+obține în O(1) la fiecare eșantion, fără np.polyfit pe tot istoricul.
+
+Două moduri:
+  • fereastră – ultimele `max_samples` eșantioane și/sau ultimele `horizon_s` secunde;
+                rezultatul e identic cu np.polyfit pe aceeași fereastră
+  • uitare exponențială – `half_life_s`: un eșantion vechi de half_life_s contează pe jumătate
+"""
+import collections
+import math
+
+# La câte eșantioane sumele ferestrei se recalculează exact (anulează erorile de rotunjire)
+RESYNC_EVERY = 4096
+
+
+class OnlineTrend:
+    def __init__(self, horizon_s: float = None, max_samples: int = None, half_life_s: float = None):
+        """
+        horizon_s   – fereastra în secunde (None = fără limită de timp)
+        max_samples – fereastra în eșantioane (None = fără limită de număr)
+        half_life_s – uitare exponențială; exclusiv cu fereastra
+        """
+        if half_life_s is not None and (horizon_s is not None or max_samples is not None):
+            raise ValueError("half_life_s nu se combină cu horizon_s / max_samples")
+        self.horizon_s = horizon_s
+        self.max_samples = max_samples
+        self.half_life_s = half_life_s
+        self.reset()
+
+    def reset(self):
+        self._samples = collections.deque()     # (t, v) în fereastră; gol în modul cu uitare
+        self._t_ref = None      # timpii se țin relativ la t_ref (precizie numerică)
+        self._last_t = None
+        self._sw = self._st = self._sv = self._stt = self._stv = 0.0
+        self._since_resync = 0
+
+    def __len__(self):
+        return len(self._samples) if self.half_life_s is None else int(self._sw > 0)
+
+    def _add(self, t, v, w=1.0):
+        self._sw += w
+        self._st += w * t
+        self._sv += w * v
+        self._stt += w * t * t
+        self._stv += w * t * v
+
+    def _shift(self, d):
+        # Mută originea timpului cu d secunde: t' = t - d
+        self._stv -= d * self._sv
+        self._stt -= 2.0 * d * self._st - d * d * self._sw
+        self._st -= d * self._sw
+        self._t_ref += d
+
+    def _resync(self):
+        # Sume recalculate exact din fereastră, cu originea pe primul eșantion
+        self._sw = self._st = self._sv = self._stt = self._stv = 0.0
+        self._t_ref = self._samples[0][0] if self._samples else self._t_ref
+        for t, v in self._samples:
+            self._add(t - self._t_ref, v)
+        self._since_resync = 0
+
+    def update(self, t: float, value: float) -> float:
+        #Adaugă eșantionul (t în secunde) și returnează panta curentă (unități / secundă).
+        if self._last_t is not None and t < self._last_t:
+            # ceasul sursei a luat-o de la capăt: eșantioanele vechi nu mai ies din fereastră
+            self.reset()
+        if self._t_ref is None:
+            self._t_ref = t
+        if self.half_life_s is not None:
+            if self._last_t is not None and t > self._last_t:
+                decay = math.exp(-math.log(2.0) * (t - self._last_t) / self.half_life_s)
+                self._sw *= decay
+                self._st *= decay
+                self._sv *= decay
+                self._stt *= decay
+                self._stv *= decay
+            self._last_t = t
+            if t - self._t_ref > 10.0 * self.half_life_s:
+                self._shift(t - self._t_ref)
+            self._add(t - self._t_ref, value)
+            return self.slope
+
+        self._last_t = t
+        self._samples.append((t, value))
+        self._add(t - self._t_ref, value)
+        while self._samples and (
+                (self.max_samples is not None and len(self._samples) > self.max_samples) or
+                (self.horizon_s is not None and self._samples[0][0] < t - self.horizon_s)):
+            t_old, v_old = self._samples.popleft()
+            self._add(t_old - self._t_ref, v_old, -1.0)
+        self._since_resync += 1
+        if self._since_resync >= RESYNC_EVERY:
+            self._resync()
+        return self.slope
+
+    @property
+    def slope(self) -> float:
+        #Panta dreptei v ≃ m·t + b pe fereastră; 0.0 sub 3 eșantioane sau fără variație în t.
+        if self.half_life_s is None and len(self._samples) < 3:
+            return 0.0
+        den = self._sw * self._stt - self._st * self._st
+        if den <= 1e-12 * max(self._sw * self._stt, 1e-300):
+            return 0.0
+        return (self._sw * self._stv - self._st * self._sv) / den
+
+    def value_at(self, t: float) -> float:
+        #Valoarea dreptei de regresie la momentul t.
+        if self._sw <= 0:
+            return 0.0
+        m = self.slope
+        mean_t = self._st / self._sw
+        mean_v = self._sv / self._sw
+        return mean_v + m * (t - self._t_ref - mean_t)
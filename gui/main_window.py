@@ -10,22 +10,19 @@ import numpy as np
 from PIL import Image, ImageTk
 import time
 import traceback
-from collections import deque
 import json
-import threading
-import math
-
-from feature_extraction.metrics import (
-    normalize_ear, normalize_mar,
-    normalize_perclos, normalize_micro, normalize_pitch
-)
 
 from feature_extraction.calibrator_full import CalibratorFull
 from feature_extraction.logic import FatigueRiskLevel, TrendLevel
-from feature_extraction.microsleep import MicroSleepDetector
-from feature_extraction.ear import calculate_ear
-from feature_extraction.mar import calculate_mar
-from feature_extraction.pitch import calculate_head_pitch
+from pipeline.engine import Pipeline, FunctionStage, FrameContext
+from pipeline.stages import build_stages
+from feature_extraction.session_store import SessionStore
+from capture.frame_buffer import CaptureThread, DROP_OLDEST
+from capture.roi_tracker import FaceRoiTracker
+from capture.camera_settings import CameraSettings
+from capture.watchdog import CameraWatchdog, CONNECTED, STALLED, RECONNECTING
+from feature_extraction.landmark_service import LandmarkService, DEFAULT_MAX_FRAME_BYTES
+from feature_extraction.inference_scheduler import InferenceScheduler
 
 class MainWindow:
 
@@ -42,8 +39,14 @@ class MainWindow:
             self.blink_count = 0
             self.yawn_count = 0
             self.head_down_count = 0
-            self.attention_scores = []
+            self.session_store.reset()
             self.start_time = time.time()
+            self.capture_stats_start = self.capture.stats()
+            self.camera_stats_start = self.camera.stats.as_dict()
+            self.latency_sum_ms = 0.0
+            self.latency_max_ms = 0.0
+            self.latency_frames = 0
+            self.incidents_start = len(self.watchdog.incidents) if self.watchdog else 0
             
             # Ascunde și curăță rezumatul la început
             self.label_summary.config(text="")
@@ -52,6 +55,8 @@ class MainWindow:
         else:
             self.button_monitor.config(text="▶️ Pornește monitorizarea")
             print("⛔ Monitorizarea a fost OPRITĂ.")
+            # cadrele încă în procesare nu mai aparțin sesiunii
+            self.lm_cutoff_seq = self.lm_last_seq
 
             # Calcul și afișare REZUMAT
             durata_secunde = int(time.time() - self.start_time) if self.start_time else 0
@@ -59,21 +64,52 @@ class MainWindow:
             secunde = durata_secunde % 60
             durata_format = f"{minute} min {secunde} sec"
 
-            scor_med = int(sum(self.attention_scores) / len(self.attention_scores)) if self.attention_scores else 0
+            scor = self.session_store.summary('score')
+            scor_med = int(scor['mean'])
             pct_fata = int((self.frames_with_face / self.total_frames) * 100) if self.total_frames else 0
+            cap = self.capture.stats()
+            cap = {k: v - self.capture_stats_start.get(k, 0) for k, v in cap.items()}
+            cam = self.camera.stats.as_dict()
+            pierdute_cam = (cam['dropped'] + cam['incomplete'] -
+                            self.camera_stats_start.get('dropped', 0) -
+                            self.camera_stats_start.get('incomplete', 0))
+            lat_med = self.latency_sum_ms / self.latency_frames if self.latency_frames else 0.0
+            incidente = self.watchdog.incidents[self.incidents_start:] if self.watchdog else []
+            clipiri = self.blink_detector.stats()
+            perclos_ferestre = ", ".join(f"{w / 60:g} min {p:.1f}%"
+                                         for w, p in self.perclos.compute_all().items())
+            # P70 / P80 față de EAR-ul ochiului deschis din calibrare (din aceeași histogramă)
+            ear_open = getattr(self.calibrator, 'ear_open', None)
+            if ear_open:
+                variante = self.perclos.compute_variants(float(np.mean(ear_open)))
+                perclos_ferestre += " | " + ", ".join(f"{k} {v:.1f}%" for k, v in variante.items())
+            downtime = sum(i['downtime_s'] for i in incidente)
+            orizont = self.scoring.trend_long_s
+            risc_lung = self.scoring.history.risk(orizont)
+            etape = " · ".join(f"{nume} {r['mean_ms']:.1f}"
+                               for nume, r in self.pipeline.report().items())
 
             rezumat = f"""📈 REZUMAT SESIUNE
     ────────────────────────────────────
     📅 Durată monitorizare:    {durata_format}
     🧍 Față detectată:         {pct_fata}% din timp
     👁️ Număr ochi închiși:     {self.blink_count}
+    😉 Clipiri:                {clipiri.count} ({clipiri.rate_per_min:.0f}/min, medie {clipiri.mean_duration_s * 1000:.0f} ms, p90 {clipiri.p90_duration_s * 1000:.0f} ms)
     👄 Căscat detectat:        {self.yawn_count} ori
     ↙️ Cap plecat:             {self.head_down_count} evenimente
-    🧠 Scor mediu atenție:     {scor_med}%
+    🧠 Scor mediu atenție:     {scor_med}% (p90 {scor['p90']:.0f}%, max {scor['max']:.0f}%)
+    📉 Trend {orizont / 60:g} min:          {self.scoring.history.trend(orizont) * 60:+.2f}%/min (risc mediu: {risc_lung.label})
     ⚠️ Micro-adormiri:         {self.microsleep_detector.count}
+    😴 PERCLOS:                {perclos_ferestre}
+    🎞️ Cadre capturate:        {cap['captured']} (pierdute {cap['dropped']}, analizate {cap['consumed']})
+    📉 Pierdute de cameră:     {pierdute_cam}
+    ⏱️ Latență medie / max:    {lat_med:.0f} / {self.latency_max_ms:.0f} ms
+    🧩 Timp per etapă (ms):    {etape}
+    🔌 Reconectări cameră:     {len(incidente)} (întrerupere totală {downtime:.1f} s)
     ────────────────────────────────────"""
             print("📤 Trimitem acest rezumat în UI:")
             print(rezumat)
+            print(self.pipeline.format_report())
             print("📋 Etichetă existentă?", hasattr(self, "label_summary"))
             self.label_summary.config(text="")            # curăță dacă era ceva
             self.frame_summary.grid()                     # forțează afișarea
@@ -112,6 +148,14 @@ class MainWindow:
         self.camera.set_pixel_format(fmt)
         messagebox.showinfo("Pixel Format", f"Format pixel: {fmt}")
 
+    def apply_acquisition_profile(self, *args):
+        profil = self.profile_var.get()
+        depth = self.camera.set_acquisition_profile(profil)
+        if depth is None:
+            messagebox.showinfo("Profil achiziție", f"Profil: {profil}\nAdâncimea cozii nu este disponibilă")
+        else:
+            messagebox.showinfo("Profil achiziție", f"Profil: {profil}\nAdâncime coadă driver: {depth} buffere")
+
     def apply_resolution(self, *args):
         w = int(self.width_entry.get())
         h = int(self.height_entry.get())
@@ -172,30 +216,52 @@ class MainWindow:
 
         try:
             self.camera.set_frame_rate(fps)
-            # etează cadrele consecutive pentru detectarea căscatului
-            durata_cascat = 0.6  # secunde 
-            mar_frames = max(2, int(durata_cascat * fps))
-            self.alert_logic.mar_consec_frames = mar_frames
-            print(f"[INFO] mar_consec_frames setat la {mar_frames} (FPS actual: {fps})")
+            mar_frames = self.update_mar_frames(fps)
             messagebox.showinfo("FPS", f"FPS setat la {fps}\nCadre consecutive pentru căscat: {mar_frames}")
         except Exception as e:
             messagebox.showerror("Eroare la setarea FPS-ului", str(e))
 
+    def update_mar_frames(self, fps):
+        # etează cadrele consecutive pentru detectarea căscatului
+        durata_cascat = 0.6  # secunde 
+        mar_frames = max(2, int(durata_cascat * fps))
+        self.alert_logic.mar_consec_frames = mar_frames
+        print(f"[INFO] mar_consec_frames setat la {mar_frames} (FPS actual: {fps})")
+        return mar_frames
+
+    def apply_all_settings(self, *args):
+        # Format, rezoluție, offset și FPS aplicate împreună, cu o singură repornire a stream-ului
+        try:
+            settings = CameraSettings(
+                pixel_format=self.pix_fmt_var.get(),
+                width=int(self.width_entry.get()),
+                height=int(self.height_entry.get()),
+                offset_x=int(self.offset_x_entry.get()),
+                offset_y=int(self.offset_y_entry.get()),
+                fps=float(self.fps_scale.get())
+            )
+            pauza = self.camera.apply(settings)
+        except ValueError as e:
+            messagebox.showerror("Setări invalide", str(e))
+            return
+        self.update_current_res_label()
+        self.update_mar_frames(settings.fps)
+        messagebox.showinfo("Setări cameră", f"Setări aplicate.\nStream întrerupt: {pauza * 1000:.0f} ms")
+
     def __init__(self, camera, face_detector, alert_logic, config, calibrator, perclos):
-        self.pitch_ema = None
         self.total_frames = 0
         self.frames_with_face = 0
         self.blink_count = 0
         self.yawn_count = 0
         self.head_down_count = 0
-        self.attention_scores = []
         self.start_time = None
-        self.fatigue_history = deque(maxlen=600)  
+        self.capture_stats_start = {}
+        self.camera_stats_start = {}
+        self.incidents_start = 0
+        self.latency_sum_ms = 0.0
+        self.latency_max_ms = 0.0
+        self.latency_frames = 0     # cadre ajunse în sink-ul UI (numitorul latenței medii)
         self.micro_sleep_count = 0 
-        self.score_buffer = deque(maxlen=8)
-        self.prev_risk = None
-        self.ema_score       = None    
-        self.ema_alpha       = 0.4     # 0.4 înseamnă 40% din raw_score la fiecare pas
         self.last_ui_update  = 0.0
         print(">>> MainWindow.__init__ start")
         self.camera = camera
@@ -205,6 +271,48 @@ class MainWindow:
         self.calibrator = calibrator
         self.perclos = perclos
 
+        # Firul de captură umple un buffer circular; bucla Tk ia doar cel mai nou cadru
+        capture_cfg = self.config.get('capture', {})
+        self.capture = CaptureThread(
+            camera,
+            buffer_size=capture_cfg.get('buffer_size', 4),
+            policy=capture_cfg.get('policy', DROP_OLDEST)
+        )
+        self.capture.start()
+
+        # Watchdog: reconectează camera în fundal când stream-ul se blochează
+        wd_cfg = dict(self.config.get('watchdog') or {})
+        self.watchdog = None
+        self.camera_state_shown = None
+        if wd_cfg.pop('enabled', True) and getattr(camera, 'can_reconnect', False):
+            self.watchdog = CameraWatchdog(camera, **wd_cfg)
+            self.watchdog.start()
+
+        # Inferență FaceMesh în procese separate (opțional); altfel rulează pe firul Tk
+        lm_cfg = dict(self.config.get('landmark_service') or {})
+        self.landmark_service = None
+        self.lm_last_seq = -1       # ultimul cadru trimis la inferență
+        self.lm_cutoff_seq = -1     # rezultatele până la el (inclusiv) sunt de dinainte de oprire
+        if lm_cfg.pop('enabled', False):
+            # memoria partajată trebuie să încapă cel mai mare cadru al senzorului (RGB)
+            sensor_size = getattr(camera, 'sensor_size', None)
+            if sensor_size and 'max_frame_bytes' not in lm_cfg:
+                lm_cfg['max_frame_bytes'] = max(int(sensor_size[0]) * int(sensor_size[1]) * 3,
+                                                DEFAULT_MAX_FRAME_BYTES)
+            self.landmark_service = LandmarkService(detector_kwargs=self.config.get('face_mesh'), **lm_cfg)
+
+        # Inferență doar pe cadrele cheie, landmark-uri extrapolate pe restul (doar pe firul Tk)
+        sched_cfg = dict(self.config.get('inference_scheduler') or {})
+        self.inference_scheduler = None
+        if sched_cfg.pop('enabled', False) and self.landmark_service is None:
+            self.inference_scheduler = InferenceScheduler(face_detector, **sched_cfg)
+
+        # ROI hardware care urmărește fața (opțional, din settings.yaml)
+        roi_cfg = dict(self.config.get('roi_tracking') or {})
+        self.roi_tracker = None
+        if roi_cfg.pop('enabled', False):
+            self.roi_tracker = FaceRoiTracker(camera, **roi_cfg)
+
         self.simple_calibrator   = self.calibrator
         # vom popula “avansat” doar dacă există JSON
         self.advanced_calibrator = None
@@ -245,12 +353,27 @@ class MainWindow:
             mar_frames = max(2, int(durata_cascat * fps_actual))
             self.alert_logic.mar_consec_frames = mar_frames
             print(f"[INIT] mar_consec_frames inițializat la {mar_frames} (FPS actual: {fps_actual})")
-            microsleep_time = self.config['thresholds'].get('MICRO_SLEEP_TIME', 1.5)
-            self.microsleep_detector = MicroSleepDetector(microsleep_time, self.max_fps)
         except Exception as e:
             print(f"Eroare la preluarea FPS max din camera: {e}")
             self.max_fps = 30.0
 
+        # Pipeline-ul de analiză: aceleași etape ca în benchmark, plus ROI, calibrare și sink-ul UI
+        stages = build_stages(self.config, self.inference_scheduler or face_detector, self.alert_logic,
+                              calibrator=lambda: self.calibrator, perclos=self.perclos, fps=self.max_fps)
+        stages.insert(1, FunctionStage("roi", self.update_roi))
+        stages.append(FunctionStage("calibration", self.feed_calibration))
+        stages.append(FunctionStage("ui", self.update_ui))
+        self.pipeline = Pipeline(stages)
+        temporal = self.pipeline.stage("temporal")
+        self.microsleep_detector = temporal.microsleep
+        self.blink_detector = temporal.blink
+        self.scoring = self.pipeline.stage("scoring")
+
+        # Istoricul sesiunii în memorie fixă: ultimele recent_s secunde brute + sumar pe toată sesiunea
+        history_cfg = self.config.get('history') or {}
+        self.session_store = SessionStore(int(history_cfg.get('recent_s', 600) * self.max_fps))
+        self.log_max_lines = history_cfg.get('log_max_lines', 500)
+
         # Creare fereastră
         self.root.title("Monitorizare oboseală șofer")
         self.root.geometry("1280x800+50+50")
@@ -433,6 +556,19 @@ class MainWindow:
             ttk.Button(fps_frame, text="Aplică FPS", command=self.apply_fps)\
                 .grid(row=0, column=2, padx=10)
 
+            ttk.Button(fps_frame, text="Aplică tot (o singură repornire)", command=self.apply_all_settings)\
+                .grid(row=1, column=0, columnspan=3, sticky="we", pady=(8,0))
+
+            # Profil de achiziție: latență minimă (NewestOnly) sau fără pierderi (coadă adâncă)
+            ttk.Label(fps_frame, text="Profil:").grid(row=2, column=0, sticky="w", pady=(8,0))
+            self.profile_var = tk.StringVar(
+                value=getattr(self.camera, 'profile', self.config.get('camera', {}).get('profile', 'lowest_latency')))
+            ttk.Combobox(fps_frame, textvariable=self.profile_var, state="readonly",
+                        values=["lowest_latency", "no_drops", "default"], width=14)\
+                .grid(row=2, column=1, sticky="w", pady=(8,0))
+            ttk.Button(fps_frame, text="Aplică profil", command=self.apply_acquisition_profile)\
+                .grid(row=2, column=2, padx=10, pady=(8,0))
+
             # ─── Rezoluție actuală ─────────────────────────────────────────────────────
             self.label_current_res = ttk.Label(frame_config, text="Rezoluție actuală: -- x --")
             self.label_current_res.grid(row=5, column=0, columnspan=2, sticky="w")
@@ -466,7 +602,10 @@ class MainWindow:
             self.button_monitor.grid(row=0, column=0, columnspan=2, sticky='we', pady=5)
 
             self.label_face_detected = ttk.Label(frame_controls, text="Față detectată: Nu")
-            self.label_face_detected.grid(row=1, column=0, columnspan=2, sticky='w', pady=(0,8))
+            self.label_face_detected.grid(row=1, column=0, sticky='w', pady=(0,8))
+
+            self.label_camera_state = ttk.Label(frame_controls, text="")
+            self.label_camera_state.grid(row=1, column=1, sticky='e', pady=(0,8))
 
             ttk.Separator(frame_controls, orient='horizontal')\
                 .grid(row=2, column=0, columnspan=2, sticky='we', pady=8)
@@ -634,19 +773,24 @@ class MainWindow:
         print(">>> mainloop exited")
 
 
-    def compute_trend(self):
-        # dacă nu avem minim 3 puncte, nu încercăm
-        if len(self.fatigue_history) < 3:
-            return 0.0
-        # ts = [t0=0, t1, t2, …], vs = [score0, score1, …]
-        t0 = self.fatigue_history[0][0]
-        ts = np.array([t - t0 for t,_ in self.fatigue_history])
-        vs = np.array([v    for _,v in self.fatigue_history])
-        # m = pantă din regresie vs ≃ m·ts + b
-        m, _ = np.polyfit(ts, vs, 1)
-        return m  # % puncte per secundă
-    
-    def _update_fatigue_ui(self, smooth_score, risk, trend, slope):
+    def log_microsleep_end(self):
+        # Durata reală a micro-adormirii, când aceasta se încheie
+        event = self.microsleep_detector.ended
+        if event is None:
+            return
+        motiv = " (față pierdută)" if event.face_lost else ""
+        self.append_log(f"Micro-adormire încheiată: {event.duration:.1f} s{motiv}")
+
+    def append_log(self, text):
+        # Jurnalul păstrează doar ultimele log_max_lines linii
+        timestamp = time.strftime('%H:%M:%S')
+        self.text_log.insert(tk.END, f"[{timestamp}] {text}\n")
+        lines = int(self.text_log.index('end-1c').split('.')[0]) - 1
+        if lines > self.log_max_lines:
+            self.text_log.delete("1.0", f"{lines - self.log_max_lines + 1}.0")
+        self.text_log.see(tk.END)
+
+    def _update_fatigue_ui(self, smooth_score, risk, trend, slope, slope_long):
         # bara de Fatigue
         self.pb_fatigue.configure(
             style = f"{risk.name}.Horizontal.TProgressbar",
@@ -658,187 +802,156 @@ class MainWindow:
         )
         # eticheta de Trend
         self.lbl_trend.configure(
-            text  = f"{trend.label} ({slope*60:+.1f}%/min)",
+            text  = f"{trend.label} ({slope*60:+.1f}%/min, "
+                    f"{self.scoring.trend_long_s / 60:g} min: {slope_long*60:+.1f}%/min)",
             style = f"{trend.name}.TLabel"
         )
 
+    def update_camera_state(self):
+        # Starea publicată de watchdog; eticheta se schimbă doar la tranziții
+        if self.watchdog is None or self.watchdog.state == self.camera_state_shown:
+            return
+        self.camera_state_shown = self.watchdog.state
+        text = {
+            CONNECTED: "📷 Cameră: conectată",
+            STALLED: "⚠️ Cameră: stream blocat",
+            RECONNECTING: "🔁 Cameră: reconectare…",
+        }[self.camera_state_shown]
+        self.label_camera_state.config(text=text)
+
     def process_frame(self):
-        frame = self.camera.get_frame()
-        if frame is None:
-            print("⚠️ Nu s-a primit niciun frame de la cameră")
-            self.root.after(200, self.process_frame)  # încerci din nou, dar cu întârziere
+        self.update_camera_state()
+        record = self.capture.get_latest()
+        if record is None:
+            # niciun cadru nou în buffer — revenim curând, fără să blocăm UI-ul
+            self.root.after(5, self.process_frame)
             return
+        frame = record.image
         img = Image.fromarray(frame)
         img = img.resize((640, 480))  # scalare forțată pentru vizibilitate
         imgtk = ImageTk.PhotoImage(img)
         self.video_label.imgtk = imgtk
         self.video_label.config(image=imgtk)
 
-        if self.monitoring_active:
-            try:
-                detections = []
-                print("🔍 Încep analiza frame-ului...")
-                width, height = frame.shape[1], frame.shape[0]
-                landmarks = self.face_detector.find_landmarks(frame)
-                face_detected = landmarks is not None
-                self.total_frames += 1
-                if face_detected:
-                    self.frames_with_face += 1
-                # ─── 1) Detectare față și calcul metrici ─────────────────
-                from feature_extraction.ear import LEFT_EYE_INDEXES, RIGHT_EYE_INDEXES
-
-                if face_detected:
-                    # față detectată → calculăm EAR, MAR, Pitch
-                    ear_l = calculate_ear(landmarks, LEFT_EYE_INDEXES, width, height)
-                    ear_r = calculate_ear(landmarks, RIGHT_EYE_INDEXES, width, height)
-                    ear   = (ear_l + ear_r) / 2.0
-                    mar   = calculate_mar(landmarks, width, height)
-                    pitch = calculate_head_pitch(landmarks, width, height)
-
-                    # microsleep (rămâne neschimbat)
-                    try:
-                        ear_thr = getattr(self.calibrator, 'ear_threshold', None) or self.config['thresholds']['EAR']
-                        microsleep_new = self.microsleep_detector.update(ear, ear_thr)
-                        if microsleep_new:
-                            self.micro_sleep_count += 1
-                            timestamp = time.strftime('%H:%M:%S')
-                            self.text_log.insert(tk.END, f"[{timestamp}] ⚠️ MICRO-ADORMIRE DETECTATĂ!\n")
-                            self.text_log.see(tk.END)
-                    except Exception as e_ms:
-                        print("‼️ EROARE în blocul de microsleep:", e_ms, type(e_ms))
-                        traceback.print_exc()
-
-                else:
-                    # nu avem față → afișăm “–” și folosim fallback static
-                    self.label_ear.config(text="👁️ EAR: –")
-                    self.label_mar.config(text="👄 MAR: –")
-                    self.label_pitch.config(text="↙️ Pitch: –°")
-                    ear_thr = getattr(self.calibrator, 'ear_threshold', None) or self.config['thresholds']['EAR']
-                    ear   = ear_thr
-                    mar   = 0
-                    pitch = 0
-
-                # ─── 2) Salvăm ultimele valori pentru UI și PERCLOS ────────
-                self.current_ear   = ear
-                self.current_mar   = mar
-                self.current_pitch = pitch
-                detections        = []
-
-                self.label_face_detected.config(text=f"Față detectată: {'✅' if face_detected else '❌'}", foreground="green" if face_detected else "red")
-                self.label_ear.config(text=f"👁️ EAR: {ear:.2f}")
-                self.label_mar.config(text=f"👄 MAR: {mar:.2f}")
-                self.label_pitch.config(text=f"↙️ Pitch: {pitch:.1f}°")
-
-                # ─── Actualizare PERCLOS ────────────────────────────
-                # selectăm prag adaptiv sau fallback static
-                ear_thr = getattr(self.calibrator, 'ear_threshold', None) or self.config['thresholds']['EAR']
-                self.perclos.update(ear, ear_thr)
-                current_perclos = self.perclos.compute()
-                self.current_perclos = current_perclos
-
-                # Actualizează UI PERCLOS
-                self.lbl_perclos.config(text=f"PERCLOS: {current_perclos:.1f}%")
-                style_name = (
-                    "Perclos.Red.Horizontal.TProgressbar"
-                    if current_perclos >= self.perclos_threshold
-                    else "Perclos.Green.Horizontal.TProgressbar"
-                )
-                self.pb_perclos.config(style=style_name, value=current_perclos)
-                # ─────────────────────────────────────────────────────
-                events = self.alert_logic.evaluate(ear, mar, pitch, bool(detections))
-                print("✅ Evaluare logică completă")
-                 # ─── 1) Normalizează fiecare componentă în [0,1]
-                ear_r = normalize_ear(ear)
-                mar_r = normalize_mar(mar)
-                per_r = normalize_perclos(current_perclos)    # current_perclos e 0–100
-                mic_r = normalize_micro(self.micro_sleep_count)
-                pit_r = normalize_pitch(pitch)
-
-                # ─── 2) Calculează raw_score (0–100) cu detecție de tip calibrator
-                if self.pitch_ema is None:
-                    self.pitch_ema = pitch
-                else:
-                    self.pitch_ema = 0.3 * pitch + 0.7 * self.pitch_ema
-
-                values = (ear, mar, current_perclos, self.pitch_ema)
-                print(f"[DEBUG MODE] using calibrator: {type(self.calibrator).__name__}")
-                if isinstance(self.calibrator, CalibratorFull) and self.calibrator.thresholds and self.calibrator.weights:
-                    # debug praguri
-                    thr = self.calibrator.thresholds
-                    print(f"[DEBUG USED ADV] ear={thr['ear']['enter_hi']}, mar={thr['mar']['enter_hi']}, pitch={thr['pitch']['enter_hi']}")
-                    try:
-                        raw_score = self.calibrator.score_state(values) * 100
-                        if not math.isfinite(raw_score):
-                            raw_score = 0.0
-                    except Exception as e:
-                        print(f"[‼️ SCOR ERROR] {e}")
-                        raw_score = 0.0
-                else:
-                    # debug praguri YAML
-                    y = self.config['thresholds']
-                    raw_score = (
-                        ear_r*0.25 +
-                        mar_r*0.10 +
-                        per_r*0.30 +
-                        mic_r*0.20 +
-                        pit_r*0.15
-                    ) * 100
-
-                # ─── 3) EMA smoothing + override critic
-                if raw_score >= 80:
-                    smooth_score   = raw_score
-                    self.ema_score = raw_score
+        try:
+            if self.monitoring_active:
+                if self.landmark_service is None:
+                    self.analyze_frame(FrameContext(record))
                 else:
-                    if self.ema_score is None:
-                        self.ema_score = raw_score
-                    else:
-                        self.ema_score = (
-                            self.ema_alpha * raw_score +
-                            (1 - self.ema_alpha) * self.ema_score
-                        )
-                    smooth_score = self.ema_score
-
-                # ✅ Salvează scorul în toate cazurile (inclusiv peste 80)
-                self.attention_scores.append(smooth_score)
-
-                # ─── 4) Istoric trend pe baza smooth_score
-                now = time.time()
-                self.fatigue_history.append((now, smooth_score))
-
-                # ─── 5) Trend stabil (regresie liniară)
-                slope = self.compute_trend()
-
-                # ─── 6) Clasificare cu hysteresis
-                risk = FatigueRiskLevel.classify(smooth_score, self.prev_risk)
-                self.prev_risk = risk
-
-                # ─── 7) Clasificare trend
-                trend = TrendLevel.classify(slope)
-
-                # ─── 8) Actualizare UI la maxim 1×/s
-                if now - self.last_ui_update > 1.0:
-                    self._update_fatigue_ui(smooth_score, risk, trend, slope)
-                    self.last_ui_update = now
-                
-                from alerting.notifier import Notifier
-                for event in events:
-                    Notifier.play_alert_sound()
-                    if event == "ochi_inchisi":
-                        self.blink_count += 1
-                    elif event == "cascat":
-                        self.yawn_count += 1
-                    elif event == "cap_plecat":
-                        self.head_down_count += 1
-                    timestamp = time.strftime('%H:%M:%S')
-                    self.text_log.insert(tk.END, f"[{timestamp}] ALERTĂ: {event.upper()}\n")
-                    self.text_log.see(tk.END)
-
-            except Exception as e:
-                print(f"‼️ EROARE în analiza frame-ului: {e}")
-                traceback.print_exc()
-                self.root.after(200, self.process_frame) 
+                    # FaceMesh rulează în procese separate; analizăm rezultatele în ordinea cadrelor.
+                    # Dacă toate sloturile sunt ocupate, cadrul doar se afișează.
+                    seq = self.landmark_service.submit(frame, record.frame_id, meta=record)
+                    if seq is not None:
+                        self.lm_last_seq = seq
+                    self.analyze_landmark_results()
+            elif self.landmark_service is not None:
+                # rezultate rămase de dinainte de oprire — nu le mai analizăm
+                while self.landmark_service.get_result() is not None:
+                    pass
+        except Exception as e:
+            print(f"‼️ EROARE la trimiterea cadrului spre analiză: {e}")
+            traceback.print_exc()
+        finally:
+            # Cadrul următor e deja în buffer (sau va fi) — doar lăsăm Tk să proceseze evenimentele
+            self.root.after(1, self.process_frame)
+
+    def analyze_landmark_results(self):
+        # Rezultatele gata, în ordinea cadrelor; cele trimise înainte de ultima oprire se aruncă
+        result = self.landmark_service.get_result()
+        while result is not None:
+            if result.seq > self.lm_cutoff_seq:
+                self.analyze_frame(FrameContext(result.meta, landmarks=result.landmarks,
+                                                landmarks_ready=True))
+            result = self.landmark_service.get_result()
+
+    def analyze_frame(self, ctx):
+        #Trece cadrul prin pipeline; ultima etapă („ui”) actualizează interfața.
+        try:
+            self.pipeline.process(ctx)
+        except Exception as e:
+            print(f"‼️ EROARE în analiza frame-ului: {e}")
+            traceback.print_exc()
+
+    def update_roi(self, ctx):
+        # ROI-ul hardware urmărește fața; la reprogramare cadrele următoare au altă geometrie,
+        # deci crop-ul de urmărire al detectorului nu mai e valid
+        height, width = ctx.record.image.shape[:2]
+        if self.roi_tracker is not None and self.roi_tracker.update(ctx.landmarks, (width, height)):
+            if self.inference_scheduler is not None:
+                self.inference_scheduler.reset_tracking()
+            elif self.landmark_service is None:
+                self.face_detector.reset_tracking()
+
+    def feed_calibration(self, ctx):
+        # Faza de calibrare în curs primește fiecare cadru analizat
+        on_frame = getattr(self.calibrator, 'on_frame', None)
+        if on_frame is not None:
+            on_frame(ctx)
+
+    def update_ui(self, ctx):
+        #Sink-ul pipeline-ului: contoare, etichete, jurnal și alerte pentru un cadru analizat.
+        self.total_frames += 1
+        if ctx.face:
+            self.frames_with_face += 1
+        if ctx.microsleep_new:
+            self.micro_sleep_count += 1
+            self.append_log("⚠️ MICRO-ADORMIRE DETECTATĂ!")
+        self.log_microsleep_end()
+
+        # ─── Ultimele valori pentru UI și calibrare
+        self.current_ear   = ctx.ear
+        self.current_mar   = ctx.mar
+        self.current_pitch = ctx.pitch
+        self.current_perclos = ctx.perclos
+
+        self.label_face_detected.config(text=f"Față detectată: {'✅' if ctx.face else '❌'}",
+                                        foreground="green" if ctx.face else "red")
+        if ctx.face:
+            self.label_ear.config(text=f"👁️ EAR: {ctx.ear:.2f}")
+            self.label_mar.config(text=f"👄 MAR: {ctx.mar:.2f}")
+            self.label_pitch.config(text=f"↙️ Pitch: {ctx.pitch:.1f}°")
+        else:
+            self.label_ear.config(text="👁️ EAR: –")
+            self.label_mar.config(text="👄 MAR: –")
+            self.label_pitch.config(text="↙️ Pitch: –°")
 
-        self.root.after(33, self.process_frame)
+        # ─── PERCLOS
+        self.lbl_perclos.config(text=f"PERCLOS: {ctx.perclos:.1f}%")
+        style_name = (
+            "Perclos.Red.Horizontal.TProgressbar"
+            if ctx.perclos >= self.perclos_threshold
+            else "Perclos.Green.Horizontal.TProgressbar"
+        )
+        self.pb_perclos.config(style=style_name, value=ctx.perclos)
+
+        # ✅ Salvează scorul în toate cazurile (inclusiv peste 80)
+        self.session_store.add(ctx.timestamp, score=ctx.score, perclos=ctx.perclos,
+                               ear=ctx.ear if ctx.face else None,
+                               mar=ctx.mar if ctx.face else None,
+                               pitch=ctx.pitch if ctx.face else None)
+
+        # ─── Actualizare UI la maxim 1×/s
+        now = time.time()
+        if now - self.last_ui_update > 1.0:
+            self._update_fatigue_ui(ctx.score, ctx.risk, ctx.trend, ctx.slope, ctx.slope_long)
+            self.last_ui_update = now
+
+        from alerting.notifier import Notifier
+        for event in ctx.events:
+            Notifier.play_alert_sound()
+            if event == "ochi_inchisi":
+                self.blink_count += 1
+            elif event == "cascat":
+                self.yawn_count += 1
+            elif event == "cap_plecat":
+                self.head_down_count += 1
+            self.append_log(f"ALERTĂ: {event.upper()}")
+
+        # Latența de la primirea cadrului pe host până la decizie
+        latency_ms = (time.monotonic() - ctx.record.host_time) * 1000.0
+        self.latency_sum_ms += latency_ms
+        self.latency_frames += 1
+        self.latency_max_ms = max(self.latency_max_ms, latency_ms)
 
     def on_calibrate_clicked(self):
         self._prev_monitoring_active = getattr(self, "monitoring_active", False)
@@ -878,16 +991,16 @@ class MainWindow:
     def start_calibration_step(self):
         if self.calib_step == 0:
             messagebox.showinfo("Calibrare", "Pas 1/4: Ține ochii DESCHIȘI, gura închisă și stai nemișcat 6 secunde.")
-            self.calibrator.start_ear_open_calibration(6, lambda: (self.current_ear, self.current_mar), on_done=self.next_calibration_step)
+            self.calibrator.start_phase("ear_open", 6, on_done=self._on_calibration_phase_done)
         elif self.calib_step == 1:
             messagebox.showinfo("Calibrare", "Pas 2/4: Închide OCHII complet și stai nemișcat 4 secunde.")
-            self.calibrator.start_ear_closed_calibration(4, lambda: (self.current_ear, self.current_mar), on_done=self.next_calibration_step)
+            self.calibrator.start_phase("ear_closed", 4, on_done=self._on_calibration_phase_done)
         elif self.calib_step == 2:
             messagebox.showinfo("Calibrare", "Pas 3/4: Ține gura ÎNCHISĂ (nu vorbi) și stai nemișcat 4 secunde.")
-            self.calibrator.start_mar_closed_calibration(4, lambda: (self.current_ear, self.current_mar), on_done=self.next_calibration_step)
+            self.calibrator.start_phase("mar_closed", 4, on_done=self._on_calibration_phase_done)
         elif self.calib_step == 3:
             messagebox.showinfo("Calibrare", "Pas 4/4: Deschide larg gura ca la căscat și stai așa 4 secunde.")
-            self.calibrator.start_mar_open_calibration(4, lambda: (self.current_ear, self.current_mar), on_done=self.next_calibration_step)
+            self.calibrator.start_phase("mar_open", 4, on_done=self._on_calibration_phase_done)
         elif self.calib_step == 4:
             self.calibrator.compute_thresholds()
             ear_thr = self.calibrator.ear_threshold
@@ -900,6 +1013,10 @@ class MainWindow:
             return
     
     
+    def _on_calibration_phase_done(self):
+        # Faza se încheie în pipeline; următorul pas (cu messagebox) rulează separat în bucla Tk
+        self.root.after(0, self.next_calibration_step)
+
     def next_calibration_step(self):
         self.calib_step += 1
         self.start_calibration_step()
@@ -946,15 +1063,7 @@ class MainWindow:
                 f"{title} – {DUR} s\n\n{desc}"
             )
 
-            threading.Thread(
-                target=lambda: self.calibrator.start_collect(
-                    phase,
-                    DUR,
-                    self.get_metrics_callback,
-                    on_done=self._on_advanced_collect_done
-                ),
-                daemon=True
-            ).start()
+            self.calibrator.start_collect(phase, DUR, on_done=self._on_advanced_collect_done)
 
         # Când au fost colectate toate cele 3 stări:
         else:
@@ -984,28 +1093,6 @@ class MainWindow:
         print(f"[ADV] finished collect for step {self.calib_step}")
         self.root.after(0, self.next_advanced_calibration_step)
 
-    def get_current_metrics(self):
-        """Return the current metrics dict for CalibratorFull."""
-        ear   = self.current_ear   if self.current_ear   is not None else 0.0
-        mar   = self.current_mar   if self.current_mar   is not None else 0.0
-        percl = self.perclos.compute()
-        micro = self.micro_sleep_count
-        pitch = getattr(self, 'current_pitch', 0.0)
-        return {
-        'ear': ear,
-        'mar': mar,
-        'perclos': percl,
-        'micro_sleep': micro,
-        'pitch': pitch
-    }
-
-
-    def get_metrics_callback(self):
-        return (self.current_ear,
-                self.current_mar,
-                self.current_perclos,
-                self.current_pitch)
-    
     def save_advanced_calibration_json(self):
         data = self.calibrator.get_advanced_config()  
         with open("config_avansat.json", "w") as f:
@@ -1024,8 +1111,7 @@ class MainWindow:
                 adv = json.load(f)
             self.advanced_calibrator = CalibratorFull()
             t = adv["thresholds"]
-            self.advanced_calibrator.thresholds = t
-            self.advanced_calibrator.weights    = adv["weights"]
+            self.advanced_calibrator.set_custom_config(adv)
             self.advanced_calibrator.ear_threshold   = t["ear"]["enter_hi"]
             self.advanced_calibrator.mar_threshold   = t["mar"]["enter_hi"]
             self.advanced_calibrator.pitch_threshold = t["pitch"]["enter_hi"]
@@ -1058,12 +1144,10 @@ class MainWindow:
         self.blink_count       = 0
         self.yawn_count        = 0
         self.head_down_count   = 0
-        self.attention_scores  = []
+        self.session_store.reset()
         self.micro_sleep_count = 0
-        # reset pentru trend + fatigue history
-        self.fatigue_history.clear()
-        self.prev_risk         = None
-        self.ema_score         = None
+        # starea în timp a pipeline-ului: PERCLOS, micro-adormiri, clipiri, EMA, trend
+        self.pipeline.reset()
         self.current_perclos   = 0.0
         self.current_ear       = None
         self.current_mar       = None
@@ -1115,6 +1199,15 @@ class MainWindow:
 
     def on_closing(self):
         print(">>> on_closing called")
+        # Oprim firul de captură înainte de a elibera camera
+        try:
+            if self.watchdog is not None:
+                self.watchdog.stop()
+            self.capture.stop()
+            if self.landmark_service is not None:
+                self.landmark_service.close()
+        except:
+            pass
         # Eliberare resurse
         try:
             self.camera.release()
@@ -1,5 +1,7 @@
 # main.py
+import argparse
 import os
+import time
 import yaml
 from tkinter import messagebox
 
@@ -10,11 +12,9 @@ base_dir = os.path.dirname(os.path.abspath(__file__))
 print(">>> START main.py")
 print("Base dir:", base_dir)
 
-# Importuri de top-level
-from capture.flir_camera import FlirCamera
-print(">>> imported FlirCamera")
-from feature_extraction.face_mesh import FaceMeshDetector
-print(">>> imported FaceMeshDetector")
+# Importuri de top-level (FlirCamera se importă doar când folosim camera reală)
+from feature_extraction.backends import create_backend
+print(">>> imported create_backend")
 from decision.alert_logic import AlertLogic
 print(">>> imported AlertLogic")
 from gui.main_window import MainWindow
@@ -33,21 +33,77 @@ def load_config(config_path):
     return cfg
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Monitorizare oboseală șofer")
+    parser.add_argument('--replay', help="redă un fișier video / director de imagini în locul camerei")
+    parser.add_argument('--synthetic', action='store_true', help="folosește generatorul sintetic de cadre")
+    parser.add_argument('--all-cameras', action='store_true',
+                        help="procesează toate camerele FLIR în paralel, fără GUI")
+    return parser.parse_args()
+
+
+def open_frame_source(args, config):
+    # Sursa de cadre: cameră FLIR (implicit), replay sau generator sintetic
+    if args.replay:
+        from capture.replay_source import ReplaySource
+        return ReplaySource(args.replay, realtime=True, loop=True)
+    if args.synthetic:
+        from capture.replay_source import SyntheticSource
+        return SyntheticSource(realtime=True)
+    from capture.flir_camera import FlirCamera
+    print(">>> imported FlirCamera")
+    # Profilul de achiziție: lowest_latency (implicit) / no_drops / default
+    cam_cfg = config.get('camera', {})
+    return FlirCamera(profile=cam_cfg.get('profile', 'lowest_latency'), serial=cam_cfg.get('serial'))
+
+
+def run_all_cameras(config):
+    # Câte un worker per cameră; rezultatele agregate se afișează o dată pe secundă
+    from capture.camera_manager import CameraManager
+    cam_cfg = config.get('camera', {})
+    # fiecare worker își creează detectorul după secțiunea face_mesh (backend, crop, rezoluție)
+    manager = CameraManager(detector_factory=lambda: create_backend(**(config.get('face_mesh') or {})))
+    manager.open_flir(cam_cfg.get('serials'), profile=cam_cfg.get('profile', 'lowest_latency'))
+    if not manager.sources:
+        messagebox.showerror("Eroare", "Nicio cameră FLIR nu a putut fi deschisă.")
+        return
+    manager.start()
+    try:
+        while True:
+            time.sleep(1.0)
+            stats = manager.aggregator.stats()
+            for camera, result in manager.aggregator.latest().items():
+                ear = f"{result.ear:.3f}" if result.face else "–"
+                print(f"📷 {camera}: {stats[camera]['fps']:.1f} FPS, față={result.face}, "
+                      f"EAR={ear}, procesare {result.processing_ms:.0f} ms")
+    except KeyboardInterrupt:
+        print("⛔ Oprire la cererea utilizatorului")
+    finally:
+        manager.release()
+
+
 def main():
     print(">>> ENTER main()")    # **nou**
+    args = parse_args()
     # Path configurare și model relatate la base_dir
     config_path = os.path.join(base_dir, 'config', 'settings.yaml')
     config = load_config(config_path)
+    if args.all_cameras:
+        run_all_cameras(config)
+        return
 
     # Inițializează componentele
-    camera = FlirCamera()
-    face_detector = FaceMeshDetector()
+    camera = open_frame_source(args, config)
+    face_detector = create_backend(**(config.get('face_mesh') or {}))
 
     # Instanțiere Calibrator pentru praguri adaptive
     calibrator = Calibrator()
     
     # Instanțiere PERCLOS pentru măsurarea procentului de ochi închiși
-    perclos = PERCLOS(window_s=60, sample_rate_hz=20.0)
+    # Fereastra e măsurată pe timestamp-urile cadrelor, nu pe numărul de eșantioane
+    perclos_cfg = config.get('perclos') or {}
+    perclos = PERCLOS(window_s=perclos_cfg.get('window_s', 60),
+                      extra_windows_s=perclos_cfg.get('extra_windows_s') or ())
 
     # Inițializează logica de alertă
     ear_thresh = config['thresholds']['EAR']
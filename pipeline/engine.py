@@ -0,0 +1,322 @@
+# pipeline/engine.py
+"""
+Motorul pipeline-ului de analiză: o listă de etape (Stage) prin care trece un
+FrameContext. Fiecare etapă e cronometrată automat, deci se vede exact unde se
+duce bugetul unui cadru.
+
+Două moduri de rulare, cu aceleași etape:
+  • process(ctx) – toate etapele pe firul apelantului (ex. bucla Tk, benchmark)
+  • start(source, groups) – grupuri de etape pe fire separate, legate prin cozi
+    limitate (BoundedQueue); un grup lent nu blochează captura, cadrele în plus
+    se aruncă și se numără
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+
+# Histograma latențelor per etapă: bin-uri de 0.1 ms până la 500 ms (percentile fără istoric)
+LATENCY_BIN_MS = 0.1
+LATENCY_MAX_MS = 500.0
+
+
+@dataclass
+class FrameContext:
+    #Datele unui cadru, completate pe rând de etape.
+    record: Any                                 # FrameRecord de la sursă
+    landmarks: Any = None
+    landmarks_ready: bool = False               # landmark-urile au fost deja calculate (ex. LandmarkService)
+    face: bool = False
+    ear: float = 0.0
+    ear_left: float = 0.0
+    ear_right: float = 0.0
+    mar: float = 0.0
+    pitch: float = 0.0
+    ear_threshold: float = 0.0
+    perclos: float = 0.0
+    microsleep_new: bool = False
+    microsleep_ended: Any = None                # MicroSleepEvent încheiat la acest cadru
+    microsleep_count: int = 0
+    blink: Any = None                           # BlinkEvent încheiat la acest cadru
+    blink_stats: Any = None
+    raw_score: float = 0.0
+    score: float = 0.0
+    risk: Any = None
+    trend: Any = None
+    slope: float = 0.0                          # trendul scorului pe termen scurt (/s)
+    slope_long: float = 0.0                     # trendul pe termen lung (/s)
+    events: list = field(default_factory=list)
+    timings: dict = field(default_factory=dict)  # etapă → ms
+
+    @property
+    def timestamp(self) -> float:
+        return self.record.timestamp
+
+
+class Stage:
+    """
+    O etapă a pipeline-ului. process(ctx) completează contextul și îl returnează;
+    None oprește cadrul (nu mai trece prin etapele următoare).
+    """
+    name = "stage"
+
+    def process(self, ctx: FrameContext) -> Optional[FrameContext]:
+        return ctx
+
+    def reset(self):
+        #Starea temporală a etapei, la o sesiune nouă.
+        pass
+
+    def close(self):
+        pass
+
+
+class FunctionStage(Stage):
+    #Etapă dintr-o funcție fn(ctx); dacă fn returnează None, contextul merge mai departe.
+    def __init__(self, name, fn):
+        self.name = name
+        self.fn = fn
+
+    def process(self, ctx):
+        result = self.fn(ctx)
+        return ctx if result is None else result
+
+
+class StageStats:
+    #Timpi per etapă: număr, medie, maxim și percentile dintr-o histogramă fixă.
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.hist = np.zeros(int(LATENCY_MAX_MS / LATENCY_BIN_MS), dtype=np.int64)
+
+    def add(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.hist[min(int(ms / LATENCY_BIN_MS), len(self.hist) - 1)] += 1
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        i = int(np.searchsorted(np.cumsum(self.hist), q / 100.0 * self.count))
+        return (min(i, len(self.hist) - 1) + 1) * LATENCY_BIN_MS
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max_ms,
+        }
+
+
+class BoundedQueue:
+    """
+    Coadă limitată între două grupuri de etape. La coadă plină cadrul cel mai
+    vechi se aruncă (analiza rămâne pe cadrele noi) și se numără în `dropped`;
+    cu block=True producătorul așteaptă (ex. analiză offline, fără pierderi),
+    dar renunță la cadru când stop_event e setat (consumatorul s-a oprit).
+    """
+    def __init__(self, maxsize=2, block=False, stop_event=None):
+        self._q = queue.Queue(maxsize=maxsize)
+        self.block = block
+        self.stop_event = stop_event
+        self.dropped = 0
+
+    def put(self, item):
+        if self.block:
+            while True:
+                try:
+                    self._q.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    if self.stop_event is not None and self.stop_event.is_set():
+                        return
+        while True:
+            try:
+                self._q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._q.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=0.1):
+        try:
+            return self._q.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class Pipeline:
+    def __init__(self, stages):
+        self.stages = list(stages)
+        names = [s.name for s in self.stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Nume de etape duplicate: {names}")
+        self.stats = {s.name: StageStats() for s in self.stages}
+        self.frames = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._threads = []
+        self._queues = []
+        self._stop_event = threading.Event()
+        self._error = None          # prima excepție de pe un fir, ridicată din wait() / stop()
+
+    def stage(self, name) -> Stage:
+        for s in self.stages:
+            if s.name == name:
+                return s
+        raise KeyError(name)
+
+    def _run_stages(self, ctx, stages):
+        for s in stages:
+            t0 = time.perf_counter()
+            ctx = s.process(ctx)
+            ms = (time.perf_counter() - t0) * 1000.0
+            with self._lock:
+                self.stats[s.name].add(ms)
+            if ctx is None:
+                return None
+            ctx.timings[s.name] = ms
+        return ctx
+
+    def process(self, ctx: FrameContext) -> Optional[FrameContext]:
+        #Trece contextul prin toate etapele, pe firul curent.
+        self.frames += 1
+        ctx = self._run_stages(ctx, self.stages)
+        if ctx is not None:
+            self.completed += 1
+        return ctx
+
+    # ─── Mod cu fire separate ──────────────────────────────────────────────────
+    def start(self, source, groups=None, queue_size=2, block=False):
+        """
+        Rulează pipeline-ul pe fire: source() returnează următorul FrameContext
+        (None = încă nimic, ridică StopIteration la final). groups = liste de nume
+        de etape, câte un fir per grup, în ordine (implicit un singur grup).
+        block – cozile așteaptă în loc să arunce cadre (vezi BoundedQueue)
+        """
+        groups = groups or [[s.name for s in self.stages]]
+        order = [name for group in groups for name in group]
+        if order != [s.name for s in self.stages]:
+            raise ValueError("Grupurile trebuie să acopere toate etapele, în ordine")
+        self._stop_event.clear()
+        self._error = None
+        self._queues = [BoundedQueue(queue_size, block, self._stop_event) for _ in groups]
+        self._threads = [threading.Thread(target=self._feed, args=(source, self._queues[0]),
+                                          name="pipeline-source", daemon=True)]
+        for i, group in enumerate(groups):
+            out_q = self._queues[i + 1] if i + 1 < len(groups) else None
+            stages = [self.stage(name) for name in group]
+            self._threads.append(threading.Thread(target=self._work, args=(stages, self._queues[i], out_q),
+                                                  name=f"pipeline-{group[0]}", daemon=True))
+        for t in self._threads:
+            t.start()
+
+    def _fail(self, err):
+        # O excepție pe un fir oprește tot pipeline-ul; cozile blocate renunță la stop
+        with self._lock:
+            if self._error is None:
+                self._error = err
+        self._stop_event.set()
+
+    def _raise_error(self):
+        with self._lock:
+            err, self._error = self._error, None
+        if err is not None:
+            raise err
+
+    def _feed(self, source, out_q):
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    ctx = source()
+                except StopIteration:
+                    out_q.put(StopIteration)
+                    return
+                if ctx is not None:
+                    with self._lock:
+                        self.frames += 1
+                    out_q.put(ctx)
+        except Exception as err:
+            self._fail(err)
+
+    def _work(self, stages, in_q, out_q):
+        try:
+            while not self._stop_event.is_set():
+                ctx = in_q.get()
+                if ctx is None:
+                    continue
+                if ctx is StopIteration:
+                    if out_q is not None:
+                        out_q.put(StopIteration)
+                    else:
+                        self._stop_event.set()
+                    return
+                ctx = self._run_stages(ctx, stages)
+                if ctx is None:
+                    continue
+                if out_q is not None:
+                    out_q.put(ctx)
+                else:
+                    with self._lock:
+                        self.completed += 1
+        except Exception as err:
+            self._fail(err)
+
+    def wait(self, timeout=None):
+        """
+        Așteaptă epuizarea sursei (sau timeout); returnează True dacă s-a terminat.
+        Dacă sursa sau o etapă a ridicat o excepție pe fir, aceasta se ridică aici.
+        """
+        done = self._stop_event.wait(timeout)
+        self._raise_error()
+        return done
+
+    def stop(self, timeout=2.0):
+        #Oprește firele; ridică excepția unui fir, dacă wait() nu a ridicat-o deja.
+        self._stop_event.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+        self._raise_error()
+
+    @property
+    def dropped(self) -> int:
+        #Cadre aruncate de cozile dintre grupuri.
+        return sum(q.dropped for q in self._queues)
+
+    def reset(self):
+        for s in self.stages:
+            s.reset()
+
+    def close(self):
+        try:
+            self.stop()
+        finally:
+            for s in self.stages:
+                s.close()
+
+    # ─── Raport ────────────────────────────────────────────────────────────────
+    def report(self) -> dict:
+        #Statisticile per etapă (nume → dict), în ordinea etapelor.
+        with self._lock:
+            return {name: st.as_dict() for name, st in self.stats.items()}
+
+    def format_report(self) -> str:
+        rows = self.report()
+        total = sum(r['mean_ms'] for r in rows.values())
+        lines = [f"{'etapă':<12}{'medie':>9}{'p50':>8}{'p99':>8}{'max':>9}{'pondere':>9}"]
+        for name, r in rows.items():
+            share = r['mean_ms'] / total * 100.0 if total else 0.0
+            lines.append(f"{name:<12}{r['mean_ms']:>9.2f}{r['p50_ms']:>8.1f}{r['p99_ms']:>8.1f}"
+                         f"{r['max_ms']:>9.1f}{share:>8.0f}%")
+        return "\n".join(lines)
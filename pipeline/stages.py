@@ -0,0 +1,239 @@
+# pipeline/stages.py
+"""
+Etapele pipeline-ului de oboseală, fără dependențe de interfață:
+
+    landmarks → features → temporal → scoring → decision → (sink-uri)
+
+Pragul EAR se citește la fiecare cadru printr-o funcție (ear_threshold), ca
+pragul calibrat să se aplice imediat, fără a reconstrui pipeline-ul.
+"""
+import math
+
+from feature_extraction.blink import BlinkDetector
+from feature_extraction.calibrator_full import CalibratorFull
+from feature_extraction.features import compute_features
+from feature_extraction.inference_scheduler import InferenceScheduler
+from feature_extraction.logic import FatigueRiskLevel, TrendLevel
+from feature_extraction.metrics import (
+    normalize_ear, normalize_mar, normalize_perclos, normalize_micro, normalize_pitch,
+    normalize_blink_duration, normalize_blink_rate
+)
+from feature_extraction.microsleep import MicroSleepDetector
+from feature_extraction.perclos import PERCLOS
+from feature_extraction.rollup import RollupHistory, DEFAULT_TIERS
+from feature_extraction.trend import OnlineTrend
+from pipeline.engine import Stage
+
+# Ponderile scorului de oboseală când nu există calibrare avansată
+DEFAULT_WEIGHTS = {
+    'ear': 0.25, 'mar': 0.10, 'perclos': 0.30, 'micro': 0.20, 'pitch': 0.15,
+    'blink_duration': 0.0, 'blink_rate': 0.0,
+}
+
+
+class LandmarkStage(Stage):
+    #Landmark-uri din detector (sau InferenceScheduler); sare peste cadrele deja analizate.
+    name = "landmarks"
+
+    def __init__(self, detector, ear_threshold=None):
+        self.detector = detector
+        self.ear_threshold = ear_threshold
+
+    def process(self, ctx):
+        if ctx.landmarks_ready:
+            return ctx
+        frame = ctx.record.image
+        if isinstance(self.detector, InferenceScheduler):
+            if self.ear_threshold is not None:
+                self.detector.ear_threshold = self.ear_threshold()
+            ctx.landmarks = self.detector.find_landmarks(frame, ctx.timestamp)
+        else:
+            ctx.landmarks = self.detector.find_landmarks(frame)
+        ctx.landmarks_ready = True
+        return ctx
+
+    def reset(self):
+        if hasattr(self.detector, 'reset_tracking'):
+            self.detector.reset_tracking()
+
+
+class FeatureStage(Stage):
+    #EAR / MAR / pitch într-un singur apel vectorizat; fără față → EAR = prag, MAR = pitch = 0.
+    name = "features"
+
+    def __init__(self, ear_threshold):
+        self.ear_threshold = ear_threshold
+
+    def process(self, ctx):
+        ctx.ear_threshold = self.ear_threshold()
+        ctx.face = ctx.landmarks is not None
+        if ctx.face:
+            height, width = ctx.record.image.shape[:2]
+            ctx.ear, ctx.ear_left, ctx.ear_right, ctx.mar, ctx.pitch = compute_features(
+                ctx.landmarks, width, height)
+        else:
+            ctx.ear, ctx.mar, ctx.pitch = ctx.ear_threshold, 0.0, 0.0
+        return ctx
+
+
+class TemporalStage(Stage):
+    #Starea în timp: PERCLOS, micro-adormiri și clipiri, pe timestamp-urile cadrelor.
+    name = "temporal"
+
+    def __init__(self, perclos, microsleep, blink):
+        self.perclos = perclos
+        self.microsleep = microsleep
+        self.blink = blink
+        self.microsleeps = 0        # micro-adormiri în sesiunea curentă
+
+    def process(self, ctx):
+        ts = ctx.timestamp
+        if ctx.face:
+            ctx.microsleep_new = self.microsleep.update(ctx.ear, ctx.ear_threshold, timestamp=ts)
+            ctx.blink = self.blink.update(ctx.ear, ctx.ear_threshold, ts)
+        else:
+            self.microsleep.update_no_face(ts)
+            self.blink.update_no_face()
+        ctx.microsleep_ended = self.microsleep.ended
+        if ctx.microsleep_new:
+            self.microsleeps += 1
+        ctx.microsleep_count = self.microsleeps
+        ctx.blink_stats = self.blink.stats()
+        # fără față nu știm starea ochilor: timpul contează ca ochi deschiși, la orice prag
+        self.perclos.update(ctx.ear if ctx.face else None, ctx.ear_threshold, timestamp=ts)
+        ctx.perclos = self.perclos.compute()
+        return ctx
+
+    def reset(self):
+        self.perclos.reset()
+        self.microsleep.reset()
+        self.blink.clear()
+        self.microsleeps = 0
+
+
+class ScoringStage(Stage):
+    """
+    Scorul de oboseală (0–100): cu calibrarea avansată (CalibratorFull) dacă e
+    disponibilă, altfel suma ponderată a componentelor normalizate. Apoi EMA
+    (scorurile ≥ 80 trec direct), nivelul de risc, trendul pe termen scurt (OnlineTrend,
+    O(1) per cadru) și cel lung din istoricul agregat (RollupHistory), o dată pe secundă.
+    """
+    name = "scoring"
+
+    def __init__(self, calibrator, weights=None, ema_alpha=0.4, trend_short_s=60, trend_long_s=3600,
+                 tiers=DEFAULT_TIERS):
+        """
+        calibrator – funcție care returnează calibratorul activ (se poate schimba din UI)
+        """
+        self.calibrator = calibrator
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.ema_alpha = ema_alpha
+        self.trend_short_s = trend_short_s
+        self.trend_long_s = trend_long_s
+        self.trend_short = OnlineTrend(horizon_s=trend_short_s)
+        self.history = RollupHistory(tiers)
+        self.reset()
+
+    def reset(self):
+        self.ema_score = None
+        self.pitch_ema = None
+        self.prev_risk = None
+        self.slope_long = 0.0
+        self.trend_short.reset()
+        self.history.reset()
+
+    def raw_score(self, ctx):
+        if self.pitch_ema is None:
+            self.pitch_ema = ctx.pitch
+        else:
+            self.pitch_ema = 0.3 * ctx.pitch + 0.7 * self.pitch_ema
+
+        calibrator = self.calibrator()
+        if isinstance(calibrator, CalibratorFull) and calibrator.thresholds and calibrator.weights:
+            try:
+                score = calibrator.score_state((ctx.ear, ctx.mar, ctx.perclos, self.pitch_ema)) * 100
+                return score if math.isfinite(score) else 0.0
+            except Exception as e:
+                print(f"[‼️ SCOR ERROR] {e}")
+                return 0.0
+
+        w = self.weights
+        blink = ctx.blink_stats
+        dur_r = normalize_blink_duration(blink.mean_duration_s) if blink and blink.rate_per_min else 0.0
+        rate_r = normalize_blink_rate(blink.rate_per_min) if blink else 0.0
+        return (
+            normalize_ear(ctx.ear) * w['ear'] +
+            normalize_mar(ctx.mar) * w['mar'] +
+            normalize_perclos(ctx.perclos) * w['perclos'] +     # perclos e 0–100
+            normalize_micro(ctx.microsleep_count) * w['micro'] +
+            normalize_pitch(ctx.pitch) * w['pitch'] +
+            dur_r * w['blink_duration'] +
+            rate_r * w['blink_rate']
+        ) * 100
+
+    def process(self, ctx):
+        ctx.raw_score = self.raw_score(ctx)
+        # EMA smoothing + override critic
+        if ctx.raw_score >= 80 or self.ema_score is None:
+            self.ema_score = ctx.raw_score
+        else:
+            self.ema_score = self.ema_alpha * ctx.raw_score + (1 - self.ema_alpha) * self.ema_score
+        ctx.score = self.ema_score
+
+        # trend, % puncte per secundă: pe termen scurt regresie incrementală pe toate
+        # scorurile din ultimele trend_short_s secunde, pe termen lung pe mediile de 1 min
+        ctx.slope = self.trend_short.update(ctx.timestamp, ctx.score)
+        if self.history.add(ctx.timestamp, ctx.score):
+            self.slope_long = self.history.trend(self.trend_long_s)
+        ctx.slope_long = self.slope_long
+        ctx.risk = FatigueRiskLevel.classify(ctx.score, self.prev_risk)
+        self.prev_risk = ctx.risk
+        ctx.trend = TrendLevel.classify(ctx.slope)
+        return ctx
+
+
+class DecisionStage(Stage):
+    #Alertele AlertLogic (ochi închiși / căscat / cap plecat) pe timpul cadrului.
+    name = "decision"
+
+    def __init__(self, alert_logic):
+        self.alert_logic = alert_logic
+
+    def process(self, ctx):
+        ctx.events = self.alert_logic.evaluate(ctx.ear, ctx.mar, ctx.pitch, False, timestamp=ctx.timestamp)
+        return ctx
+
+
+def build_stages(config, detector, alert_logic, calibrator=None, perclos=None, fps=30.0):
+    """
+    Etapele standard (fără sink-uri) din settings.yaml.
+    calibrator – funcție care returnează calibratorul activ; fără el pragul EAR vine din config
+    perclos    – instanța PERCLOS existentă (implicit una nouă din secțiunea perclos)
+    fps        – rata nominală a sursei (doar pentru estimarea duratei primului cadru)
+    """
+    def ear_threshold():
+        cal = calibrator() if calibrator is not None else None
+        return getattr(cal, 'ear_threshold', None) or config['thresholds']['EAR']
+
+    if perclos is None:
+        perclos_cfg = config.get('perclos') or {}
+        perclos = PERCLOS(window_s=perclos_cfg.get('window_s', 60), sample_rate_hz=fps,
+                          extra_windows_s=perclos_cfg.get('extra_windows_s') or ())
+    microsleep = MicroSleepDetector(config['thresholds'].get('MICRO_SLEEP_TIME', 1.5), fps)
+    blink_cfg = dict(config.get('blink') or {})
+    weights = {
+        'blink_duration': blink_cfg.pop('weight_duration', 0.0),
+        'blink_rate': blink_cfg.pop('weight_rate', 0.0),
+    }
+    blink = BlinkDetector(**blink_cfg)
+    weights.update(config.get('score_weights') or {})
+    trend_cfg = config.get('trend') or {}
+    return [
+        LandmarkStage(detector, ear_threshold),
+        FeatureStage(ear_threshold),
+        TemporalStage(perclos, microsleep, blink),
+        ScoringStage(calibrator or (lambda: None), weights,
+                     trend_short_s=trend_cfg.get('short_horizon_s', 60),
+                     trend_long_s=trend_cfg.get('long_horizon_s', 3600)),
+        DecisionStage(alert_logic),
+    ]
@@ -0,0 +1,44 @@
+# test_alert_ceas.py
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from decision.alert_logic import AlertLogic
+
+FPS = 30.0
+logica = AlertLogic(
+    ear_thresh=0.25, ear_frames=3,
+    mar_thresh=0.5, mar_frames=3,
+    pitch_thresh=20, pitch_frames=2,
+    alert_cooldown=5.0
+)
+
+
+def ruleaza(t0, n, ear=0.30, pitch=0.0):
+    # n cadre de la t0 (ceasul camerei); returnează toate evenimentele
+    evenimente = []
+    with redirect_stdout(io.StringIO()):
+        for i in range(n):
+            evenimente += logica.evaluate(ear, 0.2, pitch, False, timestamp=t0 + i / FPS)
+    return evenimente
+
+
+# 1) ochi închiși la minutul 10 al sesiunii: alertă, apoi cooldown
+ok_inainte = "ochi_inchisi" in ruleaza(600.0, 10, ear=0.1)
+# 2) reconectare: ceasul camerei o ia de la 0, ochii se închid din nou
+ok_dupa = "ochi_inchisi" in ruleaza(0.0, 10, ear=0.1)
+# 3) cap plecat început înainte de reconectare: durata se măsoară doar pe noul ceas
+ruleaza(100.0, 30, pitch=30.0)
+ok_cap_reset = "cap_plecat" not in ruleaza(1.0, 30, pitch=30.0)     # 1 s pe noul ceas
+ok_cap = "cap_plecat" in ruleaza(2.0, 60, pitch=30.0)               # peste 2 s pe noul ceas
+
+if ok_inainte and ok_dupa and ok_cap_reset and ok_cap:
+    print("✅ PAS: alertele și capul plecat funcționează după ce ceasul camerei o ia de la capăt")
+else:
+    print(f"❌ EȘEC: inainte={ok_inainte}, dupa={ok_dupa}, cap_reset={ok_cap_reset}, cap={ok_cap}")
@@ -0,0 +1,72 @@
+# test_backends.py
+import sys
+import os
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from benchmark import compare_detectors
+from capture.replay_source import SyntheticSource
+from feature_extraction.backends import create_backend
+from feature_extraction.features import compute_features
+from feature_extraction.landmarks import DLIB68_INDEX, MEDIAPIPE_INDEX, LandmarkArray
+
+W, H = 1440, 1080
+rng = np.random.default_rng(3)
+mp_arr = rng.random((478, 3)).astype(np.float32)
+
+# 1) Aceleași puncte ale schemei comune, în numerotarea dlib → aceleași metrici
+dlib_arr = rng.random((68, 3)).astype(np.float32)
+dlib_arr[:, 2] = 0.0
+for src, dst in ((MEDIAPIPE_INDEX.eyes, DLIB68_INDEX.eyes), (MEDIAPIPE_INDEX.mouth, DLIB68_INDEX.mouth),
+                 (MEDIAPIPE_INDEX.nose, DLIB68_INDEX.nose), (MEDIAPIPE_INDEX.chin, DLIB68_INDEX.chin)):
+    dlib_arr[dst, :2] = mp_arr[src, :2]
+f_mp = compute_features(LandmarkArray(mp_arr), W, H)
+f_dlib = compute_features(LandmarkArray(dlib_arr, DLIB68_INDEX), W, H)
+ok_schema = np.allclose(f_mp, f_dlib, atol=1e-5)
+
+# 2) Fabrica de backend-uri
+lite = create_backend('mediapipe_lite', tracking=False)
+ok_lite = lite.name == 'mediapipe_lite' and lite.index is MEDIAPIPE_INDEX
+lite.close()
+try:
+    create_backend('inexistent')
+    ok_necunoscut = False
+except ValueError:
+    ok_necunoscut = True
+try:
+    create_backend('dlib', dlib_model='/nu/exista.dat').close()
+    ok_dlib = False
+except RuntimeError:
+    ok_dlib = True      # dlib sau modelul lipsesc → eroare clară, nu un crash la primul cadru
+
+
+# 3) Comparația: referința are acord 100%, al doilea detector un decalaj constant de EAR
+class DetectorFix:
+    def __init__(self, arr, index):
+        self.lm = LandmarkArray(arr, index)
+
+    def find_landmarks(self, frame):
+        return self.lm
+
+    def close(self):
+        pass
+
+
+frames, rows = compare_detectors(SyntheticSource(n_frames=20), {
+    'ref': DetectorFix(mp_arr, MEDIAPIPE_INDEX),
+    'dlib': DetectorFix(dlib_arr, DLIB68_INDEX),
+})
+ok_comp = (frames == 20 and [r['name'] for r in rows] == ['ref', 'dlib']
+           and all(r['agree'] == 1.0 and r['p50'] <= r['p99'] for r in rows)
+           and rows[1]['ear_err'] < 1e-5)
+
+if ok_schema and ok_lite and ok_necunoscut and ok_dlib and ok_comp:
+    print("✅ PAS: backend-urile de landmark-uri folosesc aceeași schemă ochi/gură/nas/bărbie")
+else:
+    print(f"❌ EȘEC: schema={ok_schema}, lite={ok_lite}, necunoscut={ok_necunoscut}, "
+          f"dlib={ok_dlib}, comparatie={ok_comp}")
@@ -0,0 +1,76 @@
+# test_blink.py
+import sys
+import os
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.blink import BlinkDetector
+
+PRAG = 0.2
+FPS = 60.0
+
+
+def ear_clipire(t, t0, durata, deschis=0.30, minim=0.08):
+    # Profil triunghiular: închidere în 1/3 din durată, redeschidere în 2/3
+    inchidere = durata / 3.0
+    if t0 <= t < t0 + inchidere:
+        return deschis - (deschis - minim) * (t - t0) / inchidere
+    if t0 + inchidere <= t < t0 + durata:
+        return minim + (deschis - minim) * (t - t0 - inchidere) / (durata - inchidere)
+    return deschis
+
+
+# 120 s: 20 clipiri / minut de 150 ms, apoi o închidere de 2 s (nu e clipire) și o semi-clipire
+rng = np.random.default_rng(4)
+starturi = np.arange(1.0, 120.0, 3.0)
+ts = np.arange(0, 125.0, 1.0 / FPS)
+det = BlinkDetector(window_s=60.0)
+evenimente = []
+for t in ts:
+    ear = 0.30 + rng.normal(0, 0.003)
+    for s in starturi:
+        if s <= t < s + 0.15:
+            ear = ear_clipire(t, s, 0.15)
+    if 121.0 <= t < 123.0:
+        ear = 0.10                              # micro-adormire, nu clipire
+    if 123.5 <= t < 123.7:
+        ear = 0.215                             # semi-clipire: nu trece sub prag
+    ev = det.update(ear, PRAG, timestamp=t)
+    if ev is not None:
+        evenimente.append(ev)
+    if abs(t - 120.0) < 0.5 / FPS:
+        st = det.stats()
+ok_numar = len(evenimente) == len(starturi)
+# nivelul deschis e 0.23: porțiunea din clipire sub el durează ~ (0.30-0.23)/(0.30-0.08) mai puțin
+durate = np.array([e.duration for e in evenimente])
+ok_durata = np.all((durate > 0.08) & (durate < 0.16))
+ok_faze = all(e.closing_s < e.reopening_s and e.closing_speed > e.reopening_speed for e in evenimente)
+ok_rata = abs(st.rate_per_min - 20.0) <= 1.0
+ok_perc = abs(st.p50_duration_s - np.median(durate)) <= 0.011 and st.p90_duration_s >= st.p50_duration_s
+# memorie fixă: doar clipirile din ultimele 60 s
+ok_memorie = len(det._events) <= 21
+
+# reconectare: ceasul camerei o ia de la 0, tot 20 clipiri / minut timp de 30 s
+total = det.count
+for t in np.arange(0, 30.0, 1.0 / FPS):
+    ear = 0.30 + rng.normal(0, 0.003)
+    for s in np.arange(1.0, 30.0, 3.0):
+        if s <= t < s + 0.15:
+            ear = ear_clipire(t, s, 0.15)
+    det.update(ear, PRAG, timestamp=t)
+st2 = det.stats()
+ok_inapoi = (len(det._events) == 10 and det.count == total + 10 and
+             abs(st2.rate_per_min - 20.0) <= 1.0)
+
+if ok_numar and ok_durata and ok_faze and ok_rata and ok_perc and ok_memorie and ok_inapoi:
+    print(f"✅ PAS: {len(evenimente)} clipiri, {st.rate_per_min:.1f}/min, "
+          f"durată medie {st.mean_duration_s * 1000:.0f} ms")
+else:
+    print(f"❌ EȘEC: numar={ok_numar} ({len(evenimente)}), durata={ok_durata}, faze={ok_faze}, "
+          f"rata={ok_rata} ({st.rate_per_min:.1f}), percentile={ok_perc}, memorie={ok_memorie}, "
+          f"inapoi={ok_inapoi} ({st2.rate_per_min:.1f}/min)")
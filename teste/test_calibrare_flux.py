@@ -0,0 +1,85 @@
+# test_calibrare_flux.py
+import sys
+import os
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.calibrator import Calibrator
+from feature_extraction.calibrator_full import CalibratorFull
+
+FPS = 30.0
+rng = np.random.default_rng(8)
+
+
+def cadru(t, ear, mar, face=True, perclos=0.0, pitch=0.0):
+    # Doar câmpurile din FrameContext folosite de calibrare
+    return SimpleNamespace(timestamp=t, face=face, ear=ear, mar=mar, perclos=perclos, pitch=pitch)
+
+
+# ─── 1) Calibrarea simplă: 4 faze înlănțuite, alimentate cadru cu cadru
+# (ear, mar) per fază; la fiecare al 10-lea cadru fața lipsește
+faze = [("ear_open", 6, 0.30, 0.30), ("ear_closed", 4, 0.10, 0.30),
+        ("mar_closed", 4, 0.30, 0.20), ("mar_open", 4, 0.30, 0.80)]
+cal = Calibrator()
+fire_inainte = threading.active_count()
+pas = {'i': 0}
+
+
+def urmatoarea_faza():
+    pas['i'] += 1
+    if pas['i'] < len(faze):
+        nume, durata, _, _ = faze[pas['i']]
+        cal.start_phase(nume, durata, on_done=urmatoarea_faza)
+
+
+cal.start_phase(faze[0][0], faze[0][1], on_done=urmatoarea_faza)
+fire_in_timpul = threading.active_count()
+t, n = 0.0, 0
+while pas['i'] < len(faze):
+    _, _, ear, mar = faze[pas['i']]
+    fata = n % 10 != 9
+    # fără față EAR-ul e pragul (ca în pipeline); nu trebuie să ajungă în eșantion
+    cal.on_frame(cadru(t, ear + rng.normal(0, 0.002) if fata else 0.2, mar, face=fata))
+    n += 1
+    t = n / FPS
+cal.compute_thresholds()
+
+# fiecare fază: duration * FPS cadre, minus cele fără față (≈ 10%)
+ok_numar = all(abs(len(getattr(cal, f)) - d * FPS * 0.9) <= 3 for f, d, _, _ in faze)
+ok_fara_fata = min(cal.ear_closed) > 0.05 and max(cal.ear_closed) < 0.15
+ok_praguri = abs(cal.ear_threshold - (0.10 + 0.6 * 0.20)) < 0.002 and abs(cal.mar_threshold - 0.56) < 1e-9
+ok_fire = fire_in_timpul == fire_inainte
+
+# ─── 2) CalibratorFull: cele trei stări din același flux, deterministe la reluare
+def ruleaza_full():
+    full = CalibratorFull()
+    stari = [("alert", 0.30, 0.30, 5.0, 2.0), ("moderate", 0.25, 0.45, 20.0, 8.0),
+             ("tired", 0.18, 0.70, 45.0, 15.0)]
+    r = np.random.default_rng(1)
+    n = 0
+    for stare, ear, mar, perclos, pitch in stari:
+        full.start_collect(stare, 10)
+        while full._collector is not None:
+            full.on_frame(cadru(n / FPS, ear + r.normal(0, 0.01), mar, perclos=perclos, pitch=pitch))
+            n += 1
+    full.compute_thresholds_and_weights()
+    return full
+
+
+f1, f2 = ruleaza_full(), ruleaza_full()
+ok_full = (all(len(f1.data[s]) == 10 * FPS for s in f1.STATE_ORDER) and
+           f1.thresholds == f2.thresholds and f1.weights == f2.weights)
+
+if ok_numar and ok_fara_fata and ok_praguri and ok_fire and ok_full:
+    print(f"✅ PAS: calibrare din fluxul de cadre, fără fire — prag EAR {cal.ear_threshold:.3f}, "
+          f"MAR {cal.mar_threshold:.3f}")
+else:
+    print(f"❌ EȘEC: numar={ok_numar} ({[len(getattr(cal, f[0])) for f in faze]}), fara_fata={ok_fara_fata}, "
+          f"praguri={ok_praguri}, fire={ok_fire}, full={ok_full}")
@@ -0,0 +1,67 @@
+# test_calibrator_full.py
+import sys
+import os
+import time
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.calibrator_full import CalibratorFull
+
+
+def scor_referinta(cal, values):
+    # Formula scalară, metrică cu metrică (fără media mobilă)
+    score = 0.0
+    for i, metric in enumerate(cal.metrics_names):
+        val = values[i]
+        if metric == 'pitch':
+            val = max(0.0, val - cal.pitch_baseline)
+        if metric == 'perclos':
+            val = min(val, 100.0)
+        if metric == 'mar' and val < 0.01:
+            val = 0.0
+        t = cal.thresholds[metric]
+        lo, hi = min(t['enter_hi'], t['exit_lo']), max(t['enter_hi'], t['exit_lo'])
+        score += cal.weights[metric] * (0.0 if hi == lo else np.clip((val - lo) / (hi - lo), 0, 1))
+    return score
+
+
+rng = np.random.default_rng(3)
+cal = CalibratorFull()
+# date de calibrare: (ear, mar, perclos, pitch) pentru alert / moderate / tired
+cal.data['alert'] = [(0.30, 0.30, 5.0, 2.0)] * 3 + [(0.31, 0.32, 6.0, 3.0)] * 3
+cal.data['moderate'] = [(0.24, 0.45, 20.0, 8.0)] * 6
+cal.data['tired'] = [(0.18, 0.70, 45.0, 15.0)] * 3 + [(0.20, 0.60, 40.0, 12.0)] * 3
+cal.compute_thresholds_and_weights()
+cal.system_start_time = time.time() - 10.0      # după perioada de pornire
+
+T = 2000
+valori = np.column_stack([rng.uniform(0.1, 0.4, T), rng.uniform(0.0, 1.0, T),
+                          rng.uniform(0.0, 120.0, T), rng.uniform(-10.0, 30.0, T)])
+valori[::7, 1] = 0.005                          # MAR sub 0.01 → 0
+ref = np.array([scor_referinta(cal, v) for v in valori])
+ref_neted = np.array([ref[max(0, i - 4):i + 1].mean() for i in range(T)])
+
+per_cadru = np.array([cal.score_state(tuple(v)) for v in valori])
+lot = cal.score_batch(valori)
+ok_cadru = np.allclose(per_cadru, ref_neted, atol=1e-12)
+ok_lot = np.allclose(lot, ref_neted, atol=1e-12) and np.allclose(cal.score_batch(valori, smooth=False), ref)
+
+# configurație salvată și reîncărcată: același scor
+cal2 = CalibratorFull()
+cal2.set_custom_config(cal.get_advanced_config())
+cal2.pitch_baseline = cal.pitch_baseline
+ok_config = np.allclose(cal2.score_batch(valori), lot)
+
+t0 = time.perf_counter()
+cal.score_batch(np.tile(valori, (50, 1)))
+t_lot = (time.perf_counter() - t0) / (50 * T) * 1e6
+
+if ok_cadru and ok_lot and ok_config:
+    print(f"✅ PAS: CalibratorFull vectorizat = formula scalară; lot {t_lot:.2f} µs/cadru")
+else:
+    print(f"❌ EȘEC: per_cadru={ok_cadru}, lot={ok_lot}, config={ok_config}")
@@ -0,0 +1,58 @@
+# test_camera_manager.py
+import sys
+import os
+import threading
+import time
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from capture.camera_manager import CameraManager
+from capture.replay_source import SyntheticSource
+
+
+class DetectorLent:
+    # Detector fals: „procesează” 20 ms pe cadru, fără să țină GIL-ul (ca MediaPipe)
+    def __init__(self):
+        self.fir = threading.current_thread().name
+
+    def find_landmarks(self, frame):
+        time.sleep(0.02)
+        return None
+
+    def close(self):
+        pass
+
+
+detectoare = []
+
+def fabrica():
+    detector = DetectorLent()
+    detectoare.append(detector)
+    return detector
+
+
+manager = CameraManager(detector_factory=fabrica)
+for nume in ("fata", "cabina", "spate"):
+    manager.add_source(nume, SyntheticSource(width=320, height=240, fps=200))
+manager.start()
+time.sleep(1.0)
+manager.release()
+
+stats = manager.aggregator.stats()
+ultimele = manager.aggregator.latest()
+
+# 1) Fiecare cameră are rezultate proprii, produse pe firul ei
+ok_camere = set(stats) == {"fata", "cabina", "spate"} and all(not r.face for r in ultimele.values())
+ok_fire = sorted(d.fir for d in detectoare) == ["worker-cabina", "worker-fata", "worker-spate"]
+
+# 2) Worker-ii rulează în paralel: fiecare ajunge aproape de 1 / 20 ms = 50 rezultate/s
+ok_paralel = all(s['fps'] > 35 for s in stats.values())
+
+if ok_camere and ok_fire and ok_paralel:
+    print("✅ PAS: CameraManager rulează câte un worker per cameră: " +
+          ", ".join(f"{c} {s['fps']:.0f} FPS" for c, s in stats.items()))
+else:
+    print(f"❌ EȘEC: camere={ok_camere}, fire={ok_fire}, paralel={ok_paralel}, stats={stats}")
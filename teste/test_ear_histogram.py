@@ -0,0 +1,44 @@
+# test_ear_histogram.py
+import sys
+import os
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.perclos import PERCLOS
+
+rng = np.random.default_rng(11)
+fps = 30.0
+ts = np.arange(3600) / fps                      # 2 minute
+ear = rng.uniform(0.05, 0.40, len(ts))
+p = PERCLOS(window_s=60, sample_rate_hz=fps)
+for t, e in zip(ts, ear):
+    p.update(e, 0.2, timestamp=t)
+
+# 1) Orice prag, pe ultimele 60 s (pragurile pe margini de bin → exact)
+fereastra = ear[-int(60 * fps):]
+erori = [abs(p.compute(threshold=x) - np.mean(fereastra < x) * 100.0) for x in (0.1, 0.15, 0.2, 0.25, 0.3)]
+ok_praguri = max(erori) < 1e-6
+# prag în interiorul unui bin → interpolare, eroare sub lățimea unui bin
+ok_interp = abs(p.compute(threshold=0.2237) - np.mean(fereastra < 0.2237) * 100.0) < 1.5
+
+# 2) Pragul recalibrat se aplică imediat întregii ferestre
+inainte = p.compute()
+p.update(0.3, 0.25, timestamp=ts[-1] + 1 / fps)
+ok_recalibrare = abs(p.compute() - p.compute(threshold=0.25)) < 1e-9 and p.compute() > inainte + 10
+
+# 3) Variante P70 / P80 față de EAR-ul ochiului deschis, și cuantile
+variante = p.compute_variants(ear_open=0.35)
+ok_variante = (abs(variante['P80'] - p.compute(threshold=0.07)) < 1e-9
+               and variante['P70'] > variante['P80'])
+ok_mediana = abs(p.ear_quantile(0.5) - np.median(fereastra)) < 0.01
+
+if ok_praguri and ok_interp and ok_recalibrare and ok_variante and ok_mediana:
+    print(f"✅ PAS: histograma EAR răspunde la orice prag (eroare max {max(erori):.1e}%)")
+else:
+    print(f"❌ EȘEC: praguri={ok_praguri} ({max(erori):.3f}), interp={ok_interp}, "
+          f"recalibrare={ok_recalibrare}, variante={ok_variante}, mediana={ok_mediana}")
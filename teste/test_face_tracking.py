@@ -0,0 +1,70 @@
+# test_face_tracking.py
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.face_mesh import FaceMeshDetector
+
+
+class DetectorMarcaj(FaceMeshDetector):
+    # În locul modelului: „fața” e dreptunghiul alb din imagine; 478 de puncte în interiorul lui
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.dimensiuni = []
+
+    def _process(self, frame):
+        self.dimensiuni.append(frame.shape[:2])
+        ys, xs = np.nonzero(frame > 128)
+        if len(xs) == 0:
+            return None
+        h, w = frame.shape[:2]
+        gx = np.linspace(xs.min(), xs.max() + 1, 478) / w
+        gy = np.linspace(ys.min(), ys.max() + 1, 478) / h
+        return [SimpleNamespace(x=x, y=y, z=0.01) for x, y in zip(gx, gy)]
+
+
+def cadru(x, y, w=1920, h=1200):
+    img = np.zeros((h, w), dtype=np.uint8)
+    if x is not None:
+        img[y:y + 200, x:x + 160] = 255
+    return img
+
+
+det = DetectorMarcaj(tracking=True, redetect_every=10)
+erori = []
+# Fața se deplasează lent spre dreapta
+for i in range(25):
+    x, y = 800 + 4 * i, 500
+    lm = det.find_landmarks(cadru(x, y))
+    arr = lm.array
+    # coordonatele revin în spațiul cadrului complet
+    erori.append(abs(arr[0, 0] * 1920 - x) + abs(arr[0, 1] * 1200 - y) +
+                 abs(arr[-1, 0] * 1920 - (x + 160)) + abs(arr[-1, 1] * 1200 - (y + 200)))
+
+# 1) Coordonate corecte, inferență aproape numai pe crop, redetecție periodică
+ok_coord = max(erori) < 1.0
+ok_crop = det.crop_frames > det.full_frames and det.full_frames == 3   # cadrele 0, 10, 20
+ok_mic = all(h * w < 1920 * 1200 / 10 for h, w in det.dimensiuni if (h, w) != (1200, 1920))
+
+# 2) Fața iese din crop → reluare imediată pe cadrul complet, în același apel
+full_inainte = det.full_frames
+lm = det.find_landmarks(cadru(100, 100))
+ok_pierdere = lm is not None and abs(lm[0].x * 1920 - 100) < 1.0 and det.full_frames == full_inainte + 1
+
+# 3) Fără față → None și fără crop la cadrul următor
+ok_fara = det.find_landmarks(cadru(None, None)) is None and det._box is None
+det.close()
+
+if ok_coord and ok_crop and ok_mic and ok_pierdere and ok_fara:
+    print(f"✅ PAS: urmărirea pe crop funcționează ({det.crop_frames} cadre pe crop, "
+          f"{det.full_frames} complete)")
+else:
+    print(f"❌ EȘEC: coord={ok_coord} (eroare max {max(erori):.2f}px), crop={ok_crop}, mic={ok_mic}, "
+          f"pierdere={ok_pierdere}, fara_fata={ok_fara}")
@@ -0,0 +1,54 @@
+# test_features.py
+import sys
+import os
+import time
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.ear import calculate_ear, LEFT_EYE_INDEXES, RIGHT_EYE_INDEXES
+from feature_extraction.features import compute_features
+from feature_extraction.landmarks import LandmarkArray
+from feature_extraction.mar import calculate_mar
+from feature_extraction.pitch import calculate_head_pitch
+
+W, H = 1440, 1080
+rng = np.random.default_rng(1)
+lot = rng.random((200, 478, 3)).astype(np.float32)
+
+# 1) Un cadru: aceleași valori ca funcțiile scalare (EAR-ul scalar rotunjește la pixeli întregi)
+dif_ear = dif_mar = dif_pitch = 0.0
+for arr in lot[:50]:
+    lm = LandmarkArray(arr)
+    f = compute_features(arr, W, H)
+    ear_scalar = (calculate_ear(lm, LEFT_EYE_INDEXES, W, H) + calculate_ear(lm, RIGHT_EYE_INDEXES, W, H)) / 2.0
+    dif_ear = max(dif_ear, abs(f.ear - ear_scalar) / max(ear_scalar, 1e-6))
+    dif_mar = max(dif_mar, abs(f.mar - calculate_mar(lm, W, H)))
+    dif_pitch = max(dif_pitch, abs(f.pitch - calculate_head_pitch(lm, W, H)))
+ok_scalar = dif_ear < 0.05 and dif_mar < 1e-4 and dif_pitch < 1e-3
+
+# 2) Lot (T, 478, 3): rezultat identic cu cadrele luate pe rând
+f_lot = compute_features(lot, W, H)
+pe_rand = np.array([compute_features(a, W, H).ear for a in lot])
+ok_lot = f_lot.ear.shape == (200,) and np.allclose(f_lot.ear, pe_rand)
+
+# 3) Viteză: un apel pe lot față de funcțiile scalare pe fiecare cadru
+t0 = time.perf_counter()
+for arr in lot:
+    lm = LandmarkArray(arr)
+    calculate_ear(lm, LEFT_EYE_INDEXES, W, H); calculate_ear(lm, RIGHT_EYE_INDEXES, W, H)
+    calculate_mar(lm, W, H); calculate_head_pitch(lm, W, H)
+t_scalar = time.perf_counter() - t0
+t0 = time.perf_counter()
+compute_features(lot, W, H)
+t_lot = time.perf_counter() - t0
+
+if ok_scalar and ok_lot:
+    print(f"✅ PAS: compute_features corect; lot de 200 cadre {t_lot * 1000:.2f} ms "
+          f"față de {t_scalar * 1000:.1f} ms scalar")
+else:
+    print(f"❌ EȘEC: scalar={ok_scalar} (ear {dif_ear:.4f}, mar {dif_mar:.2e}, pitch {dif_pitch:.2e}), lot={ok_lot}")
@@ -0,0 +1,65 @@
+# test_frame_buffer.py
+import sys
+import os
+import threading
+import time
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from capture.frame_buffer import FrameRingBuffer, CaptureThread, DROP_OLDEST, DROP_NEWEST
+from capture.frame_source import FrameSource
+
+# 1) Politica drop_oldest: la buffer plin păstrăm cele mai noi cadre
+buf = FrameRingBuffer(capacity=3, policy=DROP_OLDEST)
+for i in range(5):
+    buf.put(i)
+ordine = [buf.pop() for _ in range(3)]
+ok_oldest = ordine == [2, 3, 4] and buf.stats() == {'captured': 5, 'dropped': 2, 'consumed': 3, 'pending': 0}
+
+# 2) Politica drop_newest: la buffer plin respingem cadrele noi
+buf = FrameRingBuffer(capacity=3, policy=DROP_NEWEST)
+acceptate = [buf.put(i) for i in range(5)]
+ok_newest = acceptate == [True, True, True, False, False] and buf.pop() == 0
+
+# 3) get_latest ia cel mai nou cadru, restul se contorizează ca pierdute
+buf = FrameRingBuffer(capacity=4)
+for i in range(3):
+    buf.put(i)
+latest = buf.get_latest()
+st = buf.stats()
+ok_latest = latest == 2 and st['dropped'] == 2 and st['consumed'] == 1 and buf.get_latest() is None
+
+
+# 4) Firul de captură nu blochează consumatorul, chiar dacă sursa stă
+class SursaLenta(FrameSource):
+    def __init__(self):
+        super().__init__()
+        self.n = 0
+        self.blocata = threading.Event()
+
+    def get_frame(self):
+        if self.n >= 3:
+            self.blocata.wait(0.05)   # cameră blocată
+            return None
+        self.n += 1
+        return self.n
+
+
+sursa = SursaLenta()
+cap = CaptureThread(sursa, buffer_size=2)
+cap.start()
+time.sleep(0.1)
+t0 = time.perf_counter()
+cadru = cap.get_latest()
+gol = cap.get_latest()
+durata = time.perf_counter() - t0
+cap.stop()
+ok_thread = cadru.image == 3 and cadru.frame_id == 3 and gol is None and durata < 0.01 and cap.stats()['captured'] == 3
+
+if ok_oldest and ok_newest and ok_latest and ok_thread:
+    print("✅ PAS: FrameRingBuffer și CaptureThread se comportă corect")
+else:
+    print(f"❌ EȘEC: oldest={ok_oldest}, newest={ok_newest}, latest={ok_latest}, thread={ok_thread}")
@@ -0,0 +1,59 @@
+# test_inference_scale.py
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.face_mesh import FaceMeshDetector
+
+
+class ModelMarcaj:
+    # În locul FaceMesh: „fața” e dreptunghiul alb; memorează dimensiunea imaginii primite
+    def __init__(self):
+        self.dimensiuni = []
+
+    def process(self, rgb):
+        self.dimensiuni.append(rgb.shape)
+        ys, xs = np.nonzero(rgb[:, :, 0] > 128)
+        h, w = rgb.shape[:2]
+        gx = np.linspace(xs.min(), xs.max() + 1, 478) / w
+        gy = np.linspace(ys.min(), ys.max() + 1, 478) / h
+        puncte = [SimpleNamespace(x=x, y=y, z=0.0) for x, y in zip(gx, gy)]
+        return SimpleNamespace(multi_face_landmarks=[SimpleNamespace(landmark=puncte)])
+
+    def close(self):
+        pass
+
+
+img = np.zeros((1200, 1920), dtype=np.uint8)   # Mono8, ca de la camera FLIR
+img[400:800, 800:1120] = 255
+
+rezultate = {}
+for latime in (None, 960, 480):
+    det = FaceMeshDetector(inference_width=latime)
+    det.face_mesh.close()
+    det.face_mesh = ModelMarcaj()
+    lm = det.find_landmarks(img)
+    buf = det._small_buf
+    det.find_landmarks(img)
+    # buffer-ul micșorat e refolosit între cadre
+    refolosit = latime is None or det._small_buf is buf
+    rezultate[latime] = (lm.array, det.face_mesh.dimensiuni[0], refolosit)
+
+ref = rezultate[None][0]
+ok_dim = rezultate[960][1] == (600, 960, 3) and rezultate[480][1] == (300, 480, 3)
+ok_buf = all(r[2] for r in rezultate.values())
+# Coordonatele normalizate rămân în spațiul cadrului original (eroare sub 2 px la 1920 px)
+eroare_px = max(np.abs(rezultate[w][0][:, 0] - ref[:, 0]).max() * 1920 for w in (960, 480))
+ok_coord = eroare_px < 2.0
+
+if ok_dim and ok_buf and ok_coord:
+    print(f"✅ PAS: inferență la rezoluție redusă, eroare coordonate {eroare_px:.2f} px")
+else:
+    print(f"❌ EȘEC: dimensiuni={ok_dim}, buffer={ok_buf}, coord={ok_coord} ({eroare_px:.2f} px)")
@@ -0,0 +1,87 @@
+# test_inference_scheduler.py
+import sys
+import os
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.ear import calculate_ear, LEFT_EYE_INDEXES, RIGHT_EYE_INDEXES
+from feature_extraction.inference_scheduler import InferenceScheduler
+from feature_extraction.landmarks import LandmarkArray
+
+W, H = 640, 480
+OCHI = {  # colțul stâng al fiecărui ochi (px) și lățimea lui
+    tuple(LEFT_EYE_INDEXES): (250, 200),
+    tuple(RIGHT_EYE_INDEXES): (330, 200),
+}
+LATIME_OCHI = 60
+
+
+def cadru(deschidere_px):
+    # Față gri cu doi ochi albi a căror înălțime e deschiderea pleoapelor
+    img = np.full((H, W), 30, dtype=np.uint8)
+    img[120:360, 200:440] = 100
+    for (x, y) in OCHI.values():
+        img[y - deschidere_px // 2:y + deschidere_px // 2, x:x + LATIME_OCHI] = 255
+    return img
+
+
+class DetectorOchi:
+    # În locul modelului: măsoară deschiderea ochilor din imagine și construiește landmark-urile
+    def __init__(self):
+        self.apeluri = 0
+
+    def find_landmarks(self, frame):
+        self.apeluri += 1
+        arr = np.zeros((478, 3), dtype=np.float32)
+        arr[:, 0] = np.linspace(200, 440, 478) / W
+        arr[:, 1] = np.linspace(120, 360, 478) / H
+        for idx, (x, y) in OCHI.items():
+            deschidere = int(np.count_nonzero(frame[:, x + LATIME_OCHI // 2] == 255)) // 2
+            p1, p2, p3, p4, p5, p6 = idx
+            v = deschidere / 2.0
+            puncte = {p1: (x, y), p4: (x + LATIME_OCHI, y),
+                      p2: (x + 20, y - v), p3: (x + 40, y - v),
+                      p6: (x + 20, y + v), p5: (x + 40, y + v)}
+            for i, (px, py) in puncte.items():
+                arr[i, :2] = px / W, py / H
+        return LandmarkArray(arr)
+
+    def close(self):
+        pass
+
+
+def ear_din(lm):
+    return (calculate_ear(lm, LEFT_EYE_INDEXES, W, H) + calculate_ear(lm, RIGHT_EYE_INDEXES, W, H)) / 2.0
+
+
+# Ochi deschiși (EAR 0.30) nemișcați, o închidere lentă până la EAR 0.10 ținută 12 cadre, apoi deschiși
+deschideri = [36] * 60 + [32, 28, 24, 20, 16, 12] + [12] * 12 + [24, 36] + [36] * 60
+detector = DetectorOchi()
+sched = InferenceScheduler(detector, max_skip=3, ear_threshold=0.2)
+
+ear_sched = []
+for i, d in enumerate(deschideri):
+    lm = sched.find_landmarks(cadru(d), timestamp=i / 20.0)
+    ear_sched.append(ear_din(lm) if lm is not None else None)
+ear_real = [d / LATIME_OCHI for d in deschideri]   # EAR = înălțime / lățime
+
+# 1) Fiecare cadru primește landmark-uri
+ok_toate = all(e is not None for e in ear_sched)
+
+# 2) Niciun cadru cu ochii închiși (EAR real sub prag) nu e raportat deschis
+ok_inchise = all(s < 0.2 for r, s in zip(ear_real, ear_sched) if r < 0.2)
+
+# 3) Cel puțin jumătate din cadre nu trec prin model
+ok_cpu = sched.inference_ratio <= 0.5 and detector.apeluri == sched.keyframes
+
+if ok_toate and ok_inchise and ok_cpu:
+    print(f"✅ PAS: InferenceScheduler — {sched.inference_ratio * 100:.0f}% din cadre prin model, "
+          f"nicio închidere a ochilor ratată")
+else:
+    print(f"❌ EȘEC: toate={ok_toate}, inchise={ok_inchise}, cpu={ok_cpu} "
+          f"(raport {sched.inference_ratio:.2f})")
@@ -0,0 +1,57 @@
+# test_microsleep_timp.py
+import sys
+import os
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.microsleep import MicroSleepDetector
+
+PRAG_EAR = 0.2
+
+
+def ruleaza(fps, inchideri, durata=20.0, fara_fata=(), sari=(), jitter=0.0, seed=0):
+    # inchideri / fara_fata / sari: intervale (t0, t1) în secunde
+    rng = np.random.default_rng(seed)
+    det = MicroSleepDetector(threshold_time_s=0.6, fps=30)    # fps nominal diferit de cel real
+    t = 0.0
+    while t < durata:
+        if not any(a <= t < b for a, b in sari):
+            if any(a <= t < b for a, b in fara_fata):
+                det.update_no_face(t)
+            else:
+                inchis = any(a <= t < b for a, b in inchideri)
+                det.update(0.1 if inchis else 0.3, PRAG_EAR, timestamp=t)
+        t += (1.0 / fps) * (1.0 + jitter * rng.uniform(-1, 1))
+    det.update(0.3, PRAG_EAR, timestamp=t)      # ochii se deschid la final
+    return det
+
+
+# 1) Aceeași decizie la 10, 30 și 60 FPS (și FPS neregulat): 1.0 s → da, 0.4 s → nu
+rezultate = [ruleaza(f, [(2.0, 3.0), (8.0, 8.4)], jitter=j)
+             for f, j in ((10, 0.0), (30, 0.0), (60, 0.0), (25, 0.5))]
+ok_fps = all(d.count == 1 for d in rezultate)
+ok_durata = all(abs(d.events[0].duration - 1.0) < 0.1 and abs(d.events[0].start - 2.0) < 0.1
+                for d in rezultate)
+
+# 2) Cadre sărite în mijlocul închiderii (0.3 s lipsă) → durata reală păstrată
+sarit = ruleaza(30, [(2.0, 3.0)], sari=[(2.3, 2.6)])
+ok_sarit = sarit.count == 1 and abs(sarit.events[0].duration - 1.0) < 0.1
+
+# 3) Față pierdută scurt (0.2 s) → închiderea continuă; lung (2 s) → eveniment încheiat explicit
+scurt = ruleaza(30, [(2.0, 3.0)], fara_fata=[(2.4, 2.6)])
+lung = ruleaza(30, [(2.0, 5.0)], fara_fata=[(2.8, 4.8)])
+ok_fata = (scurt.count == 1 and not scurt.events[0].face_lost
+           and lung.count == 1 and lung.events[0].face_lost and abs(lung.events[0].end - 2.8) < 0.05)
+# închidere scurtă întreruptă de un gol lung: nu se adună peste gol
+intrerupt = ruleaza(30, [(2.0, 2.4), (3.5, 3.9)], fara_fata=[(2.4, 3.5)])
+ok_gol = intrerupt.count == 0
+
+if ok_fps and ok_durata and ok_sarit and ok_fata and ok_gol:
+    print("✅ PAS: MicroSleepDetector pe timestamp-uri — aceeași decizie la orice FPS")
+else:
+    print(f"❌ EȘEC: fps={ok_fps}, durata={ok_durata}, sarit={ok_sarit}, fata={ok_fata}, gol={ok_gol}")
@@ -0,0 +1,48 @@
+# test_perclos_fara_fata.py
+import sys
+import os
+
+import yaml
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.perclos import PERCLOS
+from pipeline.engine import FrameContext
+from pipeline.stages import build_stages
+
+# Prag calibrat care cade în interiorul unui bin al histogramei (bin-uri de 0.005)
+PRAG = 0.2337
+FPS = 30.0
+
+# 1) direct: 600 de cadre fără față după 300 cu ochii deschiși
+p = PERCLOS(window_s=60, sample_rate_hz=FPS)
+for i in range(300):
+    p.update(0.30, PRAG, timestamp=i / FPS)
+for i in range(300, 900):
+    p.update(None, PRAG, timestamp=i / FPS)
+ok_direct = p.compute() == 0.0 and p.compute(threshold=0.25) == 0.0
+
+# 2) prin etapa temporală: fără față, EAR-ul din context e pragul, dar nu intră în PERCLOS
+with open(os.path.join(project_root, "config", "settings.yaml"), encoding="utf-8") as f:
+    config = yaml.safe_load(f)
+stages = build_stages(config, None, None, calibrator=lambda: type("Cal", (), {'ear_threshold': PRAG})(),
+                      fps=FPS)
+features, temporal = stages[1], stages[2]
+for i in range(600):
+    ctx = FrameContext(type("Rec", (), {'timestamp': i / FPS})(), landmarks_ready=True)
+    temporal.process(features.process(ctx))
+ok_etapa = ctx.ear == PRAG and ctx.perclos == 0.0
+
+# 3) ochii închiși rămân numărați: 10 s închiși după 20 s fără față → o treime din timp
+for i in range(600, 900):
+    temporal.perclos.update(0.10, PRAG, timestamp=i / FPS)
+ok_inchis = abs(temporal.perclos.compute() - 100.0 / 3) < 0.5
+
+if ok_direct and ok_etapa and ok_inchis:
+    print(f"✅ PAS: cadrele fără față nu cresc PERCLOS (prag {PRAG})")
+else:
+    print(f"❌ EȘEC: direct={ok_direct} ({p.compute():.1f}%), etapa={ok_etapa} ({ctx.perclos:.1f}%), "
+          f"inchis={ok_inchis} ({temporal.perclos.compute():.1f}%)")
@@ -0,0 +1,59 @@
+# test_perclos_timp.py
+import sys
+import os
+import time
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.perclos import PERCLOS
+
+
+def perclos_exact(ts, inchis, t, fereastra, dt0):
+    # Referință: fiecare eșantion acoperă intervalul de la eșantionul anterior
+    total = inchis_s = 0.0
+    for i, (ti, ci) in enumerate(zip(ts, inchis)):
+        start = ts[i - 1] if i else ti - dt0
+        a, b = max(start, t - fereastra), ti
+        if b > a:
+            total += b - a
+            inchis_s += (b - a) if ci else 0.0
+    return inchis_s / total * 100.0 if total else 0.0
+
+
+# FPS neregulat (18–32 Hz) și episoade de ochi închiși de lungimi diferite
+rng = np.random.default_rng(5)
+ts = np.cumsum(rng.uniform(1 / 32, 1 / 18, 6000))
+inchis = (np.sin(ts / 7.0) + 0.3 * rng.standard_normal(len(ts))) > 0.9
+p = PERCLOS(window_s=10, sample_rate_hz=25.0, extra_windows_s=(60, 120))
+
+erori = []
+for i, (t, c) in enumerate(zip(ts, inchis)):
+    p.update(0.1 if c else 0.3, 0.2, timestamp=t)
+    if i % 500 == 499:
+        for w in (10, 60, 120):
+            erori.append(abs(p.compute(w) - perclos_exact(ts[:i + 1], inchis[:i + 1], t, w, 1 / 25.0)))
+ok_exact = max(erori) < 1e-6
+# Doar segmentele (eșantioane comasate) din fereastra cea mai lungă rămân în memorie
+ok_memorie = len(p._runs) < np.sum(ts > ts[-1] - 120) / 2
+ok_toate = set(p.compute_all()) == {10.0, 60.0, 120.0}
+
+# Timp constant: cost pe eșantion independent de lungimea ferestrei
+def cost(fereastra):
+    q = PERCLOS(window_s=fereastra, sample_rate_hz=30.0)
+    t0 = time.perf_counter()
+    for i in range(20000):
+        q.update(0.1 if (i // 7) % 3 == 0 else 0.3, 0.2)
+        q.compute()
+    return time.perf_counter() - t0
+ok_o1 = cost(900) < 3 * cost(10)
+
+if ok_exact and ok_memorie and ok_toate and ok_o1:
+    print(f"✅ PAS: PERCLOS ponderat în timp, exact pe 3 ferestre (eroare max {max(erori):.1e}%)")
+else:
+    print(f"❌ EȘEC: exact={ok_exact} ({max(erori):.3f}%), memorie={ok_memorie} ({len(p._runs)}), "
+          f"ferestre={ok_toate}, O(1)={ok_o1}")
@@ -0,0 +1,122 @@
+# test_pipeline.py
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+import yaml
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from capture.replay_source import SyntheticSource
+from feature_extraction.landmarks import LandmarkArray
+from pipeline.engine import Pipeline, FunctionStage, FrameContext
+from pipeline.stages import build_stages
+
+with open(os.path.join(project_root, "config", "settings.yaml"), encoding="utf-8") as f:
+    CONFIG = yaml.safe_load(f)
+
+rng = np.random.default_rng(7)
+FATA = LandmarkArray(rng.uniform(0.3, 0.7, (468, 3)))
+
+
+class DetectorFals:
+    # Față în 2 cadre din 3, fără model
+    def __init__(self):
+        self.n = 0
+
+    def find_landmarks(self, frame):
+        self.n += 1
+        return FATA if self.n % 3 else None
+
+
+class AlertaFalsa:
+    def evaluate(self, ear, mar, pitch, distract, timestamp=None):
+        return ["ochi_inchisi"] if ear < 0.2 else []
+
+
+def construieste(scoruri, intarziere=0.0):
+    stages = build_stages(CONFIG, DetectorFals(), AlertaFalsa(), fps=30.0)
+
+    def sink(ctx):
+        if intarziere:
+            time.sleep(intarziere)
+        scoruri.append(round(ctx.score, 9))
+    return Pipeline(stages + [FunctionStage("sink", sink)])
+
+
+def sursa(n, pauza=0.0):
+    src = SyntheticSource(width=64, height=48, n_frames=n)
+
+    def urmatorul():
+        if pauza:
+            time.sleep(pauza)
+        record = src.get_frame_record()
+        if record is None:
+            raise StopIteration
+        return FrameContext(record)
+    return urmatorul
+
+
+N = 120
+# 1) inline: toate etapele cronometrate, în ordine, la fiecare cadru
+inline = []
+p = construieste(inline)
+urm = sursa(N)
+for _ in range(N):
+    p.process(urm())
+raport = p.report()
+ok_ordine = list(raport) == ["landmarks", "features", "temporal", "scoring", "decision", "sink"]
+ok_timpi = all(r['count'] == N and r['max_ms'] >= r['mean_ms'] >= 0 for r in raport.values())
+
+# 2) pe fire, fără pierderi: aceleași scoruri ca inline
+pe_fire = []
+p2 = construieste(pe_fire)
+p2.start(sursa(N), groups=[["landmarks"], ["features", "temporal", "scoring", "decision", "sink"]],
+         block=True)
+ok_terminat = p2.wait(10.0)
+p2.stop()
+ok_egal = ok_terminat and pe_fire == inline and p2.completed == N
+
+# 3) sink lent cu cozi care aruncă: cadrele pierdute se numără
+lent = []
+p3 = construieste(lent, intarziere=0.005)
+p3.start(sursa(N, pauza=0.002), groups=[["landmarks", "features"], ["temporal", "scoring", "decision", "sink"]],
+         queue_size=1)
+p3.wait(10.0)
+p3.stop()
+ok_pierderi = p3.dropped > 0 and p3.completed > 0 and p3.completed + p3.dropped == N
+
+# 4) reset: starea în timp se golește
+p.reset()
+ok_reset = p.stage("scoring").ema_score is None and p.stage("temporal").perclos.compute() == 0.0
+
+
+# 5) o etapă ridică excepție pe fir, cu cozi care așteaptă: wait() o ridică, nu se blochează
+def defect(ctx):
+    if ctx.record.frame_id >= 10:
+        raise ValueError("etapă defectă")
+
+
+p5 = Pipeline(build_stages(CONFIG, DetectorFals(), AlertaFalsa(), fps=30.0) + [FunctionStage("defect", defect)])
+p5.start(sursa(N), groups=[["landmarks"], ["features", "temporal", "scoring", "decision", "defect"]],
+         queue_size=1, block=True)
+t0 = time.perf_counter()
+try:
+    p5.wait(10.0)
+    ok_eroare = False
+except ValueError:
+    ok_eroare = time.perf_counter() - t0 < 5.0
+p5.stop()
+ok_eroare = ok_eroare and not any(t.is_alive() for t in threading.enumerate() if t.name.startswith("pipeline-"))
+
+if ok_ordine and ok_timpi and ok_egal and ok_pierderi and ok_reset and ok_eroare:
+    print(f"✅ PAS: {len(raport)} etape cronometrate, fire = inline, "
+          f"{p3.dropped} cadre aruncate din {N} la consumator lent")
+else:
+    print(f"❌ EȘEC: ordine={ok_ordine}, timpi={ok_timpi}, fire={ok_egal} ({len(pe_fire)}/{len(inline)}), "
+          f"pierderi={ok_pierderi} ({p3.completed}+{p3.dropped}), reset={ok_reset}, eroare={ok_eroare}")
@@ -0,0 +1,58 @@
+# test_replay_source.py
+import sys
+import os
+import tempfile
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+import cv2
+import numpy as np
+from capture.replay_source import ReplaySource, SyntheticSource
+from capture.frame_source import FrameStats
+
+# 1) Generator sintetic: exact n_frames cadre, apoi None
+sursa = SyntheticSource(width=320, height=240, n_frames=25)
+cadre = 0
+while sursa.get_frame() is not None:
+    cadre += 1
+ok_sintetic = cadre == 25 and sursa.finished and sursa.get_resolution() == (320, 240)
+
+# 2) Secvență de imagini: ordine păstrată, buclă opțională, mod Mono8
+with tempfile.TemporaryDirectory() as tmp:
+    for i in range(5):
+        img = np.full((60, 80, 3), i * 40, dtype=np.uint8)
+        cv2.imwrite(os.path.join(tmp, f"cadru_{i:03d}.png"), img)
+
+    replay = ReplaySource(tmp)
+    valori = []
+    while True:
+        frame = replay.get_frame()
+        if frame is None:
+            break
+        valori.append(int(frame[0, 0, 0]))
+    ok_ordine = valori == [0, 40, 80, 120, 160] and replay.get_resolution() == (80, 60)
+
+    replay_bucla = ReplaySource(tmp, loop=True, grayscale=True)
+    gri = [replay_bucla.get_frame() for _ in range(7)]
+    ok_bucla = all(f is not None and f.ndim == 2 for f in gri) and int(gri[5][0, 0]) == 0
+
+# 3) Timestamp-uri din timpul înregistrării, independente de viteza de redare
+sursa = SyntheticSource(width=64, height=48, fps=20.0, n_frames=5)
+recs = [sursa.get_frame_record() for _ in range(5)]
+ok_timp = [r.timestamp for r in recs] == [0.0, 0.05, 0.1, 0.15, 0.2] and \
+    [r.frame_id for r in recs] == [1, 2, 3, 4, 5] and sursa.stats.dropped == 0
+
+# 4) Golurile din frame ID sunt numărate ca pierderi
+st = FrameStats()
+for fid in [10, 11, 14, 15, 0, 1]:   # 12, 13 pierdute; 0 = repornire stream
+    st.update(fid, 0.0)
+ok_pierderi = st.dropped == 2 and st.restarts == 1 and st.received == 6
+
+if ok_sintetic and ok_ordine and ok_bucla and ok_timp and ok_pierderi:
+    print("✅ PAS: ReplaySource și SyntheticSource livrează cadrele corect")
+else:
+    print(f"❌ EȘEC: sintetic={ok_sintetic}, ordine={ok_ordine}, buclă={ok_bucla}, "
+          f"timp={ok_timp}, pierderi={ok_pierderi}")
@@ -0,0 +1,73 @@
+# test_roi_tracker.py
+import sys
+import os
+from collections import namedtuple
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from capture.roi_tracker import FaceRoiTracker
+
+Punct = namedtuple("Punct", "x y")
+
+
+class CameraFalsa:
+    # Înlocuitor pentru FlirCamera: doar API-ul de ROI folosit de tracker
+    sensor_size = (1440, 1080)
+    width_inc = height_inc = 8
+    offset_x_inc = offset_y_inc = 4
+
+    def __init__(self):
+        self.roi = (0, 0, 1440, 1080)
+        self.apeluri = []
+
+    def get_roi(self):
+        return self.roi
+
+    def set_roi(self, x, y, w, h, fps=None):
+        self.roi = (x, y, w, h)
+        self.apeluri.append(self.roi)
+        return self.roi
+
+
+def fata(cx, cy, latura, roi):
+    # Landmark-uri (colțurile feței) normalizate relativ la ROI-ul curent
+    rx, ry, rw, rh = roi
+    pts = [(cx - latura / 2, cy - latura / 2), (cx + latura / 2, cy + latura / 2)]
+    return [Punct((x - rx) / rw, (y - ry) / rh) for x, y in pts]
+
+
+cam = CameraFalsa()
+tracker = FaceRoiTracker(cam, padding=0.5, min_size=(320, 320), lost_frames=5, cooldown_frames=3)
+
+# 1) Fața mică în cadru complet → ROI-ul se micșorează în jurul feței
+tracker.update(fata(700, 500, 200, cam.roi), frame_size=(1440, 1080))
+x, y, w, h = cam.roi
+ok_micsorare = len(cam.apeluri) == 1 and w < 1440 and x <= 600 and x + w >= 800
+
+# 2) Mișcări mici ale capului nu reprogramează senzorul (histerezis)
+for dx in range(0, 30, 3):
+    tracker.update(fata(700 + dx, 500, 200, cam.roi), frame_size=(w, h))
+ok_histerezis = len(cam.apeluri) == 1
+
+# 3) Fața ajunge la marginea ROI-ului → ROI-ul o urmează
+for _ in range(3):
+    tracker.update(fata(x + w - 80, 500, 200, cam.roi), frame_size=cam.roi[2:])
+ok_urmarire = len(cam.apeluri) == 2 and cam.roi[0] > x
+
+# 4) Față pierdută → revenire la cadrul complet după lost_frames
+for _ in range(5):
+    tracker.update(None, frame_size=cam.roi[2:])
+ok_pierdere = cam.roi == (0, 0, 1440, 1080)
+
+# 5) Aliniere la incrementele camerei
+ok_aliniere = all(r[2] % 8 == 0 and r[3] % 8 == 0 and r[0] % 4 == 0 and r[1] % 4 == 0
+                  for r in cam.apeluri)
+
+if ok_micsorare and ok_histerezis and ok_urmarire and ok_pierdere and ok_aliniere:
+    print(f"✅ PAS: FaceRoiTracker urmărește fața ({len(cam.apeluri)} reprogramări)")
+else:
+    print(f"❌ EȘEC: micșorare={ok_micsorare}, histerezis={ok_histerezis}, "
+          f"urmărire={ok_urmarire}, pierdere={ok_pierdere}, aliniere={ok_aliniere}")
@@ -0,0 +1,47 @@
+# test_rollup.py
+import sys
+import os
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.rollup import RollupHistory
+
+# 3 ore la 10 FPS: scorul crește lent cu 10 puncte / oră, cu zgomot mare per cadru
+FPS = 10.0
+ts = np.arange(0, 3 * 3600.0, 1.0 / FPS)
+rng = np.random.default_rng(5)
+panta = 10.0 / 3600.0
+scoruri = 20.0 + panta * ts + rng.normal(0, 10.0, len(ts))
+
+hist = RollupHistory()
+octeti = sum(t._sum.nbytes for t in hist.tiers)
+inchideri = 0
+for t, s in zip(ts, scoruri):
+    inchideri += hist.add(t, s)
+
+ok_memorie = sum(t._sum.nbytes for t in hist.tiers) == octeti and len(hist.tiers[0]) == 3600
+ok_inchideri = inchideri == int(ts[-1])                     # o găleată de 1 s închisă pe secundă
+ok_nivel = hist.tier_for(60).resolution_s == 1.0 and hist.tier_for(3600).resolution_s == 60.0
+
+# ultima oră (aliniată la minut, rezoluția nivelului folosit): media / min / max exacte
+ultima_ora = ts >= np.floor((ts[-1] - 3600.0) / 60.0) * 60.0
+st = hist.stats(3600)
+ok_stats = (st['count'] == ultima_ora.sum() and abs(st['mean'] - scoruri[ultima_ora].mean()) < 1e-9 and
+            st['max'] == scoruri[ultima_ora].max())
+# trendul pe o oră prinde deriva lentă, deși zgomotul per cadru e mult mai mare
+ref = np.polyfit(ts[ultima_ora], scoruri[ultima_ora], 1)[0]
+m_ora = hist.trend(3600)
+ok_trend = abs(m_ora - panta) < 0.2 * panta and abs(m_ora - ref) < 0.1 * panta
+hist.reset()
+ok_reset = hist.stats(60)['count'] == 0 and hist.trend(60) == 0.0
+
+if ok_memorie and ok_inchideri and ok_nivel and ok_stats and ok_trend and ok_reset:
+    print(f"✅ PAS: trend pe o oră {m_ora * 3600:.2f} puncte/h (real {panta * 3600:.0f}), memorie fixă")
+else:
+    print(f"❌ EȘEC: memorie={ok_memorie}, inchideri={ok_inchideri} ({inchideri}), nivel={ok_nivel}, "
+          f"stats={ok_stats}, trend={ok_trend} ({m_ora * 3600:.2f} vs {ref * 3600:.2f}), reset={ok_reset}")
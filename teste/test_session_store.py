@@ -0,0 +1,46 @@
+# test_session_store.py
+import sys
+import os
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.session_store import SessionStore
+
+# 2 ore la 30 FPS, păstrăm brut doar ultimele 1000 de cadre
+FPS = 30.0
+N = int(2 * 3600 * FPS)
+rng = np.random.default_rng(11)
+ts = np.arange(N) / FPS
+scoruri = np.clip(40 + 15 * np.sin(ts / 600.0) + rng.normal(0, 8, N), 0, 100)
+ears = np.clip(rng.normal(0.28, 0.04, N), 0.0, 0.5)
+
+store = SessionStore(recent_samples=1000)
+octeti_inainte = sum(b._v.nbytes + b._t.nbytes for b in store.recent.values())
+for t, s, e in zip(ts, scoruri, ears):
+    store.add(t, score=s, ear=e, mar=None)
+octeti_dupa = sum(b._v.nbytes + b._t.nbytes for b in store.recent.values())
+
+sumar = store.summary('score')
+t_rec, v_rec = store.series('score')
+ok_memorie = octeti_inainte == octeti_dupa and len(store.recent['score']) == 1000
+ok_recent = np.array_equal(t_rec, ts[-1000:]) and np.array_equal(v_rec, scoruri[-1000:])
+ok_medie = sumar['count'] == N and abs(sumar['mean'] - scoruri.mean()) < 1e-6
+ok_extreme = sumar['min'] == scoruri.min() and sumar['max'] == scoruri.max()
+# schița: eroare de cel mult o lățime de bin (0.1 puncte de scor)
+err = max(abs(sumar[f'p{q}'] - np.percentile(scoruri, q)) for q in (50, 90, 99))
+ok_percentile = err <= 0.1
+ok_ear = abs(store.summary('ear')['p50'] - np.median(ears)) <= 0.0005
+ok_lipsa = store.summary('mar')['count'] == 0
+store.reset()
+ok_reset = store.summary('score')['count'] == 0 and len(store.series('score')[0]) == 0
+
+if ok_memorie and ok_recent and ok_medie and ok_extreme and ok_percentile and ok_ear and ok_lipsa and ok_reset:
+    print(f"✅ PAS: {N} cadre în memorie fixă, percentile cu eroare max {err:.3f}")
+else:
+    print(f"❌ EȘEC: memorie={ok_memorie}, recent={ok_recent}, medie={ok_medie}, extreme={ok_extreme}, "
+          f"percentile={ok_percentile} ({err:.3f}), ear={ok_ear}, lipsa={ok_lipsa}, reset={ok_reset}")
@@ -0,0 +1,64 @@
+# test_trend.py
+import sys
+import os
+import time
+
+import numpy as np
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from feature_extraction.trend import OnlineTrend
+
+# Scor de oboseală zgomotos, cu FPS neregulat, pe ceasul camerei (timestamp-uri mari)
+rng = np.random.default_rng(2)
+ts = 50000.0 + np.cumsum(rng.uniform(0.03, 0.07, 20000))
+vs = 40 + 10 * np.sin(ts / 60.0) + rng.normal(0, 3, len(ts))
+
+scurt = OnlineTrend(max_samples=600)
+lung = OnlineTrend(horizon_s=300)
+uitare = OnlineTrend(half_life_s=60)
+dif_scurt = dif_lung = dif_uitare = 0.0
+for i, (t, v) in enumerate(zip(ts, vs)):
+    scurt.update(t, v)
+    lung.update(t, v)
+    uitare.update(t, v)
+    if i % 997 == 996:
+        # 1) Aceeași pantă ca np.polyfit pe aceeași fereastră
+        a = max(0, i - 599)
+        m, _ = np.polyfit(ts[a:i + 1] - ts[a], vs[a:i + 1], 1)
+        dif_scurt = max(dif_scurt, abs(scurt.slope - m))
+        sel = (ts[:i + 1] >= t - 300)
+        m, _ = np.polyfit(ts[:i + 1][sel] - t, vs[:i + 1][sel], 1)
+        dif_lung = max(dif_lung, abs(lung.slope - m))
+        # 2) Uitare exponențială = polyfit ponderat cu 0.5^(vârstă / timp de înjumătățire)
+        w = 0.5 ** ((t - ts[:i + 1]) / 60.0)
+        m, _ = np.polyfit(ts[:i + 1] - t, vs[:i + 1], 1, w=np.sqrt(w))
+        dif_uitare = max(dif_uitare, abs(uitare.slope - m))
+ok_polyfit = dif_scurt < 1e-8 and dif_lung < 1e-8 and dif_uitare < 1e-8
+
+# 3) Cost pe eșantion independent de fereastră
+def cost(fereastra):
+    tr = OnlineTrend(max_samples=fereastra)
+    t0 = time.perf_counter()
+    for t, v in zip(ts[:10000], vs[:10000]):
+        tr.update(t, v)
+    return time.perf_counter() - t0
+ok_o1 = cost(5000) < 3 * cost(50)
+
+# 4) Ceasul sursei o ia de la capăt (reconectare): fereastra pe timp nu mai crește nelimitat
+ts2 = np.arange(0, 600.0, 0.05)
+vs2 = 20 + 0.1 * ts2 + rng.normal(0, 3, len(ts2))
+for t, v in zip(ts2, vs2):
+    lung.update(t, v)
+sel = ts2 >= ts2[-1] - 300
+m, _ = np.polyfit(ts2[sel] - ts2[-1], vs2[sel], 1)
+ok_inapoi = len(lung) == sel.sum() and abs(lung.slope - m) < 1e-8
+
+if ok_polyfit and ok_o1 and ok_inapoi:
+    print(f"✅ PAS: OnlineTrend = np.polyfit (dif. max {max(dif_scurt, dif_lung, dif_uitare):.1e} /s)")
+else:
+    print(f"❌ EȘEC: polyfit={ok_polyfit} (scurt {dif_scurt:.1e}, lung {dif_lung:.1e}, "
+          f"uitare {dif_uitare:.1e}), O(1)={ok_o1}, inapoi={ok_inapoi} ({len(lung)})")
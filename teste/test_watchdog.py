@@ -0,0 +1,86 @@
+# test_watchdog.py
+import sys
+import os
+import time
+
+# 🛠️ Fix importuri relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from capture.frame_buffer import CaptureThread
+from capture.frame_source import FrameSource
+from capture.watchdog import CameraWatchdog, CONNECTED, RECONNECTING
+
+
+class CameraDeconectabila(FrameSource):
+    # Cameră falsă: se „deconectează” după 5 cadre; primele 2 reconectări eșuează
+    can_reconnect = True
+
+    def __init__(self):
+        super().__init__()
+        self.conectata = True
+        self.cadre = 0
+        self.incercari = 0
+
+    def get_frame(self):
+        time.sleep(0.01)
+        if self.cadre == 5:
+            self.conectata = False
+        if not self.conectata:
+            return None
+        self.cadre += 1
+        return self.cadre
+
+    def reconnect(self):
+        self.incercari += 1
+        if self.incercari < 3:
+            raise RuntimeError("USB indisponibil")
+        self.cadre = 100     # după reconectare, stream-ul merge din nou
+        self.conectata = True
+
+
+cam = CameraDeconectabila()
+cap = CaptureThread(cam, buffer_size=2)
+wd = CameraWatchdog(cam, stall_timeout_s=0.2, check_interval_s=0.05,
+                    backoff_initial_s=0.05, backoff_max_s=0.2)
+stari = []
+wd.add_listener(lambda state, incident: stari.append(state))
+
+cap.start()
+wd.start()
+time.sleep(1.5)
+wd.stop()
+cap.stop()
+
+# 1) Stream blocat → reconectare cu reîncercări → înapoi la CONNECTED
+ok_reconectare = (len(wd.incidents) == 1 and wd.incidents[0]['attempts'] == 3
+                  and wd.state == CONNECTED and RECONNECTING in stari and stari[-1] == CONNECTED)
+
+# 2) Downtime-ul include blocarea plus pauzele de backoff
+ok_downtime = wd.total_downtime_s >= 0.2 + 0.05 + 0.1
+
+# 3) Analiza se reia: după reconectare sosesc cadre noi
+ok_reluare = cam.stats.received > 5
+
+# 4) Rata mare de cadre incomplete e raportată chiar dacă mai vin cadre
+cam2 = CameraDeconectabila()
+wd2 = CameraWatchdog(cam2, max_incomplete_rate=0.5, min_samples=10)
+cam2.stats.received += 4
+cam2.stats.incomplete += 8
+cam2.stats.last_host_time = time.monotonic()
+ok_incomplete = wd2.check() is not None and wd2.check() is None
+
+# 5) Oprit înainte de prima încercare: nicio reconectare raportată
+cam3 = CameraDeconectabila()
+wd3 = CameraWatchdog(cam3)
+wd3._stop_event.set()
+wd3._recover("test")
+ok_oprit = wd3.incidents == [] and wd3.state != CONNECTED
+
+if ok_reconectare and ok_downtime and ok_reluare and ok_incomplete and ok_oprit:
+    print(f"✅ PAS: CameraWatchdog a reconectat camera după "
+          f"{wd.incidents[0]['downtime_s']:.2f} s ({wd.incidents[0]['attempts']} încercări)")
+else:
+    print(f"❌ EȘEC: reconectare={ok_reconectare}, downtime={ok_downtime}, "
+          f"reluare={ok_reluare}, incomplete={ok_incomplete}, oprit={ok_oprit}, stari={stari}")